@@ -1,30 +1,77 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 from .mock_data import compliance_data
-from .mock_data import suppliers_data
+from .mock_data import suppliers_data, load_mock_data, mock_data_mtime, read_mock_data
 from langchain_mistralai import ChatMistralAI
 import getpass
+import io
 import os
-from mistralai import Mistral
-import fitz
 import requests
+import shutil
+import tempfile
+import threading
+import zipfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
+from utils.llm import complete_json, model
+from utils.llm_scheduler import llm_priority
+from utils.json_provider import dumps_bytes, loads, raw_json_response
+from utils.compliance_analysis import COMPLIANCE_CHUNK_TOKENS, chunk_document, map_chunks, merge_analyses
+from utils.document_cache import DocumentCache, version_tag
+from utils.pdf_extraction import EXTRACTOR_VERSION, extract_text, extract_text_in_worker
+from utils.clause_screen import ClauseScreen
+from utils.supplier_retrieval import SupplierIndex, compact
+from utils.compliance_verification import ComplianceIndex
+from utils.expiry_scheduler import ExpiryScheduler
+from utils.regulation_applicability import ApplicabilityMatrix
+from utils.jobs import JobManager, JobQueueFull
+from utils.uploads import MAX_UPLOAD_BYTES, is_pdf, parse_page_range, spool_stream, upload_hash, upload_source
 
 compliance_bp = Blueprint('compliance', __name__)
 
 load_dotenv()
-api_key = os.getenv("MISTRAL_API_KEY")
-model = "mistral-large-latest"
 
-client = Mistral(api_key=api_key)
+# Bump when the analysis prompt or pre-screen changes so cached analyses are not served for it
+ANALYSIS_PROMPT_VERSION = 4
+ANALYSIS_VERSION = version_tag(model, ANALYSIS_PROMPT_VERSION, COMPLIANCE_CHUNK_TOKENS)
 
+# Extracted text and analyses of uploaded documents, keyed by content hash
+document_cache = DocumentCache(
+    os.getenv("DOCUMENT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "tacto-document-cache")),
+    max_bytes=int(os.getenv("DOCUMENT_CACHE_MAX_BYTES", 256 * 1024 * 1024)))
 
-def extract_text_from_pdf(pdf_path):
-    """Extract text from an uploaded PDF file using PyMuPDF."""
-    text = ""
-    doc = fitz.open(pdf_path)
-    for page in doc:
-        text += page.get_text("text") + "\n"
-    return text
+# Keyword pre-screen for the regulation requirements and common contract clauses
+clause_screen = ClauseScreen(compliance_data)
+
+# Candidate suppliers are retrieved locally, only these are sent to the LLM for matching
+supplier_index = SupplierIndex(suppliers_data)
+SUPPLIER_MATCH_TOP_K = int(os.getenv("SUPPLIER_MATCH_TOP_K", 5))
+
+# Compliance records and certifications by supplier, with a sorted expiry index
+compliance_index = ComplianceIndex(suppliers=load_mock_data().get('suppliers', []),
+                                   records=load_mock_data().get('compliance', []))
+MAX_BATCH_VERIFICATIONS = int(os.getenv("MAX_BATCH_VERIFICATIONS", 10000))
+
+# Which regulations apply to which suppliers, by industry and region
+applicability = ApplicabilityMatrix(compliance_data, load_mock_data().get('suppliers', []))
+applicability_mtime = mock_data_mtime()
+applicability_lock = threading.Lock()
+
+# Alerts raised as indexed certifications and documents approach expiry
+expiry_scheduler = ExpiryScheduler()
+compliance_index.subscribe(expiry_scheduler.add_record)
+expiry_scheduler.start()
+
+# Uploads analyzed in the background with ?async=1, persisted so queued jobs survive a restart
+ANALYSIS_JOB_DIR = os.getenv("ANALYSIS_JOB_DIR", os.path.join(tempfile.gettempdir(), "tacto-analysis-jobs"))
+analysis_jobs = JobManager(max_workers=int(os.getenv("ANALYSIS_WORKERS", 2)), ttl=24 * 3600, name="analysis",
+                           store_dir=ANALYSIS_JOB_DIR,
+                           max_queued=int(os.getenv("ANALYSIS_QUEUE_LIMIT", 100)))
+MAX_JOB_WAIT = 30
+
+# ZIP archives of documents analyzed by /analyze-batch
+MAX_BATCH_DOCUMENTS = int(os.getenv("MAX_BATCH_DOCUMENTS", 500))
+BATCH_ANALYSIS_CONCURRENCY = int(os.getenv("BATCH_ANALYSIS_CONCURRENCY", 8))
 
 
 @compliance_bp.route('/analyze-document', methods=['POST'])
@@ -37,36 +84,281 @@ def analyze_document():
 
     file = request.files["file"]
 
-    # Ensure it's a PDF file
-    if not file.filename.endswith(".pdf"):
+    # Trust the file's header rather than its name
+    if not is_pdf(file.stream):
         return jsonify({"error": "Only PDF files are allowed"}), 400
 
-    # Save the uploaded file
-    temp_path = "uploaded_document.pdf"
-    file.save(temp_path)
+    # Optionally only check the requirements of some regulations, e.g. regulations=GDPR,RoHS
+    try:
+        regulations = requested_regulations()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-    # Extract text from PDF
-    extracted_text = extract_text_from_pdf(temp_path)
+    # Optionally only analyze some pages, e.g. pages=1-50
+    pages = None
+    if request.args.get("pages"):
+        try:
+            pages = list(parse_page_range(request.args["pages"]))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
 
-    # Process the extracted text (e.g., send it to Mistral, or return it for now)
-    messages = [{
+    # Repeat uploads are served from the cache, the upload was hashed as it was spooled
+    document_hash = upload_hash(file.stream)
+    analysis = document_cache.get("analysis", analysis_key(document_hash, regulations, pages))
+    if analysis is not None:
+        return cached_response(analysis, "hit")
+
+    if request.args.get("async") in ("1", "true"):
+        return enqueue_analysis(file.stream, document_hash, regulations, pages)
+
+    try:
+        analysis = analyze_upload(upload_source(file.stream), document_hash, regulations, pages)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return cached_response(analysis, "miss")
+
+
+def requested_regulations():
+    """Regulations named in the `regulations` form field as configured, None for all, ValueError for unknown ones"""
+    names = [name for name in request.form.get("regulations", "").split(",") if name.strip()]
+    return clause_screen.resolve_regulations(names) if names else None
+
+
+def analysis_key(document_hash, regulations=None, pages=None):
+    return f"{document_hash}-{version_tag(ANALYSIS_VERSION, regulations, pages)}"
+
+
+def analyze_upload(source, document_hash, regulations=None, pages=None, extract=extract_text):
+    """Extract and analyze an uploaded PDF (a path or bytes), caching the text and the analysis by content hash"""
+    # Extract text page by page from the upload, large documents are split across processes
+    text_key = f"{document_hash}-{version_tag(EXTRACTOR_VERSION, pages)}"
+    cached_text = document_cache.get("text", text_key)
+    if cached_text is not None:
+        extracted_text = cached_text["text"]
+    else:
+        try:
+            extracted_text = extract(source, pages=pages)
+        except RuntimeError as e:  # PyMuPDF errors for empty or malformed files
+            print(f"Error reading uploaded PDF: {e}")
+            raise ValueError("Could not read the PDF file")
+        document_cache.put("text", text_key, {"text": extracted_text})
+
+    analysis = analyze_text(extracted_text, regulations)
+    # Degraded results are not cached so the next upload tries the model again
+    if not analysis.get("fallback") and not analysis.get("failed_chunks"):
+        document_cache.put("analysis", analysis_key(document_hash, regulations, pages), analysis)
+    return analysis
+
+
+def enqueue_analysis(stream, document_hash, regulations, pages=None):
+    """Store the upload next to the job queue and answer 202 with the job to poll"""
+    upload_dir = os.path.join(ANALYSIS_JOB_DIR, "uploads")
+    os.makedirs(upload_dir, exist_ok=True)
+    fd, upload_path = tempfile.mkstemp(dir=upload_dir, suffix=".pdf")
+    with os.fdopen(fd, "wb") as f:
+        shutil.copyfileobj(stream, f)
+
+    payload = {"upload": upload_path, "document_hash": document_hash, "regulations": regulations, "pages": pages}
+    try:
+        job_id = analysis_jobs.enqueue("analyze_document", payload)
+    except JobQueueFull:
+        os.remove(upload_path)
+        response = jsonify({"error": "Too many documents queued for analysis, try again later"})
+        response.headers["Retry-After"] = "30"
+        return response, 503
+
+    response = jsonify({"job_id": job_id, "status": "pending", "status_url": f"/api/compliance/jobs/{job_id}"})
+    response.headers["Location"] = f"/api/compliance/jobs/{job_id}"
+    return response, 202
+
+
+def run_analysis_job(payload):
+    """Background task behind ?async=1, the stored upload is removed once it has been analyzed"""
+    try:
+        return analyze_upload(payload["upload"], payload["document_hash"], payload["regulations"],
+                              payload.get("pages"))
+    finally:
+        try:
+            os.remove(payload["upload"])
+        except OSError:
+            pass
+
+
+analysis_jobs.register("analyze_document", run_analysis_job)
+analysis_jobs.resume()
+
+
+@compliance_bp.route('/analyze-batch', methods=['POST'])
+def analyze_batch():
+    """Analyze every PDF of an uploaded ZIP archive, streaming results and progress back as NDJSON"""
+    if "file" not in request.files:
+        return jsonify({"error": "No file uploaded"}), 400
+
+    # Members are read one at a time from the (spooled) upload, nothing is extracted to disk.
+    # The archive gets its own handle, the request closes its files before the stream is read.
+    source = upload_source(request.files["file"].stream)
+    try:
+        archive = zipfile.ZipFile(source if isinstance(source, str) else io.BytesIO(source))
+    except zipfile.BadZipFile:
+        return jsonify({"error": "Only ZIP archives are allowed"}), 400
+    members = [info for info in archive.infolist() if not info.is_dir() and not info.filename.startswith("__MACOSX/")]
+    if not members:
+        return jsonify({"error": "The archive contains no documents"}), 400
+    if len(members) > MAX_BATCH_DOCUMENTS:
+        return jsonify({"error": f"At most {MAX_BATCH_DOCUMENTS} documents per archive"}), 400
+
+    try:
+        regulations = requested_regulations()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    concurrency = max(1, min(BATCH_ANALYSIS_CONCURRENCY, len(members)))
+
+    def stream():
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        futures = []
+        try:
+            yield dumps_bytes({"event": "started", "total": len(members)}) + b"\n"
+            futures = [executor.submit(analyze_archive_member, archive, info, regulations) for info in members]
+            statuses = Counter()
+            # Emit each document as soon as it is ready, not in archive order
+            for completed, future in enumerate(as_completed(futures), 1):
+                result = future.result()
+                statuses[result["status"]] += 1
+                yield dumps_bytes({"event": "document", **result}) + b"\n"
+                yield dumps_bytes({"event": "progress", "completed": completed, "total": len(members)}) + b"\n"
+
+            yield dumps_bytes({
+                "event": "summary",
+                "total": len(members),
+                "succeeded": statuses["ok"],
+                "skipped": statuses["skipped"],
+                "failed": statuses["error"]
+            }) + b"\n"
+        finally:
+            # Stop queued documents if the client disconnects mid-stream, cancelling them
+            # here as shutdown(cancel_futures=True) needs Python 3.9
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+            archive.close()
+
+    return Response(stream_with_context(stream()), mimetype='application/x-ndjson')
+
+
+def analyze_archive_member(archive, info, regulations):
+    """Analyze one document of a batch archive, reporting failures instead of raising"""
+    name = info.filename
+    if info.file_size > MAX_UPLOAD_BYTES:
+        return {"document": name, "status": "error", "error": f"Larger than {MAX_UPLOAD_BYTES} bytes"}
+    try:
+        # Large members are spooled to disk like uploads, so concurrent members do not each sit in memory
+        with archive.open(info) as member:
+            spool, document_hash = spool_stream(member)
+        with spool:
+            if not is_pdf(spool):
+                return {"document": name, "status": "skipped", "error": "Not a PDF file"}
+
+            analysis = document_cache.get("analysis", analysis_key(document_hash, regulations))
+            if analysis is not None:
+                return {"document": name, "status": "ok", "cached": True, "analysis": analysis}
+
+            # Documents are extracted in the process pool and their completions share the
+            # LLM scheduler, behind interactive requests
+            with llm_priority("bulk"):
+                analysis = analyze_upload(upload_source(spool), document_hash, regulations,
+                                          extract=extract_text_in_worker)
+    except ValueError as e:
+        return {"document": name, "status": "error", "error": str(e)}
+    except Exception as e:
+        print(f"Error analyzing {name} from a batch archive: {e}")
+        return {"document": name, "status": "error", "error": str(e)}
+    return {"document": name, "status": "ok", "cached": False, "analysis": analysis}
+
+
+@compliance_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_analysis_job(job_id):
+    """Poll a document analysis job, `wait` long-polls for up to that many seconds"""
+    try:
+        wait = min(float(request.args.get('wait', 0)), MAX_JOB_WAIT)
+    except ValueError:
+        return jsonify({"error": "wait must be a number"}), 400
+    job = analysis_jobs.get(job_id, wait=wait)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
+
+
+def cached_response(analysis, cache_status):
+    response = jsonify(analysis)
+    response.headers["X-Cache"] = cache_status
+    return response
+
+
+def build_analysis_messages(chunk, index, total, screen):
+    """Prompt analyzing one chunk of a document, with the pre-screen's hints for the whole document"""
+    part = f" This is part {index + 1} of {total} of the document, judge only this part." if total > 1 else ""
+    return [{
         "role":
             "user",
         "content":
             f"""You are a compliance expert analyzing legal documents.
-            Analyze the following document for legal and compliance irregularities.
+            Analyze the following document for legal and compliance irregularities.{part}
         Identify missing clauses, ambiguous language, and potential legal risks.
         Answer in JSON format with the following keys: identified clauses, compliance concerns, suggested actions and a compliance score from 0 to 100%.
 
+        A keyword pre-screen of the whole document found these clauses: {screen["found_requirements"] + screen["found_clauses"]}
+        It found no wording for: {screen["missing_requirements"]}
+        It flagged this wording for review: {screen["risk_terms"]}
+
         Document:
-        {extracted_text}""",
+        {chunk}""",
     }]
-    chat_response = client.chat.complete(model=model, messages=messages, response_format={
-        "type": "json_object",
-    })
 
-    os.remove(temp_path)  # Cleanup the temporary file
-    return chat_response.choices[0].message.content
+
+def analyze_text(extracted_text, regulations=None):
+    """Pre-screen the document, then analyze only its flagged chunks concurrently and merge them into one report"""
+    screen = clause_screen.screen(extracted_text, regulations)
+    chunks = chunk_document(extracted_text)
+    if screen["conclusive"]:
+        # Every required clause is present and nothing needs review
+        return {**screen_report(screen), "chunks": len(chunks), "analyzed_chunks": 0}
+    # A document the screen recognizes nothing in is reviewed in full
+    flagged = [chunk for chunk in chunks if clause_screen.is_flagged(chunk)] or chunks
+
+    analyses = map_chunks(flagged, lambda index, chunk: loads(
+        complete_json("analyze_document", build_analysis_messages(chunk, index, len(flagged), screen))))
+    if not any(isinstance(analysis, dict) for analysis in analyses):
+        return generate_fallback_analysis(extracted_text, regulations)
+
+    report = merge_analyses(analyses, flagged)
+    for concern in screen_report(screen)["compliance_concerns"]:
+        if concern not in report["compliance_concerns"]:
+            report["compliance_concerns"].append(concern)
+    report.update(chunks=len(chunks), analyzed_chunks=len(flagged), clause_screen=screen)
+    return report
+
+
+def screen_report(screen):
+    """Analysis report built from the clause pre-screen alone"""
+    found = screen["found_requirements"]
+    required = len(found) + len(screen["missing_requirements"])
+    return {
+        "identified_clauses": found + screen["found_clauses"],
+        "compliance_concerns": [f"No clause found for {clause}" for clause in screen["missing_requirements"]] +
+                               [f"Review the wording \"{term}\"" for term in screen["risk_terms"]],
+        "suggested_actions": ["Add the missing clauses before signing"] if screen["missing_requirements"] else [],
+        "compliance_score": round(100 * len(found) / required) if required else 100,
+        "clause_screen": screen
+    }
+
+
+def generate_fallback_analysis(extracted_text, regulations=None):
+    """Generate a basic analysis from the clause pre-screen if the API call fails"""
+    return {
+        **screen_report(clause_screen.screen(extracted_text, regulations)),
+        "suggested_actions": ["Automated analysis is currently unavailable, schedule a manual legal review"],
+        "fallback": True
+    }
 
 
 @compliance_bp.route('/requirements', methods=['POST'])
@@ -77,25 +369,39 @@ def get_requirements():
     if not extracted_text:
         return jsonify({"error": "No user_text provided"}), 400  # Return error if empty
 
-    suppliers_database_json = str(suppliers_data)
+    # Narrow the catalog to the best candidates so the prompt size does not grow with it
+    candidates = supplier_index.search(extracted_text, k=SUPPLIER_MATCH_TOP_K)
+    if not candidates:
+        return jsonify({"suppliers": []})
+    suppliers_database_json = dumps_bytes([compact(candidate["supplier"]) for candidate in candidates]).decode("utf-8")
 
     # Process the extracted text (e.g., send it to Mistral, or return it for now)
     messages = [{
         "role":
             "user",
         "content":
-            f"""You are an AI assistant specializing in supplier selection. Your task is to analyze user-provided supplier requirements and match them with the most suitable suppliers from a given database, which in our case is a list of suppliers in JSON format. After analyzing the availiable suppliers from the list, output in JSON format which suppliers fit the requirements (if any) and give reasons why they are a good fit.
+            f"""You are an AI assistant specializing in supplier selection. Your task is to analyze user-provided supplier requirements and match them with the most suitable suppliers from a given database, which in our case is a shortlist of candidate suppliers in JSON format. After analyzing the availiable suppliers from the list, output in JSON format which suppliers fit the requirements (if any) and give reasons why they are a good fit.
 
         Client's requirements:
         {extracted_text} \n\n
         Database:\n
          {suppliers_database_json}\n   """,
     }]
-    chat_response = client.chat.complete(model=model, messages=messages, response_format={
-        "type": "json_object",
-    })
+    try:
+        return raw_json_response(complete_json("requirements", messages))
+    except Exception as e:
+        print(f"Error matching suppliers with Mistral AI: {e}")
+        return jsonify(generate_fallback_matches(candidates))
+
 
-    return chat_response.choices[0].message.content
+def generate_fallback_matches(candidates):
+    """Return the retrieved candidates that matched a category or location if the API call fails"""
+    matches = [{
+        "id": candidate["supplier"]["id"],
+        "name": candidate["supplier"]["name"],
+        "reasons": candidate["reasons"]
+    } for candidate in candidates if candidate["reasons"]]
+    return {"suppliers": matches, "fallback": True}
 
 
 @compliance_bp.route('/verify', methods=['POST'])
@@ -104,18 +410,120 @@ def verify_compliance():
     data = request.json
     supplier_id = data.get('supplier_id')
     document_id = data.get('document_id')
+    if supplier_id is None:
+        return jsonify({"error": "supplier_id is required"}), 400
 
-    # This would later connect to the knowledge graph to check actual compliance
-    verification_result = {
-        "status": "partially_compliant",
-        "compliant_areas": ["Environmental regulations", "Labor practices"],
-        "non_compliant_areas": ["Data protection requirements"],
-        "risk_score": 65,  # 0-100, higher is riskier
-        "recommended_actions": ["Request updated data protection policy", "Schedule compliance audit within 60 days"]
-    }
+    try:
+        verification_result = compliance_index.verify(supplier_id, as_of=data.get('as_of'),
+                                                      window_days=int(data.get('window_days', 60)),
+                                                      document_id=document_id)
+    except ValueError:
+        return jsonify({"error": "as_of must be a YYYY-MM-DD date and window_days a number"}), 400
 
     return jsonify(verification_result)
 
+
+@compliance_bp.route('/verify/batch', methods=['POST'])
+def verify_compliance_batch():
+    """Verify many suppliers in one call, every known supplier when supplier_ids is omitted"""
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "A JSON object is required"}), 400
+    supplier_ids = data.get('supplier_ids')
+    if supplier_ids is not None and not (isinstance(supplier_ids, list) and all(
+            isinstance(supplier_id, (str, int)) and not isinstance(supplier_id, bool) for supplier_id in supplier_ids)):
+        return jsonify({"error": "supplier_ids must be a list of strings or integers"}), 400
+    if supplier_ids is not None and len(supplier_ids) > MAX_BATCH_VERIFICATIONS:
+        return jsonify({"error": f"At most {MAX_BATCH_VERIFICATIONS} suppliers per batch"}), 400
+    window_days = data.get('window_days', 60)
+    as_of = data.get('as_of')
+    if isinstance(window_days, bool) or not isinstance(window_days, int) or not isinstance(as_of, (str, type(None))):
+        return jsonify({"error": "as_of must be a YYYY-MM-DD date and window_days an integer"}), 400
+
+    try:
+        return jsonify(compliance_index.verify_many(supplier_ids, as_of=as_of, window_days=window_days))
+    except ValueError:
+        return jsonify({"error": "as_of must be a YYYY-MM-DD date and window_days a number"}), 400
+
+
+@compliance_bp.route('/expiring', methods=['GET'])
+def get_expiring():
+    """Compliance records and certifications expiring within `within` days of `as_of`"""
+    try:
+        records = compliance_index.expiring(request.args.get('as_of'), int(request.args.get('within', 60)),
+                                            include_expired=request.args.get('include_expired', 'true') == 'true')
+    except ValueError:
+        return jsonify({"error": "as_of must be a YYYY-MM-DD date and within a number"}), 400
+    return jsonify({"records": records})
+
+
+def refresh_applicability():
+    """Sync the applicability matrix with the supplier data once its file changed, recomputing only changed rows
+
+    The file is re-read on its own, load_mock_data's cache stays as it is for
+    the other indexes built from it at startup.
+    """
+    global applicability_mtime
+    mtime = mock_data_mtime()
+    if mtime == applicability_mtime:
+        return 0
+    with applicability_lock:
+        # Another request may have synced this version while we waited
+        if mtime == applicability_mtime:
+            return 0
+        changed = applicability.sync(read_mock_data().get('suppliers', []))
+        applicability_mtime = mtime
+        return changed
+
+
+@compliance_bp.route('/applicability', methods=['GET'])
+def get_applicability():
+    """Suppliers that all (or with match=any, some) of the `regulations` apply to, or per-regulation counts"""
+    refresh_applicability()
+    regulations = list(filter(None, request.args.get('regulations', '').split(',')))
+    if not regulations:
+        return jsonify({"counts": applicability.counts()})
+
+    match = request.args.get('match', 'all')
+    if match not in ('all', 'any'):
+        return jsonify({"error": "match must be all or any"}), 400
+    try:
+        supplier_ids = applicability.suppliers_for(regulations, match)
+    except KeyError as e:
+        return jsonify({"error": e.args[0]}), 400
+
+    names = {supplier['id']: supplier.get('name') for supplier in load_mock_data().get('suppliers', [])}
+    return jsonify({
+        "regulations": regulations,
+        "match": match,
+        "suppliers": [{"id": supplier_id, "name": names.get(supplier_id)} for supplier_id in supplier_ids]
+    })
+
+
+@compliance_bp.route('/applicability/<supplier_id>', methods=['GET'])
+def get_supplier_regulations(supplier_id):
+    """Regulations that apply to one supplier"""
+    refresh_applicability()
+    key = int(supplier_id) if supplier_id.isdigit() else supplier_id
+    regulations = applicability.regulations_for(key)
+    if regulations is None:
+        return jsonify({"error": "Supplier not found"}), 404
+    return jsonify({"supplier_id": key, "regulations": regulations})
+
+
+@compliance_bp.route('/alerts', methods=['GET'])
+def get_alerts():
+    """Expiry alerts raised after the `since` cursor, pass `next_cursor` back to read on"""
+    try:
+        since = int(request.args.get('since', 0))
+        limit = min(int(request.args.get('limit', 100)), 1000)
+    except ValueError:
+        return jsonify({"error": "since and limit must be integers"}), 400
+    # Whatever is due by now is in the feed, even if the worker thread has not woken up yet
+    expiry_scheduler.fire_due()
+    return jsonify(expiry_scheduler.alerts_since(since, limit))
+
+
 # @compliance_bp.route('/test', methods=['GET'])
 # def test():
 #    messages = [
@@ -1,4 +1,9 @@
 """Mock data for the Tacto API"""
+import json
+import os
+from functools import lru_cache
+
+MOCK_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mock_data.json')
 
 # Sample supplier data
 suppliers_data = [{
@@ -159,3 +164,39 @@ orders_data = [{
 
 # Sample negotiations data (would be expanded in full implementation)
 negotiations_data = []
+
+
+def mock_data_mtime(json_file_path=MOCK_DATA_PATH):
+    """Modification time of the mock dataset, to notice edits made while the server runs"""
+    try:
+        return os.stat(json_file_path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def read_mock_data(json_file_path=MOCK_DATA_PATH):
+    """Parse the extended mock dataset as it is on disk now, without the cache
+
+    The file holds several JSON documents back to back, their keys are merged.
+    """
+    data = {"suppliers": [], "orders": [], "negotiations": [], "compliance": []}
+    try:
+        with open(json_file_path, 'r') as file:
+            content = file.read()
+        decoder = json.JSONDecoder()
+        position = 0
+        while position < len(content):
+            if content[position].isspace():
+                position += 1
+                continue
+            document, position = decoder.raw_decode(content, position)
+            data.update(document)
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"Error loading mock data: {e}")
+    return data
+
+
+@lru_cache(maxsize=None)
+def load_mock_data(json_file_path=MOCK_DATA_PATH):
+    """Parse the extended mock dataset once per process, callers share the returned dict and must not mutate it"""
+    return read_mock_data(json_file_path)
@@ -0,0 +1,10 @@
+from flask import Blueprint, jsonify
+from utils.llm import breaker_states, scheduler
+
+monitoring_bp = Blueprint('monitoring', __name__)
+
+
+@monitoring_bp.route('/llm', methods=['GET'])
+def llm_status():
+    """Get the circuit breaker state of every LLM-backed endpoint and the scheduler queues"""
+    return jsonify({"breakers": breaker_states(), "scheduler": scheduler.metrics()})
@@ -1,35 +1,117 @@
-from flask import Blueprint, request, jsonify
-from .mock_data import negotiations_data, suppliers_data
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from .mock_data import negotiations_data, suppliers_data, load_mock_data
 from dotenv import load_dotenv
 import os
-from mistralai import Mistral
 import json
+import tempfile
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from utils.dossier_store import DossierPrecomputer
+from utils.llm import complete_json
+from utils.llm_scheduler import llm_priority
+from utils.negotiation_store import NegotiationStore
+from utils.portfolio_planner import plan_portfolio
+from utils.savings_model import load_model
+from utils.jobs import JobManager
+from utils.json_provider import dumps_bytes, loads, raw_json_response
 
 negotiations_bp = Blueprint('negotiations', __name__)
 
 load_dotenv()
-api_key = os.getenv("MISTRAL_API_KEY")
-model = "mistral-large-latest"
 
-client = Mistral(api_key=api_key)
+# Upper bound on concurrent completions for a single batch request
+DOSSIER_BATCH_CONCURRENCY = int(os.getenv("DOSSIER_BATCH_CONCURRENCY", 8))
 
+# Seconds between scans of the supplier records for changed dossiers
+DOSSIER_REFRESH_INTERVAL = float(os.getenv("DOSSIER_REFRESH_INTERVAL", 60))
 
-def ai_call(prompt):
+# Background LLM refinements for "fast" mode requests, persisted so any worker can answer a poll
+REFINEMENT_JOB_DIR = os.getenv("REFINEMENT_JOB_DIR",
+                               os.path.join(tempfile.gettempdir(), "tacto-refinement-jobs"))
+refinement_jobs = JobManager(max_workers=int(os.getenv("REFINEMENT_WORKERS", 4)), name="refinement",
+                             store_dir=REFINEMENT_JOB_DIR)
+MAX_JOB_WAIT = 30
+
+
+def ai_call(prompt, endpoint="dossier"):
     messages=[
         {
             "role": "user",
             "content": f"{prompt}"
         }
     ]
-    chat_response = client.chat.complete(
-        model=model,
-        messages= messages,
-        response_format={
-            "type": "json_object",
+    return complete_json(endpoint, messages)
+
+
+
+def build_dossier_prompt(supplier):
+    """Build the dossier prompt for a single supplier record"""
+    prompt = f"""You are a bussiness assistant and your task is to draw up a dossier to a supplier using the following information availiable about the supplier:\n
+    {str(supplier)}\n
+    Here is which essencial information the dossier should contain:\n
+    supplier_name, key_contacts, previous_negotiations, suggested_strategies, pricing_insights (current_pricing = avg_price, market_average = avg_price*0,95, suggested_target = avg_price*0,9), SWAT analysis, negotiation strategy, risk assessment, but feel free to add any helpful information based on the supplier data availiable. Make sure to organise the dossier using JSON formatting.
+    """
+    return prompt
+
+
+def build_dossier(supplier):
+    """Generate a dossier for a supplier record with Mistral AI"""
+    return loads(ai_call(build_dossier_prompt(supplier)))
+
+
+def build_background_dossier(supplier):
+    """Regenerate a dossier off the request path, at bulk priority"""
+    with llm_priority("bulk"):
+        return build_dossier(supplier)
+
+
+def generate_fallback_dossier(supplier):
+    """Generate a basic dossier from supplier data if the API call fails"""
+    return {
+        "supplier_name": supplier['name'],
+        "key_contacts": supplier.get('contacts', []),
+        "previous_negotiations": [],
+        "suggested_strategies": [
+            "Focus on volume discounts", "Highlight long-term partnership benefits", "Negotiate payment terms extension"
+        ],
+        "pricing_insights": {
+            "current_pricing": supplier.get('avg_price', 0),
+            "market_average": supplier.get('avg_price', 0) * 0.95,
+            "suggested_target": supplier.get('avg_price', 0) * 0.9
         }
-    )
-    return chat_response.choices[0].message.content
+    }
+
 
+dossier_precomputer = DossierPrecomputer(generate_fn=build_background_dossier,
+                                         suppliers_fn=lambda: suppliers_data,
+                                         interval=DOSSIER_REFRESH_INTERVAL,
+                                         warm=os.getenv("DOSSIER_PRECOMPUTE_ALL", "false").lower() == "true")
+
+
+def get_or_build_dossier(supplier):
+    """Serve the stored dossier if there is one, otherwise generate and store it now
+
+    When generation fails the basic dossier is returned instead, with
+    "fallback" set and the error, so callers can report the failure.
+    """
+    dossier_precomputer.start()
+    entry = dossier_precomputer.get(supplier)
+    if entry is not None:
+        return entry
+
+    try:
+        return dossier_precomputer.store(supplier, build_dossier(supplier))
+    except Exception as e:
+        print(f"Error generating dossier with Mistral AI: {e}")
+        # Serve the basic dossier now and retry generation in the background
+        dossier_precomputer.schedule(supplier['id'])
+        return {
+            "dossier": generate_fallback_dossier(supplier),
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "stale": True,
+            "fallback": True,
+            "error": str(e)
+        }
 
 
 @negotiations_bp.route('/generate-dossier', methods=['POST'])
@@ -43,37 +125,98 @@ def generate_dossier():
     if not supplier:
         return jsonify({"error": "Supplier not found"}), 404
 
-    # Generate mock dossier
-    # In real implementation, this would use Mistral AI
+    entry = get_or_build_dossier(supplier)
+    return jsonify({**entry["dossier"], "stale": entry["stale"], "generated_at": entry["generated_at"]})
+
+
+def build_batch_dossier(supplier_id):
+    """Generate one dossier of a batch, reporting failures instead of raising"""
+    supplier = get_supplier_by_id(suppliers_data, supplier_id)
+    if not supplier:
+        return {"supplier_id": supplier_id, "status": "error", "error": "Supplier not found"}
 
-    prompt = f"""You are a bussiness assistant and your task is to draw up a dossier to a supplier using the following information availiable about the supplier:\n
-    {str(supplier)}\n
-    Here is which essencial information the dossier should contain:\n
-    supplier_name, key_contacts, previous_negotiations, suggested_strategies, pricing_insights (current_pricing = avg_price, market_average = avg_price*0,95, suggested_target = avg_price*0,9), SWAT analysis, negotiation strategy, risk assessment, but feel free to add any helpful information based on the supplier data availiable. Make sure to organise the dossier using JSON formatting.
-    """
-    # dossier = {
-        # "supplier_name": supplier['name'],
-        # "key_contacts": supplier.get('contacts', []),
-        # "previous_negotiations": [],
-        # "suggested_strategies": [
-            # "Focus on volume discounts", "Highlight long-term partnership benefits", "Negotiate payment terms extension"
-        # ],
-        # "pricing_insights": {
-            # "current_pricing": supplier.get('avg_price', 0),
-            # "market_average": supplier.get('avg_price', 0) * 0.95,
-            # "suggested_target": supplier.get('avg_price', 0) * 0.9
-        # }
-    # }
-
-    return ai_call(prompt)
-
-def load_mock_data(json_file_path='api/mock_data.json'):
     try:
-        with open(json_file_path, 'r') as file:
-            return json.load(file)
-    except (FileNotFoundError, json.JSONDecodeError) as e:
-        print(f"Error loading mock data: {e}")
-        return {"suppliers": [], "orders": [], "negotiations": [], "compliance": []}
+        # Batch work only uses capacity that interactive requests leave over
+        with llm_priority("bulk"):
+            entry = get_or_build_dossier(supplier)
+    except Exception as e:
+        print(f"Error generating dossier for {supplier_id}: {e}")
+        return {"supplier_id": supplier_id, "status": "error", "error": str(e)}
+
+    if entry.get("fallback"):
+        # The basic dossier is still sent, but the supplier counts as failed
+        return {
+            "supplier_id": supplier_id,
+            "status": "fallback",
+            "error": entry["error"],
+            "dossier": entry["dossier"],
+            "stale": entry["stale"],
+            "generated_at": entry["generated_at"]
+        }
+
+    return {
+        "supplier_id": supplier_id,
+        "status": "ok",
+        "dossier": entry["dossier"],
+        "stale": entry["stale"],
+        "generated_at": entry["generated_at"]
+    }
+
+
+@negotiations_bp.route('/dossiers/batch', methods=['POST'])
+def generate_dossiers_batch():
+    """Generate dossiers for many suppliers concurrently, streamed back as NDJSON"""
+    data = request.get_json() or {}
+    supplier_ids = data.get('supplier_ids', [])
+
+    if not isinstance(supplier_ids, list) or not supplier_ids:
+        return jsonify({"error": "supplier_ids must be a non-empty list"}), 400
+    if not all(isinstance(supplier_id, (str, int)) and not isinstance(supplier_id, bool)
+               for supplier_id in supplier_ids):
+        return jsonify({"error": "supplier_ids must be strings or integers"}), 400
+    try:
+        concurrency = int(data.get('concurrency', DOSSIER_BATCH_CONCURRENCY))
+    except (TypeError, ValueError):
+        return jsonify({"error": "concurrency must be an integer"}), 400
+
+    # Drop duplicates but keep the requested order for submission
+    supplier_ids = list(dict.fromkeys(supplier_ids))
+    concurrency = min(concurrency, DOSSIER_BATCH_CONCURRENCY)
+    concurrency = max(1, min(concurrency, len(supplier_ids)))
+
+    def stream():
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        futures = []
+        try:
+            futures = [executor.submit(build_batch_dossier, supplier_id) for supplier_id in supplier_ids]
+            succeeded = 0
+            # Emit each dossier as soon as it is ready, not in submission order
+            for future in as_completed(futures):
+                result = future.result()
+                if result["status"] == "ok":
+                    succeeded += 1
+                yield dumps_bytes(result) + b"\n"
+
+            yield dumps_bytes({
+                "summary": {
+                    "total": len(supplier_ids),
+                    "succeeded": succeeded,
+                    "failed": len(supplier_ids) - succeeded
+                }
+            }) + b"\n"
+        finally:
+            # Stop queued work if the client disconnects mid-stream, cancelling them
+            # here as shutdown(cancel_futures=True) needs Python 3.9
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    return Response(stream_with_context(stream()), mimetype='application/x-ndjson')
+
+
+# Negotiation history indexed by supplier, built once from the mock data
+negotiation_store = NegotiationStore(suppliers=load_mock_data().get('suppliers', []),
+                                     negotiations=load_mock_data().get('negotiations', []))
 
 
 # Get supplier by name
@@ -86,6 +229,56 @@ def get_supplier_by_id(suppliers, supplier_id):
     return next((s for s in suppliers if s["id"] == supplier_id), None)
 
 
+@negotiations_bp.route('/history', methods=['GET'])
+def get_negotiation_history():
+    """Get the negotiation history and summary stats for a supplier by ID or name"""
+    supplier = request.args.get('supplier', '')
+    if negotiation_store.resolve(supplier) is None:
+        return jsonify({"error": "Supplier not found"}), 404
+
+    return jsonify({
+        "history": negotiation_store.history_for(supplier),
+        "negotiations": negotiation_store.negotiations_for(supplier),
+        "stats": negotiation_store.stats_for(supplier)
+    })
+
+
+@negotiations_bp.route('/history', methods=['POST'])
+def add_negotiation():
+    """Record a negotiation, updating the supplier's history stats"""
+    negotiation = request.get_json(silent=True)
+    if not isinstance(negotiation, dict):
+        return jsonify({"error": "A JSON object is required"}), 400
+    if not negotiation.get('supplierId') and not negotiation.get('supplierName'):
+        return jsonify({"error": "supplierId or supplierName is required"}), 400
+
+    try:
+        supplier_id = negotiation_store.add_negotiation(negotiation)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"supplier_id": supplier_id, "stats": negotiation_store.stats_for(supplier_id)}), 201
+
+
+@negotiations_bp.route('/portfolio-plan', methods=['GET'])
+def get_portfolio_plan():
+    """Rank every supplier into a negotiation calendar by expected savings and renewal urgency"""
+    as_of = request.args.get('as_of') or datetime.now(timezone.utc).date().isoformat()
+    try:
+        datetime.strptime(as_of, "%Y-%m-%d")
+    except ValueError:
+        return jsonify({"error": "as_of must be a YYYY-MM-DD date"}), 400
+
+    suppliers = list(negotiation_store.suppliers_by_id.values())
+    if request.args.get('include_inactive', 'false').lower() != 'true':
+        suppliers = [s for s in suppliers if s.get("status", "active") == "active"]
+
+    calendar = plan_portfolio(suppliers, [negotiation_store.history_for(s["id"]) for s in suppliers], as_of)
+    limit = request.args.get('limit', type=int)
+    if limit is not None:
+        limit = max(1, limit)
+    return jsonify({"as_of": as_of, "calendar": calendar[:limit] if limit else calendar})
+
+
 @negotiations_bp.route('/strategies', methods=['GET'])
 def get_strategies():
     """Get pricing strategies based on supplier and product"""
@@ -93,16 +286,10 @@ def get_strategies():
     product_category = request.args.get('category')
     description = request.args.get('description')
 
-    # Load the mock data
-    mock_data = load_mock_data()
-
-    # Find supplier information from mock data
-    supplier = get_supplier_by_name(mock_data.get('suppliers', []), supplier_name)
-
-    # Gather historical negotiation data if available
-    negotiation_history = []
-    if supplier:
-        negotiation_history = supplier.get("negotiationHistory", [])
+    # Find supplier information and its indexed negotiation history
+    supplier = negotiation_store.supplier(supplier_name)
+    negotiation_history = negotiation_store.history_for(supplier_name)
+    negotiation_stats = negotiation_store.stats_for(supplier_name)
 
     # Get supplier performance metrics to inform strategies
     performance_metrics = {}
@@ -118,16 +305,16 @@ def get_strategies():
         }
 
     # Get past negotiations with this supplier
-    past_strategies = []
-    for negotiation in mock_data.get('negotiations', []):
-        if negotiation.get("supplierName") == supplier_name:
-            past_strategies.append({
-                "targetSavings": negotiation.get("targetSavings"),
-                "status": negotiation.get("status"),
-                "currentStage": negotiation.get("currentStage"),
-                "outcome": negotiation.get("outcome", "In progress"),
-                "actualSavings": negotiation.get("actualSavings", 0)
-            })
+    past_strategies = [{
+        "targetSavings": negotiation.get("targetSavings"),
+        "status": negotiation.get("status"),
+        "currentStage": negotiation.get("currentStage"),
+        "outcome": negotiation.get("outcome", "In progress"),
+        "actualSavings": negotiation.get("actualSavings", 0)
+    } for negotiation in negotiation_store.negotiations_for(supplier_name)]
+
+    # Savings the trained model expects for this supplier, used instead of the LLM's own guess
+    savings_estimate = predict_savings(supplier, negotiation_stats)
 
     # Use Mistral AI to generate strategies based on our mock data
     prompt_context = {
@@ -135,6 +322,8 @@ def get_strategies():
         "performance_metrics": performance_metrics,
         "negotiation_history": negotiation_history,
         "past_strategies": past_strategies,
+        "negotiation_stats": negotiation_stats,
+        "expected_savings": savings_estimate,
         "product_category": product_category,
         "description": description
     }
@@ -165,33 +354,74 @@ def get_strategies():
             """,
     }]
 
+    if is_fast_mode():
+        fallback_strategies = generate_fallback_strategies(supplier, product_category, negotiation_stats)
+        return jsonify(start_refinement("strategies", {"messages": messages, "savings_estimate": savings_estimate},
+                                        fallback_strategies))
+
     try:
-        chat_response = client.chat.complete(model=model, messages=messages, response_format={
-            "type": "json_object",
-        })
-        strategies = chat_response.choices[0].message.content
-        return jsonify(strategies)
+        strategies = complete_json("strategies", messages)
+        if savings_estimate is None and strategies.lstrip().startswith("["):
+            # Already the list we asked for, send the model output untouched
+            return raw_json_response(strategies)
+        return jsonify(apply_savings_estimate(parse_strategies(strategies), savings_estimate))
     except Exception as e:
         # Fallback strategies based on supplier data if Mistral API fails
-        fallback_strategies = generate_fallback_strategies(supplier, product_category)
+        fallback_strategies = generate_fallback_strategies(supplier, product_category, negotiation_stats)
         return jsonify(fallback_strategies)
 
 
-def generate_fallback_strategies(supplier, product_category):
+def parse_strategies(content):
+    """Parse the model's strategies, unwrapping a JSON-mode object like {"strategies": [...]}"""
+    strategies = loads(content)
+    if isinstance(strategies, dict) and len(strategies) == 1:
+        (value,) = strategies.values()
+        if isinstance(value, list):
+            return value
+    return strategies
+
+
+def predict_savings(supplier, negotiation_stats):
+    """Expected savings for a supplier from the trained savings model, None for unknown suppliers"""
+    if not supplier:
+        return None
+    return load_model().predict(supplier, negotiation_stats.get("success_rate"))
+
+
+def apply_savings_estimate(strategies, savings_estimate):
+    """Replace the LLM's expected_savings guesses with the model's range"""
+    if savings_estimate is None or not isinstance(strategies, list):
+        return strategies
+    for strategy in strategies:
+        if isinstance(strategy, dict):
+            strategy["expected_savings"] = f"{savings_estimate['low']}-{savings_estimate['high']}%"
+    return strategies
+
+
+def generate_fallback_strategies(supplier, product_category, negotiation_stats=None):
     """Generate fallback strategies based on supplier data if API call fails"""
     strategies = []
 
     if not supplier:
         return default_strategies()
 
-    # Strategy 1: Based on historical discount
+    if negotiation_stats is None:
+        negotiation_stats = negotiation_store.stats_for(supplier.get("id"))
+    savings_estimate = predict_savings(supplier, negotiation_stats)
+    savings_range = f"{savings_estimate['low']}-{savings_estimate['high']}%"
+
+    # Strategy 1: Based on historical discount and how past negotiations went
     avg_discount = supplier.get("averageDiscount", 5)
+    success_rate = negotiation_stats.get("success_rate")
+    description = f"Leverage past discount of {avg_discount}% to negotiate better terms"
+    if success_rate is not None:
+        description += f" ({success_rate:.0%} of {negotiation_stats['negotiations']} past negotiations succeeded)"
     strategies.append({
         "name": "Historical Discount Enhancement",
-        "description": f"Leverage past discount of {avg_discount}% to negotiate better terms",
+        "description": description,
         "suggested_approach": f"Request {avg_discount + 2}% discount based on consistent order history",
-        "expected_savings": f"{avg_discount + 2}%",
-        "confidence": "High"
+        "expected_savings": f"{savings_estimate['expected']}%",
+        "confidence": "High" if success_rate is None or success_rate >= 0.5 else "Medium"
     })
 
     # Strategy 2: Based on contract timing
@@ -205,7 +435,7 @@ def generate_fallback_strategies(supplier, product_category):
             "suggested_approach":
                 f"Propose early renewal before {contract_expiry} with better terms for longer commitment",
             "expected_savings":
-                "5-8%",
+                savings_range,
             "confidence":
                 "Medium"
         })
@@ -223,7 +453,7 @@ def generate_fallback_strategies(supplier, product_category):
             "suggested_approach":
                 f"Highlight quality requirements for {product_category} and propose tiered pricing based on consistent quality above {quality_score}%",
             "expected_savings":
-                "4-7%",
+                savings_range,
             "confidence":
                 "Medium"
         })
@@ -236,7 +466,7 @@ def generate_fallback_strategies(supplier, product_category):
             "suggested_approach":
                 f"Propose standard pricing with reliability incentives (current reliability: {reliability_score}%)",
             "expected_savings":
-                "3-6%",
+                savings_range,
             "confidence":
                 "Medium"
         })
@@ -344,49 +574,99 @@ def draft_message():
         """,
     }]
 
+    if is_fast_mode(data):
+        fallback_response = generate_fallback_message(message_type, supplier_name, additional_context, key_points)
+        return jsonify(start_refinement("messages", {"messages": messages}, fallback_response))
+
     try:
-        chat_response = client.chat.complete(model=model, messages=messages, response_format={
-            "type": "json_object",
-        })
-        message_data = json.loads(chat_response.choices[0].message.content)
-        return jsonify(message_data)
+        # complete_json has already validated the JSON, pass it through as-is
+        return raw_json_response(complete_json("messages", messages))
     except Exception as e:
         print(f"Error generating message with Mistral AI: {e}")
         # Fallback to templates if API call fails
-        message_templates = {
-            "inquiry":
-                f"Dear {supplier_name},\n\nWe are interested in your products and would like to request more information about your pricing and availability for our upcoming projects.\n\nBest regards,\nTacto Team",
-            "negotiation":
-                f"Dear {supplier_name},\n\nThank you for your quote. We would like to discuss the possibility of a volume discount based on our projected annual needs.\n\nBest regards,\nTacto Team",
-            "followup":
-                f"Dear {supplier_name},\n\nI'm following up on our previous conversation regarding pricing. Have you had a chance to review our proposal?\n\nBest regards,\nTacto Team"
-        }
+        return jsonify(generate_fallback_message(message_type, supplier_name, additional_context, key_points))
+
+
+def generate_fallback_message(message_type, supplier_name, additional_context, key_points):
+    """Draft a message from templates if the API call fails"""
+    message_templates = {
+        "inquiry":
+            f"Dear {supplier_name},\n\nWe are interested in your products and would like to request more information about your pricing and availability for our upcoming projects.\n\nBest regards,\nTacto Team",
+        "negotiation":
+            f"Dear {supplier_name},\n\nThank you for your quote. We would like to discuss the possibility of a volume discount based on our projected annual needs.\n\nBest regards,\nTacto Team",
+        "followup":
+            f"Dear {supplier_name},\n\nI'm following up on our previous conversation regarding pricing. Have you had a chance to review our proposal?\n\nBest regards,\nTacto Team"
+    }
 
-        # Add any additional context if provided
-        body = message_templates.get(message_type, message_templates['inquiry'])
-        if additional_context:
-            # Insert additional context before the closing
+    # Add any additional context if provided
+    body = message_templates.get(message_type, message_templates['inquiry'])
+    if additional_context:
+        # Insert additional context before the closing
+        body_parts = body.rsplit("\n\n", 1)
+        body = f"{body_parts[0]}\n\n{additional_context}\n\n{body_parts[1]}"
+
+    # Add key points if provided
+    if key_points:
+        key_points_list = [point.strip() for point in key_points.split("\n") if point.strip()]
+        # Only include if there are actual points
+        if key_points_list:
             body_parts = body.rsplit("\n\n", 1)
-            body = f"{body_parts[0]}\n\n{additional_context}\n\n{body_parts[1]}"
-
-        # Add key points if provided
-        if key_points:
-            key_points_list = [point.strip() for point in key_points.split("\n") if point.strip()]
-            # Only include if there are actual points
-            if key_points_list:
-                body_parts = body.rsplit("\n\n", 1)
-                points_text = "\n".join([f"- {point}" for point in key_points_list])
-                body = f"{body_parts[0]}\n\nKey points:\n{points_text}\n\n{body_parts[1]}"
-
-        fallback_response = {
-            "subject":
-                f"Re: {message_type.capitalize()} with {supplier_name}",
-            "body":
-                body,
-            "suggested_tone":
-                "Professional and direct",
-            "key_points": [
-                "Reference previous communication", "Be specific about needs", "Include timeline expectations"
-            ]
-        }
-        return jsonify(fallback_response)
+            points_text = "\n".join([f"- {point}" for point in key_points_list])
+            body = f"{body_parts[0]}\n\nKey points:\n{points_text}\n\n{body_parts[1]}"
+
+    return {
+        "subject":
+            f"Re: {message_type.capitalize()} with {supplier_name}",
+        "body":
+            body,
+        "suggested_tone":
+            "Professional and direct",
+        "key_points": [
+            "Reference previous communication", "Be specific about needs", "Include timeline expectations"
+        ]
+    }
+
+
+def is_fast_mode(data=None):
+    """Whether the caller asked for the instant fallback with background refinement"""
+    mode = request.args.get('mode') or (data or {}).get('mode')
+    return mode == 'fast'
+
+
+def refine_strategies(payload):
+    """Background LLM strategies, at bulk priority so they leave capacity to interactive requests"""
+    with llm_priority("bulk"):
+        strategies = parse_strategies(complete_json("strategies", payload["messages"]))
+    return apply_savings_estimate(strategies, payload["savings_estimate"])
+
+
+def refine_message(payload):
+    """Background LLM message draft, at bulk priority"""
+    with llm_priority("bulk"):
+        return loads(complete_json("messages", payload["messages"]))
+
+
+refinement_jobs.register("strategies", refine_strategies)
+refinement_jobs.register("messages", refine_message)
+refinement_jobs.resume()
+
+
+def start_refinement(task, payload, fallback_result):
+    """Queue the LLM refinement and return the immediate response pointing at its job"""
+    job_id = refinement_jobs.enqueue(task, payload, initial_result=fallback_result)
+    return {"job_id": job_id, "status": "pending", "refined": False, "result": fallback_result}
+
+
+@negotiations_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Poll a refinement job, `wait` long-polls for up to that many seconds"""
+    try:
+        wait = min(float(request.args.get('wait', 0)), MAX_JOB_WAIT)
+    except ValueError:
+        return jsonify({"error": "wait must be a number"}), 400
+    job = refinement_jobs.get(job_id, wait=wait)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+
+    job["refined"] = job["status"] == "completed"
+    return jsonify(job)
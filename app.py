@@ -5,8 +5,15 @@ from api.suppliers import suppliers_bp
 from api.negotiations import negotiations_bp
 from api.compliance import compliance_bp
 from api.orders import orders_bp
+from api.monitoring import monitoring_bp
+from utils.json_provider import FastJSONProvider
+from utils.uploads import MAX_UPLOAD_BYTES, SpoolingRequest
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
+# Large uploads are spooled to disk, and anything above the limit is refused with 413 up front
+app.request_class = SpoolingRequest
+app.config["MAX_CONTENT_LENGTH"] = MAX_UPLOAD_BYTES
 CORS(app, resources={r"/api/*": {"origins": "*"}})
 
 # Register blueprints
@@ -14,6 +21,7 @@ app.register_blueprint(suppliers_bp, url_prefix='/api/suppliers')
 app.register_blueprint(negotiations_bp, url_prefix='/api/negotiations')
 app.register_blueprint(compliance_bp, url_prefix='/api/compliance')
 app.register_blueprint(orders_bp, url_prefix='/api/orders')
+app.register_blueprint(monitoring_bp, url_prefix='/api/monitoring')
 
 
 @app.route('/')
@@ -0,0 +1,90 @@
+"""Load-test the API offline against the local Mistral stand-in
+
+    python benchmarks/bench_api.py --requests 200 --concurrency 16 --median 1.5
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.mock_mistral_server import MockConfig, start_mock_server
+
+ENDPOINTS = {
+    "dossier": ("POST", "/api/negotiations/generate-dossier", {"json": {"supplier_id": "sup-001"}}),
+    "strategies": ("GET", "/api/negotiations/strategies", {"params": {"supplier": "ElectroTech Industries",
+                                                                       "category": "Electronics"}}),
+    "messages": ("POST", "/api/negotiations/messages", {"json": {"supplier": "ElectroTech Industries",
+                                                                 "type": "negotiation"}}),
+    "requirements": ("POST", "/api/compliance/requirements", {"json": {"user_text": "Sustainable packaging in EU"}}),
+    "suppliers": ("GET", "/api/suppliers/", {}),
+}
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--median", type=float, default=1.5, help="Median LLM latency in seconds")
+    parser.add_argument("--sigma", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS))
+    args = parser.parse_args()
+
+    config = MockConfig(latency="lognormal", median=args.median, sigma=args.sigma, error_rate=args.error_rate,
+                        rate_limit_rate=args.rate_limit_rate, seed=42)
+    mock_server, mock_url = start_mock_server(config=config)
+    os.environ["MISTRAL_SERVER_URL"] = mock_url
+    os.environ.setdefault("MISTRAL_API_KEY", "benchmark-key")
+
+    from werkzeug.serving import make_server
+    from app import app
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    api_server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=api_server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{api_server.server_port}"
+    session = requests.Session()
+    session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=args.concurrency))
+
+    print(f"LLM stand-in: lognormal median={args.median}s sigma={args.sigma}, "
+          f"errors={args.error_rate:.0%}, 429s={args.rate_limit_rate:.0%}")
+    print(f"{'endpoint':<14}{'ok':>6}{'err':>6}{'p50 ms':>10}{'p95 ms':>10}{'req/s':>9}")
+
+    for name in args.endpoints.split(","):
+        method, path, kwargs = ENDPOINTS[name]
+
+        def timed_call(_):
+            start = time.perf_counter()
+            response = session.request(method, base_url + path, timeout=120, **kwargs)
+            return response.status_code, time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            results = list(executor.map(timed_call, range(args.requests)))
+        elapsed = time.perf_counter() - start
+
+        latencies = [latency * 1000 for _, latency in results]
+        ok = sum(1 for status, _ in results if status < 400)
+        print(f"{name:<14}{ok:>6}{len(results) - ok:>6}{statistics.median(latencies):>10.1f}"
+              f"{percentile(latencies, 95):>10.1f}{len(results) / elapsed:>9.1f}")
+
+    api_server.shutdown()
+    mock_server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+"""Report supplier search relevance on a small labeled query set
+
+Loads the catalog in supplier_search_labels.json into the Weaviate at
+WEAVIATE_URL, runs every labeled query in each search mode and prints
+recall@k, MRR and nDCG@k, plus the latency of a first and a cached search.
+The benchmark suppliers are removed again afterwards unless --keep is given.
+
+With --offline no Weaviate is needed: the same search code runs against a
+local stand-in answering the BM25 queries with BM25 over the same properties
+and the nearText queries with the TF-IDF cosine of utils.supplier_retrieval.
+TF-IDF is lexical, so the vector rows then show no semantic matching and only
+the keyword, fusion and reranking numbers carry over to a real deployment.
+
+    python benchmarks/bench_hybrid_search.py --k 5
+    python benchmarks/bench_hybrid_search.py --k 5 --offline
+"""
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.supplier_retrieval import SupplierIndex
+from utils.weaviate_client import (BM25_PROPERTIES, SupplierKnowledgeGraph, get_knowledge_graph, supplier_uuid,
+                                    to_weaviate)
+from utils.weaviate_sync import SupplierSync, SyncState
+
+LABELS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "supplier_search_labels.json")
+
+# (label, search_suppliers keyword arguments)
+CONFIGURATIONS = [
+    ("vector (nearText)", {"mode": "vector"}),
+    ("keyword (BM25)", {"mode": "keyword"}),
+    ("hybrid, RRF only", {"mode": "hybrid", "rerank_results": False}),
+    ("hybrid, RRF + rerank", {"mode": "hybrid"}),
+]
+
+# Weaviate's BM25 defaults
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+QUERY_TEXT = re.compile(r'(?:concepts: \[|query: )("(?:[^"\\]|\\.)*")')
+QUERY_LIMIT = re.compile(r"limit: (\d+)")
+WORD = re.compile(r"[a-z0-9]+")
+
+
+class LocalQuery:
+    """Answers the raw GraphQL queries of SupplierKnowledgeGraph for the --offline run"""
+
+    def __init__(self, suppliers):
+        self.objects = [{**to_weaviate(supplier), "_additional": {"id": supplier_uuid(supplier["id"])}}
+                        for supplier in suppliers]
+        self.by_id = {supplier["id"]: obj for supplier, obj in zip(suppliers, self.objects)}
+        self.index = SupplierIndex(suppliers)
+        self.documents = [Counter(WORD.findall(" ".join(self._values(obj)).lower())) for obj in self.objects]
+        self.average_length = sum(sum(document.values()) for document in self.documents) / len(self.documents)
+        self.document_frequency = Counter(word for document in self.documents for word in document)
+
+    @staticmethod
+    def _values(obj):
+        for prop in BM25_PROPERTIES:
+            value = obj.get(prop) or ""
+            yield from value if isinstance(value, list) else [value]
+
+    def _bm25(self, text):
+        count = len(self.documents)
+        scores = []
+        for document in self.documents:
+            length = sum(document.values())
+            score = 0.0
+            for word in set(WORD.findall(text.lower())):
+                frequency = document.get(word, 0)
+                if frequency:
+                    idf = math.log(1 + (count - self.document_frequency[word] + 0.5) /
+                                   (self.document_frequency[word] + 0.5))
+                    score += idf * frequency * (BM25_K1 + 1) / (
+                        frequency + BM25_K1 * (1 - BM25_B + BM25_B * length / self.average_length))
+            scores.append(score)
+        return scores
+
+    def raw(self, graphql_query):
+        text = json.loads(QUERY_TEXT.search(graphql_query).group(1))
+        limit = int(QUERY_LIMIT.search(graphql_query).group(1))
+        if "bm25:" in graphql_query:
+            scores = self._bm25(text)
+            rows = sorted((row for row in range(len(scores)) if scores[row] > 0), key=lambda row: -scores[row])
+            hits = [self.objects[row] for row in rows[:limit]]
+        else:
+            hits = [{**self.by_id[match["supplier"]["id"]],
+                     "_additional": {"id": supplier_uuid(match["supplier"]["id"]), "certainty": match["score"]}}
+                    for match in self.index.search(text, k=limit)]
+        return {"data": {"Get": {"Supplier": hits}}}
+
+
+class LocalClient:
+    def __init__(self, suppliers):
+        self.query = LocalQuery(suppliers)
+
+
+def recall_at_k(ranked, relevant, k):
+    return len(set(ranked[:k]) & relevant) / len(relevant)
+
+
+def reciprocal_rank(ranked, relevant):
+    return next((1.0 / rank for rank, item in enumerate(ranked, start=1) if item in relevant), 0.0)
+
+
+def ndcg_at_k(ranked, relevant, k):
+    dcg = sum(1.0 / math.log2(rank + 1) for rank, item in enumerate(ranked[:k], start=1) if item in relevant)
+    ideal = sum(1.0 / math.log2(rank + 1) for rank in range(1, min(k, len(relevant)) + 1))
+    return dcg / ideal
+
+
+def evaluate(graph, queries, k, options):
+    totals = {"recall": 0.0, "mrr": 0.0, "ndcg": 0.0, "first_ms": 0.0, "cached_ms": 0.0}
+    for labeled in queries:
+        relevant = {supplier_uuid(supplier_id) for supplier_id in labeled["relevant"]}
+        search = lambda: graph.search_suppliers(labeled["query"], fields=["id"], limit=k,
+                                                price_target=labeled.get("price_target"), **options)
+        start = time.perf_counter()
+        ranked = [supplier["id"] for supplier in search()]
+        totals["first_ms"] += (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        search()
+        totals["cached_ms"] += (time.perf_counter() - start) * 1000
+
+        totals["recall"] += recall_at_k(ranked, relevant, k)
+        totals["mrr"] += reciprocal_rank(ranked, relevant)
+        totals["ndcg"] += ndcg_at_k(ranked, relevant, k)
+    return {name: total / len(queries) for name, total in totals.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="Leave the benchmark suppliers in Weaviate")
+    parser.add_argument("--offline", action="store_true", help="Search a local stand-in instead of Weaviate")
+    args = parser.parse_args()
+
+    with open(LABELS_PATH) as f:
+        labels = json.load(f)
+    if args.offline:
+        graph = SupplierKnowledgeGraph()
+        graph.client = LocalClient(labels["suppliers"])
+        graph.schema_ready = True
+        sync = None
+    else:
+        graph = get_knowledge_graph()
+        # A state file of its own, so the sync only ever adds or removes the benchmark suppliers
+        sync = SupplierSync(graph, SyncState(os.path.join(tempfile.gettempdir(), "tacto-bench-search-sync.json")))
+        sync.run(labels["suppliers"])
+
+    try:
+        print(f"{len(labels['suppliers'])} suppliers, {len(labels['queries'])} labeled queries, k={args.k}")
+        print(f"{'mode':<24}{'recall@k':>10}{'MRR':>8}{'nDCG@k':>9}{'first ms':>10}{'cached ms':>11}")
+        for label, options in CONFIGURATIONS:
+            graph.search_cache.clear()
+            report = evaluate(graph, labels["queries"], args.k, options)
+            print(f"{label:<24}{report['recall']:>10.3f}{report['mrr']:>8.3f}{report['ndcg']:>9.3f}"
+                  f"{report['first_ms']:>10.1f}{report['cached_ms']:>11.2f}")
+    finally:
+        if sync is not None and not args.keep:
+            sync.run([])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark PDF text extraction on a large contract
+
+Builds an N-page document by repeating contract.pdf and compares the old
+file-based extraction with in-memory extraction on 1..W processes.
+
+    python benchmarks/bench_pdf_extraction.py --pages 200 --repeat 5
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz
+
+from utils.pdf_extraction import PDF_EXTRACTION_WORKERS, extract_text, get_pool
+
+CONTRACT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "contract.pdf")
+
+
+def build_document(pages):
+    """PDF bytes made of contract.pdf repeated up to `pages` pages"""
+    with fitz.open(CONTRACT_PATH) as contract, fitz.open() as doc:
+        while doc.page_count < pages:
+            doc.insert_pdf(contract, to_page=min(contract.page_count, pages - doc.page_count) - 1)
+        return doc.tobytes()
+
+
+def extract_via_temp_file(data):
+    """The previous approach: write the upload to disk and concatenate page text"""
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
+        f.write(data)
+    text = ""
+    doc = fitz.open(f.name)
+    for page in doc:
+        text += page.get_text("text") + "\n"
+    doc.close()
+    os.remove(f.name)
+    return text
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    data = build_document(args.pages)
+    print(f"{args.pages} pages, {len(data) / 1e6:.1f} MB, {os.cpu_count()} CPUs, pool of {PDF_EXTRACTION_WORKERS}")
+
+    # Start the pool outside the timings, it lives for the whole server process
+    get_pool().submit(int).result()
+
+    baseline, expected = timed(lambda: extract_via_temp_file(data), args.repeat)
+    print(f"{'temp file + string +=':<28}{baseline * 1000:>10.1f} ms{args.pages / baseline:>10.0f} pages/s")
+
+    workers = 1
+    while workers <= PDF_EXTRACTION_WORKERS:
+        seconds, text = timed(lambda: extract_text(data, workers=workers), args.repeat)
+        assert text == expected
+        label = f"in memory, {workers} process{'es' if workers > 1 else ''}"
+        print(f"{label:<28}{seconds * 1000:>10.1f} ms{args.pages / seconds:>10.0f} pages/s"
+              f"{baseline / seconds:>8.2f}x")
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Microbenchmark JSON serialization paths used by the API
+
+    python benchmarks/bench_serialization.py --suppliers 10000
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from api.mock_data import load_mock_data
+from utils.json_provider import FastJSONProvider, is_valid_json, orjson
+from utils.mock_mistral_server import template_response
+
+
+def report(name, seconds, runs):
+    print(f"{name:<46}{seconds / runs * 1e6:>12.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--suppliers", type=int, default=10000, help="Size of the list endpoint payload")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    catalog = load_mock_data()["suppliers"]
+    suppliers = [dict(catalog[i % len(catalog)], id=i) for i in range(args.suppliers)]
+    llm_payload = json.dumps(template_response("dossier for {'name': 'Acme'}"))
+
+    default_app, fast_app = Flask("default"), Flask("fast")
+    default_app.json = DefaultJSONProvider(default_app)
+    fast_app.json = FastJSONProvider(fast_app)
+
+    print(f"orjson available: {orjson is not None}")
+    print(f"List endpoint, {args.suppliers} suppliers:")
+    with default_app.app_context():
+        report("  jsonify with the default provider", timeit.timeit(
+            lambda: default_app.json.response(suppliers).get_data(), number=args.runs), args.runs)
+    with fast_app.app_context():
+        report("  jsonify with FastJSONProvider", timeit.timeit(
+            lambda: fast_app.json.response(suppliers).get_data(), number=args.runs), args.runs)
+
+    runs = args.runs * 1000
+    print(f"LLM payload, {len(llm_payload)} bytes:")
+    with default_app.app_context():
+        report("  json.loads + jsonify (before)", timeit.timeit(
+            lambda: default_app.json.response(json.loads(llm_payload)).get_data(), number=runs), runs)
+    with fast_app.app_context():
+        report("  validate + raw passthrough (after)", timeit.timeit(
+            lambda: is_valid_json(llm_payload) and fast_app.response_class(
+                llm_payload.encode("utf-8"), mimetype="application/json").get_data(), number=runs), runs)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark peak memory of extracting a large, image-heavy (scanned-like) PDF upload
+
+Builds an N-page document with a noise image on every page, then measures
+the peak RSS of a fresh process that hashes and extracts it either from
+bytes held in memory (the previous upload handling) or from the spooled
+file, page by page.
+
+    python benchmarks/bench_upload_memory.py --pages 300
+"""
+import argparse
+import io
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz
+
+CONTRACT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "contract.pdf")
+
+
+def build_document(path, pages):
+    """Write a PDF of contract.pdf pages, each carrying an incompressible image like a scan"""
+    with fitz.open(CONTRACT_PATH) as contract, fitz.open() as doc:
+        while doc.page_count < pages:
+            doc.insert_pdf(contract, to_page=min(contract.page_count, pages - doc.page_count) - 1)
+        for page in doc:
+            scan = fitz.Pixmap(fitz.csRGB, 400, 400, os.urandom(400 * 400 * 3), False)
+            page.insert_image(fitz.Rect(50, 500, 250, 700), pixmap=scan)
+        doc.save(path)
+
+
+def child(mode, path):
+    from utils.pdf_extraction import extract_text
+    from utils.uploads import hash_stream
+
+    if mode == "bytes":
+        with open(path, "rb") as f:
+            data = f.read()
+        hash_stream(io.BytesIO(data))
+        text = extract_text(data, workers=1)
+    else:
+        with open(path, "rb") as f:
+            hash_stream(f)
+        text = extract_text(path, workers=1)
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{peak_mb:.1f} {len(text)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    parser.add_argument("--build", metavar="PATH", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(*args.child)
+        return
+    if args.build:
+        build_document(args.build, args.pages)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "scanned.pdf")
+        # Every step runs in its own process, a child starts with its parent's peak RSS
+        subprocess.run([sys.executable, __file__, "--build", path, "--pages", str(args.pages)], check=True)
+        print(f"{args.pages} pages, {os.path.getsize(path) / 1e6:.1f} MB")
+        for mode, label in (("bytes", "whole upload in memory"), ("path", "spooled file, page by page")):
+            output = subprocess.run([sys.executable, __file__, "--child", mode, path],
+                                    capture_output=True, text=True, check=True).stdout.split("\n")[-2].split()
+            print(f"{label:<30}{float(output[0]):>10.1f} MB peak RSS")
+
+
+if __name__ == '__main__':
+    main()
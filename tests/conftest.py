@@ -1,13 +1,28 @@
 # tests/conftest.py
+import atexit
 import pytest
 import sys
 import os
 import json
+import shutil
+import tempfile
 from flask import Flask
 
 # Add the parent directory to the path so we can import from the app
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from utils.mock_mistral_server import start_mock_server
+
+# Serve every completion from the local Mistral stand-in so the suite runs offline
+mock_mistral_server, mock_mistral_url = start_mock_server()
+os.environ["MISTRAL_SERVER_URL"] = mock_mistral_url
+os.environ.setdefault("MISTRAL_API_KEY", "test-key")
+# Keep cached document analyses from earlier runs out of the tests, and remove the directories afterwards
+for variable, prefix in (("DOCUMENT_CACHE_DIR", "tacto-test-cache-"), ("ANALYSIS_JOB_DIR", "tacto-test-jobs-"),
+                         ("REFINEMENT_JOB_DIR", "tacto-test-refinements-")):
+    os.environ[variable] = tempfile.mkdtemp(prefix=prefix)
+    atexit.register(shutil.rmtree, os.environ[variable], ignore_errors=True)
+
 from app import app as flask_app
 from api.mock_data import suppliers_data, compliance_data, orders_data
 
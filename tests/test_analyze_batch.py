@@ -0,0 +1,73 @@
+import io
+import json
+import os
+import time
+import zipfile
+
+from api import compliance
+from utils.document_cache import DocumentCache
+
+CONTRACT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "contract.pdf")
+
+
+def archive(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as z:
+        for name, data in members.items():
+            z.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+
+def contract_copies(count):
+    """Distinct copies of the contract, bytes after %%EOF change the hash but not the document"""
+    with open(CONTRACT_PATH, "rb") as f:
+        data = f.read()
+    return {f"contracts/contract-{number}.pdf": data + f"\n% copy {number}\n".encode() for number in range(count)}
+
+
+def post_batch(client, buffer):
+    response = client.post('/api/compliance/analyze-batch', data={"file": (buffer, "audit.zip")},
+                           content_type="multipart/form-data")
+    return response, [json.loads(line) for line in response.data.decode().splitlines()]
+
+
+def test_analyze_batch_streams_results_and_progress(client, tmp_path, monkeypatch):
+    """Test per-document results, progress events and a summary for a mixed archive."""
+    monkeypatch.setattr(compliance, "document_cache", DocumentCache(str(tmp_path)))
+    members = {**contract_copies(2), "notes.txt": b"not a document", "broken.pdf": b"%PDF-1.7 truncated"}
+    response, events = post_batch(client, archive(members))
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+
+    assert events[0] == {"event": "started", "total": 4}
+    documents = {event["document"]: event for event in events if event["event"] == "document"}
+    assert documents["contracts/contract-0.pdf"]["status"] == "ok"
+    assert "compliance_score" in documents["contracts/contract-1.pdf"]["analysis"]
+    assert documents["notes.txt"]["status"] == "skipped"
+    assert documents["broken.pdf"]["status"] == "error"
+    assert [event["completed"] for event in events if event["event"] == "progress"] == [1, 2, 3, 4]
+    assert events[-1] == {"event": "summary", "total": 4, "succeeded": 2, "skipped": 1, "failed": 1}
+
+
+def test_analyze_batch_runs_documents_concurrently(client, tmp_path, monkeypatch):
+    """Test that batch wall-clock time follows the concurrency limit, not the document count."""
+    monkeypatch.setattr(compliance, "document_cache", DocumentCache(str(tmp_path)))
+
+    def slow_analysis(text, regulations=None):
+        time.sleep(0.2)
+        return {"compliance_score": 100}
+
+    monkeypatch.setattr(compliance, "analyze_text", slow_analysis)
+    start = time.monotonic()
+    _, events = post_batch(client, archive(contract_copies(6)))
+    assert events[-1]["succeeded"] == 6
+    assert time.monotonic() - start < 0.8
+
+
+def test_analyze_batch_rejects_other_uploads(client):
+    assert client.post('/api/compliance/analyze-batch').status_code == 400
+    response, _ = post_batch(client, io.BytesIO(b"%PDF-1.7 not an archive"))
+    assert response.status_code == 400
+    response, _ = post_batch(client, archive({}))
+    assert response.status_code == 400
@@ -0,0 +1,103 @@
+import io
+
+import fitz
+import pytest
+
+from api import compliance
+from api.mock_data import compliance_data
+from utils.clause_screen import ClauseScreen
+
+GDPR_CONTRACT = """8. DATA PROTECTION
+The parties enter into a data processing agreement. The Supplier maintains data breach
+notification procedures and carries out privacy impact assessments before processing."""
+
+
+def screen():
+    return ClauseScreen(compliance_data, clause_dictionary={"Data processing agreement": ["DPA"],
+                                                            "Confidentiality": ["confidential"]})
+
+
+def test_screen_finds_requirements_and_clauses():
+    """Test found and missing hints for requirements, dictionary clauses and risky wording."""
+    result = screen().screen(GDPR_CONTRACT + "\nAll terms are Confidential and exclusive. See the DPA.")
+    assert result["found_requirements"][:3] == [
+        "GDPR: Data processing agreements", "GDPR: Privacy impact assessments",
+        "GDPR: Data breach notification procedures"
+    ]
+    assert "CCPA: Data inventory" in result["missing_requirements"]
+    assert result["found_clauses"] == ["Confidentiality", "Data processing agreement"]
+    assert result["risk_terms"] == ["exclusive"]
+    assert not result["conclusive"]
+
+
+def test_acronyms_are_case_sensitive():
+    """Test that acronym phrases do not match ordinary words."""
+    assert not screen().is_flagged("The shipment should reach the dpa warehouse.")
+    assert screen().is_flagged("Signed DPA attached.")
+
+
+def test_screen_scoped_to_regulations_is_conclusive():
+    """Test that the screen is conclusive once all requirements of the selected regulations are found."""
+    result = screen().screen(GDPR_CONTRACT, regulations=["GDPR"])
+    assert result["missing_requirements"] == []
+    assert result["conclusive"]
+
+
+def test_regulation_names_are_case_insensitive_and_checked():
+    """Test that "gdpr" selects GDPR and an unknown regulation is rejected rather than screening nothing."""
+    assert screen().screen(GDPR_CONTRACT, regulations=["gdpr"])["conclusive"]
+    with pytest.raises(ValueError, match="GPDR"):
+        screen().screen(GDPR_CONTRACT, regulations=["GPDR"])
+
+
+def test_unknown_regulation_is_rejected(client):
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), GDPR_CONTRACT, fontsize=8)
+    response = client.post('/api/compliance/analyze-document',
+                           data={"file": (io.BytesIO(doc.tobytes()), "gdpr.pdf"), "regulations": "nonsense"},
+                           content_type="multipart/form-data")
+    assert response.status_code == 400
+
+
+def test_document_without_known_clauses_reaches_llm(monkeypatch):
+    """Test that a contract the screen recognizes nothing in is reviewed by the model, not scored by the screen."""
+    prompts = []
+
+    def fake_complete_json(endpoint, messages):
+        prompts.append(messages[0]["content"])
+        return '{"identified clauses": [], "compliance concerns": ["No clauses"], "compliance score": 10}'
+
+    monkeypatch.setattr(compliance, "complete_json", fake_complete_json)
+    report = compliance.analyze_text("Acme sells widgets to Beta at the agreed prices.", regulations=["GDPR"])
+    assert len(prompts) == 1
+    assert report["analyzed_chunks"] == 1 and report["compliance_score"] == 10
+
+
+def test_conclusive_screen_skips_llm(client, monkeypatch):
+    """Test that a conclusive pre-screen answers without calling the model."""
+    monkeypatch.setattr(compliance, "complete_json", lambda *args: 1 / 0)
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), GDPR_CONTRACT, fontsize=8)
+    response = client.post('/api/compliance/analyze-document',
+                           data={"file": (io.BytesIO(doc.tobytes()), "gdpr.pdf"), "regulations": "GDPR"},
+                           content_type="multipart/form-data")
+    assert response.status_code == 200
+    assert response.json["analyzed_chunks"] == 0
+    assert response.json["compliance_score"] == 100
+    assert "fallback" not in response.json
+
+
+def test_only_flagged_chunks_reach_llm(monkeypatch):
+    """Test that chunks without clause or risk hints are not sent to the model."""
+    prompts = []
+
+    def fake_complete_json(endpoint, messages):
+        prompts.append(messages[0]["content"])
+        return '{"identified clauses": [], "compliance concerns": [], "compliance score": 70}'
+
+    monkeypatch.setattr(compliance, "complete_json", fake_complete_json)
+    monkeypatch.setattr(compliance, "chunk_document", lambda text: text.split("\n\n"))
+    report = compliance.analyze_text("1. PARTIES\nAcme and Beta.\n\n2. LIABILITY\nUnlimited liability applies.")
+    assert len(prompts) == 1 and "Unlimited liability" in prompts[0]
+    assert report["chunks"] == 2 and report["analyzed_chunks"] == 1
+    assert report["compliance_score"] == 70
@@ -0,0 +1,62 @@
+import time
+
+from utils.compliance_analysis import chunk_document, map_chunks, merge_analyses, split_clauses
+
+CONTRACT_TEXT = """SUPPLY AGREEMENT
+1. PARTIES
+Supplier: ElectroTech Industries
+2. CONFIDENTIALITY
+Both parties shall keep the terms of this Agreement confidential. """ + "Details apply. " * 200 + """
+3. GOVERNING LAW
+This Agreement is governed by the laws of California.
+"""
+
+
+def test_split_clauses_at_headings():
+    """Test that clauses start at numbered headings."""
+    clauses = split_clauses(CONTRACT_TEXT)
+    assert [clause.splitlines()[0] for clause in clauses] == [
+        "SUPPLY AGREEMENT", "1. PARTIES", "2. CONFIDENTIALITY", "3. GOVERNING LAW"
+    ]
+
+
+def test_chunks_are_bounded_and_lossless():
+    """Test that chunks respect the token budget and rejoin to the original text."""
+    chunks = chunk_document(CONTRACT_TEXT, max_tokens=200)
+    assert "".join(chunks) == CONTRACT_TEXT
+    assert all(len(chunk) // 4 <= 200 for chunk in chunks)
+    # Short clauses are packed together rather than split
+    assert chunks[0].startswith("SUPPLY AGREEMENT\n1. PARTIES")
+    assert chunks[-1].endswith("3. GOVERNING LAW\nThis Agreement is governed by the laws of California.\n")
+
+
+def test_map_chunks_runs_concurrently():
+    """Test that latency follows the slowest chunk, not the number of chunks."""
+
+    def analyze(index, chunk):
+        time.sleep(0.2)
+        if index == 3:
+            raise ValueError("malformed response")
+        return {"compliance score": 80}
+
+    start = time.monotonic()
+    analyses = map_chunks(["a", "b", "c", "d"], analyze)
+    assert time.monotonic() - start < 0.6
+    assert analyses == [{"compliance score": 80}] * 3 + [None]
+
+
+def test_merge_analyses():
+    """Test that findings are deduplicated and the score is weighted by chunk length."""
+    analyses = [
+        {"identified clauses": ["Confidentiality"], "compliance concerns": ["No breach notice"],
+         "suggested actions": [], "compliance score": "100%"},
+        {"identified_clauses": ["confidentiality", "Termination"], "compliance_concerns": [],
+         "suggested_actions": ["Add a DPA"], "compliance_score": 40},
+        None
+    ]
+    report = merge_analyses(analyses, ["x" * 400, "x" * 1200, "x" * 400])
+    assert report["identified_clauses"] == ["Confidentiality", "Termination"]
+    assert report["compliance_concerns"] == ["No breach notice"]
+    assert report["suggested_actions"] == ["Add a DPA"]
+    assert report["compliance_score"] == 55
+    assert report["chunks"] == 3 and report["failed_chunks"] == 1
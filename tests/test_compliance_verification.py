@@ -0,0 +1,69 @@
+import json
+
+from api.mock_data import load_mock_data
+from utils.compliance_verification import ComplianceIndex
+
+
+def make_index():
+    data = load_mock_data()
+    return ComplianceIndex(suppliers=data["suppliers"], records=data["compliance"])
+
+
+def test_expiring_queries_use_the_expiry_index():
+    """Test expired and expiring-within-window queries against a brute-force scan."""
+    index = make_index()
+    records = [record for _, _, record in index.expiry_index]
+    window = index.expiring("2024-01-01", within_days=60, include_expired=False)
+    assert window == sorted([r for r in records if "2024-01-01" <= r["expiry_date"] <= "2024-03-01"],
+                            key=lambda r: r["expiry_date"])
+    expired = index.expiring("2024-01-01", include_expired=True)
+    assert {r["name"] for r in expired} >= {"C-TPAT Certified", "ISO 14001:2015"}
+    assert all(r["expiry_date"] <= "2024-01-01" for r in expired)
+
+
+def test_verify_supplier_from_records():
+    """Test status, areas and actions computed from a supplier's records."""
+    result = make_index().verify(4, as_of="2024-01-01")
+    assert result["status"] == "partially_compliant"
+    assert "C-TPAT Certified" in result["non_compliant_areas"]
+    assert "ISO 9001:2015" in result["compliant_areas"]
+    assert any("C-TPAT" in action for action in result["recommended_actions"])
+    assert 0 <= result["risk_score"] <= 100
+
+
+def test_risk_score_rises_as_certifications_expire():
+    index = make_index()
+    assert index.verify("1", as_of="2023-01-01")["risk_score"] < index.verify(1, as_of="2026-01-01")["risk_score"]
+    assert index.verify(1, as_of="2026-01-01")["status"] == "non_compliant"
+
+
+def test_verify_unknown_supplier(client):
+    """Test that suppliers without records are reported as unverified."""
+    response = client.post('/api/compliance/verify', json={"supplier_id": "sup-999"})
+    assert response.status_code == 200
+    assert json.loads(response.data)["status"] == "unverified"
+
+
+def test_verify_batch(client):
+    """Test bulk verification of all suppliers and of an explicit list."""
+    response = client.post('/api/compliance/verify/batch', json={"as_of": "2024-01-01"})
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data["summary"]["total"] == len(load_mock_data()["suppliers"])
+
+    supplier_ids = [1, 2, 3] * 1000
+    response = client.post('/api/compliance/verify/batch', json={"supplier_ids": supplier_ids, "as_of": "2024-01-01"})
+    assert len(json.loads(response.data)["results"]) == 3000
+
+    response = client.post('/api/compliance/verify/batch', json={"as_of": "January"})
+    assert response.status_code == 400
+    for body in ({"supplier_ids": 5}, {"supplier_ids": [[1]]}, {"window_days": None}, {"window_days": [60]},
+                 {"as_of": 20240101}, [1, 2]):
+        assert client.post('/api/compliance/verify/batch', json=body).status_code == 400
+
+
+def test_expiring_endpoint(client):
+    response = client.get('/api/compliance/expiring?as_of=2024-01-01&within=90&include_expired=false')
+    assert response.status_code == 200
+    records = json.loads(response.data)["records"]
+    assert records and all("2024-01-01" <= r["expiry_date"] <= "2024-03-31" for r in records)
@@ -0,0 +1,40 @@
+import os
+
+from api import compliance
+from utils.document_cache import DocumentCache
+
+CONTRACT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "contract.pdf")
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Test that the cache stays under its size bound, dropping the oldest entries first."""
+    cache = DocumentCache(str(tmp_path), max_bytes=250)
+    cache.put("text", "a", {"text": "a" * 90})
+    cache.put("text", "b", {"text": "b" * 90})
+    assert cache.get("text", "a") is not None  # "a" is now the most recently used
+    cache.put("text", "c", {"text": "c" * 90})
+    assert cache.get("text", "b") is None
+    assert cache.get("text", "a") == {"text": "a" * 90}
+    assert cache.size() <= 250
+    # A new instance picks up the entries already on disk
+    assert DocumentCache(str(tmp_path)).get("text", "c") == {"text": "c" * 90}
+
+
+def test_repeat_upload_is_served_from_cache(client, tmp_path, monkeypatch):
+    """Test that the second upload of a document is a cache hit with the same analysis."""
+    monkeypatch.setattr(compliance, "document_cache", DocumentCache(str(tmp_path)))
+
+    def upload():
+        with open(CONTRACT_PATH, "rb") as f:
+            return client.post('/api/compliance/analyze-document',
+                               data={"file": (f, "contract.pdf")}, content_type="multipart/form-data")
+
+    first = upload()
+    assert first.status_code == 200
+    assert first.headers["X-Cache"] == "miss"
+
+    monkeypatch.setattr(compliance, "analyze_text", lambda text: 1 / 0)  # must not be reached
+    second = upload()
+    assert second.status_code == 200
+    assert second.headers["X-Cache"] == "hit"
+    assert second.json == first.json
@@ -0,0 +1,50 @@
+from utils.dossier_store import DossierPrecomputer, supplier_hash
+
+
+def make_precomputer(suppliers, **kwargs):
+    generated = []
+
+    def generate(supplier):
+        generated.append(supplier["id"])
+        return {"supplier_name": supplier["name"]}
+
+    return DossierPrecomputer(generate_fn=generate, suppliers_fn=lambda: suppliers, **kwargs), generated
+
+
+def test_supplier_hash_is_key_order_independent():
+    """Test that the hash only depends on the canonical JSON content."""
+    assert supplier_hash({"id": "a", "name": "A"}) == supplier_hash({"name": "A", "id": "a"})
+    assert supplier_hash({"id": "a", "name": "A"}) != supplier_hash({"id": "a", "name": "B"})
+
+
+def test_changed_supplier_is_served_stale_until_refreshed():
+    """Test that a changed record marks the dossier stale and schedules a refresh."""
+    suppliers = [{"id": "sup-1", "name": "Old Name"}]
+    precomputer, generated = make_precomputer(suppliers)
+    precomputer.store(suppliers[0], {"supplier_name": "Old Name"})
+
+    suppliers[0] = {"id": "sup-1", "name": "New Name"}
+    entry = precomputer.get(suppliers[0])
+    assert entry["stale"] is True
+    assert entry["dossier"]["supplier_name"] == "Old Name"
+    assert "sup-1" in precomputer.pending
+
+    precomputer.refresh(precomputer.queue.get_nowait())
+    entry = precomputer.get(suppliers[0])
+    assert entry["stale"] is False
+    assert entry["dossier"]["supplier_name"] == "New Name"
+    assert generated == ["sup-1"]
+
+
+def test_scan_only_schedules_changed_suppliers():
+    """Test that a scan skips unchanged records and, unless warming, unknown ones."""
+    suppliers = [{"id": "sup-1", "name": "A"}, {"id": "sup-2", "name": "B"}]
+    precomputer, _ = make_precomputer(suppliers)
+    precomputer.store(suppliers[0], {"supplier_name": "A"})
+    assert precomputer.scan() == []
+
+    suppliers[0] = {"id": "sup-1", "name": "A2"}
+    assert precomputer.scan() == ["sup-1"]
+
+    warm_precomputer, _ = make_precomputer(suppliers, warm=True)
+    assert warm_precomputer.scan() == ["sup-1", "sup-2"]
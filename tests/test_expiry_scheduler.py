@@ -0,0 +1,100 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+from api import compliance
+from utils.compliance_verification import ComplianceIndex
+from utils.expiry_scheduler import ExpiryScheduler
+
+
+class Clock:
+    def __init__(self, day):
+        self.now = datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc)
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, days):
+        self.now += timedelta(days=days)
+
+
+def record(name, expiry_date, supplier_id=1):
+    return {"supplier_id": supplier_id, "supplier_name": "Acme", "type": "certification", "name": name,
+            "expiry_date": expiry_date}
+
+
+def test_alerts_fire_only_when_due():
+    """Test each lead-time stage fires on its day and not before."""
+    clock = Clock(datetime(2024, 1, 1).date())
+    scheduler = ExpiryScheduler(now_fn=clock)
+    scheduler.add_record(record("ISO 9001", "2024-04-01"))
+    assert scheduler.fire_due() == 0
+
+    clock.advance(31)  # 2024-02-01, 60 days before expiry
+    assert scheduler.fire_due() == 1
+    assert scheduler.fire_due() == 0
+    clock.advance(60)  # 2024-04-01
+    assert scheduler.fire_due() == 2
+    feed = scheduler.alerts_since()
+    assert [alert["days_before"] for alert in feed["alerts"]] == [60, 30, 0]
+    assert feed["alerts"][-1]["kind"] == "expired"
+    assert feed["pending_events"] == 0
+
+
+def test_expired_record_raises_a_single_alert():
+    scheduler = ExpiryScheduler(now_fn=Clock(datetime(2024, 1, 1).date()))
+    scheduler.add_record(record("REACH", "2023-06-01"))
+    scheduler.add_record(record("No expiry", None))
+    assert scheduler.fire_due() == 1
+    assert scheduler.alerts_since()["alerts"][0]["kind"] == "expired"
+
+
+def test_cursor_paging():
+    """Test reading the feed incrementally and past trimmed alerts."""
+    scheduler = ExpiryScheduler(now_fn=Clock(datetime(2024, 1, 1).date()), max_alerts=4)
+    for day in range(1, 7):
+        scheduler.add_record(record(f"Cert {day}", f"2023-12-{day:02d}"))
+    scheduler.fire_due()
+
+    page = scheduler.alerts_since(0, limit=3)
+    assert [alert["id"] for alert in page["alerts"]] == [3, 4, 5]  # 1 and 2 were trimmed
+    page = scheduler.alerts_since(page["next_cursor"], limit=3)
+    assert [alert["id"] for alert in page["alerts"]] == [6]
+    assert scheduler.alerts_since(page["next_cursor"]) == {"alerts": [], "next_cursor": 6, "pending_events": 0}
+
+
+def test_worker_wakes_for_a_new_record():
+    """Test a record added while the worker sleeps is alerted without waiting for the earlier event."""
+    scheduler = ExpiryScheduler(now_fn=Clock(datetime(2024, 1, 1).date()))
+    scheduler.add_record(record("Far", "2030-01-01"))
+    scheduler.start()
+    try:
+        scheduler.add_record(record("Lapsed", "2023-12-01"))
+        deadline = time.time() + 2
+        while not scheduler.alerts_since()["alerts"] and time.time() < deadline:
+            time.sleep(0.01)
+        assert [alert["name"] for alert in scheduler.alerts_since()["alerts"]] == ["Lapsed"]
+    finally:
+        scheduler.stop()
+
+
+def test_index_subscription_feeds_existing_and_new_records():
+    index = ComplianceIndex(records=[{"supplierId": 1, "documentType": "REACH", "expiryDate": "2023-01-01"}])
+    scheduler = ExpiryScheduler(now_fn=Clock(datetime(2024, 1, 1).date()))
+    index.subscribe(scheduler.add_record)
+    index.add_supplier({"id": 2, "name": "Beta", "certifications": [{"name": "ISO 14001", "expirationDate": "2023-02-01"}]})
+    assert scheduler.fire_due() == 2
+
+
+def test_alerts_endpoint(client):
+    response = client.get('/api/compliance/alerts?limit=2')
+    assert response.status_code == 200
+    assert set(response.json) == {"alerts", "next_cursor", "pending_events"}
+    assert client.get('/api/compliance/alerts?since=abc').status_code == 400
+
+
+def test_first_poll_sees_due_alerts(client, monkeypatch):
+    """Test that alerts already due are returned on the first poll, without waiting for the worker thread."""
+    scheduler = ExpiryScheduler(now_fn=Clock(datetime(2024, 1, 1).date()))
+    scheduler.add_record(record("REACH", "2023-06-01"))
+    monkeypatch.setattr(compliance, "expiry_scheduler", scheduler)
+    assert [alert["kind"] for alert in client.get('/api/compliance/alerts').json["alerts"]] == ["expired"]
@@ -0,0 +1,61 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from utils.graphql_query import all_of, any_of, condition, escape, get_query, template_cache_info
+from utils.weaviate_client import SupplierKnowledgeGraph
+
+
+def test_filters_compile_to_one_where_with_and_operands():
+    where = all_of(condition("categories", "ContainsAny", ["electronics"]),
+                   all_of(condition("rating", "GreaterThanEqual", 4.0), None),
+                   condition("sustainabilityScore", "GreaterThanEqual", 75))
+    query = get_query("Supplier", ["name"], where=where)
+    assert query.count("where:") == 1
+    assert query.count("operator: And") == 1  # nested Ands are flattened
+    assert 'valueString: ["electronics"]' in query
+    assert "valueNumber: 4.0" in query and "valueNumber: 75" in query
+    assert all_of(None, None) is None
+    assert any_of(condition("name", "Equal", "a"))["operator"] == "Equal"
+
+
+def test_values_are_escaped():
+    """Test that quotes and newlines in values cannot break out of their string literal."""
+    query = get_query("Supplier", ["name"], concepts=['"]} injected {'],
+                      where=condition("name", "Equal", 'a"\nb'))
+    assert '["\\"]} injected {"]' in query
+    assert 'valueString: "a\\"\\nb"' in query
+    assert escape(True) == "true"
+    with pytest.raises(ValueError):
+        escape(float("nan"))
+    with pytest.raises(ValueError):
+        get_query("Supplier", ["name } evil"])
+    with pytest.raises(ValueError):
+        get_query("Supplier", ["name"], where=condition("name", "Drop", "x"))
+
+
+def test_templates_are_cached_per_filter_shape():
+    """Test that queries differing only in values reuse the compiled template."""
+    def query(min_rating, categories):
+        return get_query("Supplier", ["name", "rating"], limit=7, where=all_of(
+            condition("rating", "GreaterThanEqual", min_rating), condition("categories", "ContainsAny", categories)))
+
+    query(1.0, ["a"])
+    before = template_cache_info()
+    assert "4.5" in query(4.5, ["b"])
+    assert template_cache_info().hits == before.hits + 1
+    query(4.5, ["b", "c"])  # one more category is a new shape
+    assert template_cache_info().misses == before.misses + 1
+
+
+def test_search_projects_requested_fields():
+    graph = SupplierKnowledgeGraph()
+    graph.client = MagicMock()
+    graph.client.query.raw.return_value = {"data": {"Get": {"Supplier": [
+        {"name": "Acme", "_additional": {"certainty": 0.9}}]}}}
+    results = graph.search_suppliers("chips", categories=["electronics"], min_rating=4,
+                                     fields=["name", "match_certainty"])
+    query = graph.client.query.raw.call_args[0][0]
+    assert "{name _additional {certainty}}" in query
+    assert "description" not in query
+    assert results == [{"name": "Acme", "match_certainty": 0.9}]
@@ -0,0 +1,78 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from utils.hybrid_search import price_fit, reciprocal_rank_fusion, rerank
+from utils.weaviate_client import SUPPLIER_PROPERTIES, SupplierKnowledgeGraph, WeaviateQueryError
+
+
+def supplier(object_id, rating=4.0, sustainability=80, price=50.0):
+    return {"name": object_id, "rating": rating, "sustainabilityScore": sustainability, "avgPrice": price,
+            "_additional": {"id": object_id}}
+
+
+def make_graph(vector_hits, keyword_hits):
+    client = MagicMock()
+    client.query.raw.side_effect = lambda query: {"data": {"Get": {"Supplier": (
+        keyword_hits if "bm25:" in query else vector_hits)}}}
+    graph = SupplierKnowledgeGraph()
+    graph.client = client
+    graph.schema_ready = True
+    return graph, client
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    order, scores = reciprocal_rank_fusion([["a", "b", "c"], ["c", "d", "b"]], k=60)
+    assert order == ["c", "b", "a", "d"]  # the two in both lists come first
+    assert scores[0] == pytest.approx(1 / 63 + 1 / 61)
+
+
+def test_rerank_uses_numeric_signals():
+    """Test that close fused scores are decided by rating and price fit, missing values counting as zero."""
+    candidates = [supplier("low", rating=3.0, price=90.0), supplier("high", rating=5.0, price=20.0)]
+    assert [c["name"] for c in rerank(candidates, [1.0, 0.98])] == ["high", "low"]
+    assert [c["name"] for c in rerank(candidates, [1.0, 0.5])] == ["low", "high"]
+    same_rating = [supplier("pricey", price=90.0), supplier("fits", price=21.0)]
+    assert [c["name"] for c in rerank(same_rating, [1.0, 0.9], price_target=20)] == ["fits", "pricey"]
+    assert price_fit(np.array([20.0, np.nan]), 20)[0] == 1.0
+    assert price_fit(np.array([20.0, np.nan]), 20)[1] == 0.0
+
+
+def test_hybrid_search_fuses_keyword_matches_and_caches():
+    """Test that an exact keyword hit missing from the vector list is returned and the query is cached."""
+    vector_hits = [supplier("semantic-1"), supplier("semantic-2")]
+    keyword_hits = [supplier("exact", rating=4.9, sustainability=95), supplier("semantic-2")]
+    graph, client = make_graph(vector_hits, keyword_hits)
+
+    results = graph.search_suppliers("AS9100D", fields=["id", "name"], limit=2, mode="hybrid")
+    assert [r["id"] for r in results] == ["semantic-2", "exact"]
+    queries = [call.args[0] for call in client.query.raw.call_args_list]
+    assert any('bm25: {query: "AS9100D"' in query and '"certifications"' in query for query in queries)
+    assert all("limit: 50" in query for query in queries)
+
+    assert graph.search_suppliers("AS9100D", fields=["id", "name"], limit=2, mode="hybrid") == results
+    assert client.query.raw.call_count == 2  # the second search came from the cache
+    with pytest.raises(ValueError):
+        graph.search_suppliers("AS9100D", mode="fuzzy")
+
+
+def test_schema_adds_missing_properties_to_an_existing_class():
+    """Test that a Supplier class created before certifications existed gets the property added."""
+    client = MagicMock()
+    client.schema.exists.return_value = True
+    client.schema.get.return_value = {"class": "Supplier", "properties": [
+        {"name": prop["name"]} for prop in SUPPLIER_PROPERTIES if prop["name"] != "certifications"]}
+    SupplierKnowledgeGraph()._ensure_schema(client)
+    client.schema.property.create.assert_called_once()
+    assert client.schema.property.create.call_args.args[1]["name"] == "certifications"
+    assert not client.schema.create_class.called
+
+
+def test_graphql_errors_are_raised():
+    graph, client = make_graph([], [])
+    client.query.raw.side_effect = None
+    client.query.raw.return_value = {"errors": [{"message": "no such prop with name 'certifications' found"}]}
+    with pytest.raises(WeaviateQueryError, match="certifications"):
+        graph.search_suppliers("AS9100D", mode="hybrid")
+    assert not graph.search_cache.entries  # a failed search is not cached
@@ -0,0 +1,117 @@
+import io
+import os
+import threading
+
+import pytest
+
+from api import compliance
+from utils.document_cache import DocumentCache
+from utils.jobs import JobManager, JobQueueFull
+
+CONTRACT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "contract.pdf")
+
+
+def test_job_serves_initial_result_until_finished():
+    """Test that a job exposes its initial result while running and the final one after."""
+    manager = JobManager(max_workers=1)
+    release = threading.Event()
+    job_id = manager.submit(lambda: release.wait(5) and "refined", initial_result="draft")
+
+    assert manager.get(job_id)["result"] == "draft"
+    release.set()
+    job = manager.get(job_id, wait=5)
+    assert job["status"] == "completed"
+    assert job["result"] == "refined"
+
+
+def test_failed_job_keeps_initial_result():
+    """Test that a failing refinement keeps the fallback and reports the error."""
+    manager = JobManager(max_workers=1)
+
+    def fail():
+        raise RuntimeError("provider down")
+
+    job = manager.get(manager.submit(fail, initial_result="draft"), wait=5)
+    assert job["status"] == "failed"
+    assert job["result"] == "draft"
+    assert job["error"] == "provider down"
+
+
+def test_persisted_jobs_resume_after_restart(tmp_path):
+    """Test that an unfinished job is re-queued by a new manager and finished ones keep their result."""
+    started, release = threading.Event(), threading.Event()
+    manager = JobManager(max_workers=1, store_dir=str(tmp_path))
+    manager.register("block", lambda payload: started.set() or release.wait(10))
+    manager.register("double", lambda payload: payload["n"] * 2)
+    done_id = manager.enqueue("double", {"n": 2})
+    assert manager.get(done_id, wait=5)["result"] == 4
+    manager.enqueue("block", {})
+    assert started.wait(5)
+    queued_id = manager.enqueue("double", {"n": 21})  # still queued behind the blocked job
+
+    restarted = JobManager(max_workers=1, store_dir=str(tmp_path))
+    restarted.register("block", lambda payload: "unblocked")
+    restarted.register("double", lambda payload: payload["n"] * 2)
+    assert restarted.resume() == 2
+    assert restarted.get(done_id)["result"] == 4
+    assert restarted.get(queued_id, wait=5)["result"] == 42
+    release.set()
+
+
+def test_jobs_are_shared_between_workers(tmp_path):
+    """Test that another worker on the same store serves the job and does not run it a second time."""
+    runs, release = [], threading.Event()
+
+    def count(payload):
+        runs.append(payload)
+        release.wait(10)
+        return len(runs)
+
+    worker = JobManager(max_workers=1, store_dir=str(tmp_path))
+    other = JobManager(max_workers=1, store_dir=str(tmp_path))
+    for manager in (worker, other):
+        manager.register("count", count)
+    job_id = worker.enqueue("count", {})
+    assert other.get(job_id)["status"] in ("pending", "running")
+
+    assert other.resume() == 1  # a worker starting up while the job runs
+    release.set()
+    assert other.get(job_id, wait=5)["result"] == 1
+    assert worker.get(job_id, wait=5)["status"] == "completed"
+    assert len(runs) == 1
+    assert other.get("../../etc/passwd") is None
+
+
+def test_queue_limit():
+    manager = JobManager(max_workers=1, max_queued=1)
+    release = threading.Event()
+    manager.submit(lambda: release.wait(5))
+    try:
+        with pytest.raises(JobQueueFull):
+            manager.submit(lambda: None)
+    finally:
+        release.set()
+
+
+def test_async_document_analysis(client, tmp_path, monkeypatch):
+    """Test that ?async=1 answers 202 and the analysis is served by the jobs endpoint."""
+    monkeypatch.setattr(compliance, "document_cache", DocumentCache(str(tmp_path)))
+    with open(CONTRACT_PATH, "rb") as f:
+        response = client.post('/api/compliance/analyze-document?async=1',
+                               data={"file": (f, "contract.pdf")}, content_type="multipart/form-data")
+    assert response.status_code == 202
+    assert response.headers["Location"] == response.json["status_url"]
+
+    job = client.get(f'{response.json["status_url"]}?wait=10').json
+    assert job["status"] == "completed"
+    assert "compliance_score" in job["result"]
+    assert not os.listdir(os.path.join(compliance.ANALYSIS_JOB_DIR, "uploads"))
+    assert client.get('/api/compliance/jobs/unknown').status_code == 404
+
+
+def test_async_analysis_of_unreadable_pdf_fails(client):
+    response = client.post('/api/compliance/analyze-document?async=1',
+                           data={"file": (io.BytesIO(b"%PDF-1.7 truncated"), "broken.pdf")}, content_type="multipart/form-data")
+    job = client.get(f'/api/compliance/jobs/{response.json["job_id"]}?wait=10').json
+    assert job["status"] == "failed"
+    assert job["error"] == "Could not read the PDF file"
@@ -0,0 +1,28 @@
+import json
+from datetime import date
+
+from utils.json_provider import dumps_bytes, is_valid_json, loads, raw_json_response
+
+
+def test_dumps_bytes_matches_stdlib():
+    """Test that the fast encoder produces the same document as the standard library."""
+    payload = {"b": [1, 2.5, None], "a": {"name": "Müller GmbH", "ok": True}}
+    assert loads(dumps_bytes(payload)) == json.loads(json.dumps(payload))
+    assert dumps_bytes(payload).startswith(b'{"a"')
+
+
+def test_provider_serializes_dates(app):
+    """Test that the app provider keeps Flask's handling of dates."""
+    with app.app_context():
+        assert json.loads(app.json.dumps({"due": date(2024, 1, 31)}))["due"] == "Wed, 31 Jan 2024 00:00:00 GMT"
+
+
+def test_raw_json_response(app):
+    """Test that validated JSON text is sent unchanged as application/json."""
+    content = '{"subject": "Hello", "body": "Hi"}'
+    assert is_valid_json(content)
+    assert not is_valid_json("not json")
+    with app.app_context():
+        response = raw_json_response(content)
+    assert response.mimetype == "application/json"
+    assert response.get_data(as_text=True) == content
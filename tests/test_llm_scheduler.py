@@ -0,0 +1,61 @@
+import threading
+import time
+
+import pytest
+
+from utils.llm_scheduler import LLMScheduler, QueueTimeoutError
+
+
+def test_interactive_requests_overtake_queued_bulk_work():
+    """Test that weighted fair queueing dispatches interactive calls ahead of a bulk backlog."""
+    scheduler = LLMScheduler(requests_per_minute=60000, tokens_per_minute=10 ** 9, max_concurrency=1)
+    order = []
+    blocker = scheduler.acquire("bulk", tokens=100)
+
+    def call(priority, name):
+        with scheduler.slot(priority, tokens=100):
+            order.append(name)
+
+    threads = [threading.Thread(target=call, args=("bulk", f"bulk-{i}")) for i in range(3)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.02)  # Make sure the bulk backlog is queued first
+    threads.append(threading.Thread(target=call, args=("interactive", "interactive")))
+    threads[-1].start()
+    time.sleep(0.05)
+
+    assert scheduler.metrics()["classes"]["bulk"]["queue_depth"] == 3
+    scheduler.release(blocker)
+    for thread in threads:
+        thread.join(timeout=5)
+    assert order.index("interactive") <= 1
+
+
+def test_token_budget_throttles_large_prompts():
+    """Test that the tokens-per-minute bucket delays calls once it is drained."""
+    scheduler = LLMScheduler(requests_per_minute=60000, tokens_per_minute=60000)  # 1000 tokens/s, 5000 burst
+    scheduler.release(scheduler.acquire(tokens=5000))
+    start = time.monotonic()
+    scheduler.release(scheduler.acquire(tokens=200))
+    assert time.monotonic() - start >= 0.15
+
+
+def test_queue_timeout():
+    """Test that a request not dispatched before its deadline leaves the queue."""
+    scheduler = LLMScheduler(requests_per_minute=60000, tokens_per_minute=10 ** 9, max_concurrency=1)
+    scheduler.acquire("interactive")
+    with pytest.raises(QueueTimeoutError):
+        scheduler.acquire("bulk", timeout=0.05)
+    metrics = scheduler.metrics()["classes"]["bulk"]
+    assert metrics["queue_depth"] == 0
+    assert metrics["timeouts"] == 1
+
+
+def test_scheduler_metrics_endpoint(client):
+    """Test that queue metrics are exposed for monitoring."""
+    client.post('/api/negotiations/messages', json={"supplier": "TechComponents Inc.", "type": "inquiry"})
+    response = client.get('/api/monitoring/llm')
+    assert response.status_code == 200
+    scheduler = response.get_json()["scheduler"]
+    assert set(scheduler["classes"]) == {"interactive", "standard", "bulk"}
+    assert scheduler["classes"]["interactive"]["dispatched"] >= 1
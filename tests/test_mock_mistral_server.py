@@ -0,0 +1,51 @@
+import json
+
+import pytest
+from mistralai import Mistral
+
+from utils.mock_mistral_server import MockConfig, start_mock_server
+
+
+@pytest.fixture
+def mock_server():
+    """Start a dedicated stand-in so fault settings do not leak into other tests."""
+    server, url = start_mock_server(config=MockConfig(seed=1))
+    yield server, Mistral(api_key="test-key", server_url=url)
+    server.shutdown()
+
+
+def test_json_mode_completion(mock_server):
+    """Test that the SDK parses a templated JSON-mode completion."""
+    _, sdk = mock_server
+    response = sdk.chat.complete(model="mistral-large-latest",
+                                 messages=[{"role": "user", "content": "Draw up a dossier for {'name': 'Acme'}"}],
+                                 response_format={"type": "json_object"})
+    dossier = json.loads(response.choices[0].message.content)
+    assert dossier["supplier_name"] == "Acme"
+    assert response.usage.total_tokens > 0
+
+
+def test_streaming_completion(mock_server):
+    """Test that streamed chunks reassemble into the full completion."""
+    _, sdk = mock_server
+    content = ""
+    for event in sdk.chat.stream(model="mistral-large-latest",
+                                 messages=[{"role": "user", "content": "You are a compliance expert"}]):
+        content += event.data.choices[0].delta.content or ""
+    assert "compliance_score" in json.loads(content)
+
+
+def test_rate_limit_injection(mock_server):
+    """Test that injected rate limiting surfaces as an HTTP 429 error."""
+    server, sdk = mock_server
+    server.config.rate_limit_rate = 1.0
+    with pytest.raises(Exception) as error:
+        sdk.chat.complete(model="mistral-large-latest", messages=[{"role": "user", "content": "hi"}])
+    assert "429" in str(error.value)
+
+
+def test_latency_distribution_is_configurable():
+    """Test the latency samplers stay within their configured shape."""
+    assert MockConfig(latency="fixed", median=0.3).sample_latency() == 0.3
+    uniform = MockConfig(latency="uniform", low=0.1, high=0.2, seed=3)
+    assert all(0.1 <= uniform.sample_latency() <= 0.2 for _ in range(20))
@@ -0,0 +1,77 @@
+from utils.negotiation_store import NegotiationStore
+
+
+def make_store():
+    suppliers = [{
+        "id": 1,
+        "name": "Acme",
+        "negotiationHistory": [
+            {"date": "2023-06-15", "outcome": "Success", "savings": 8.0},
+            {"date": "2022-12-10", "outcome": "Partial", "savings": 4.0}
+        ]
+    }]
+    negotiations = [{"id": 1, "supplierId": 1, "supplierName": "Acme", "status": "active"}]
+    return NegotiationStore(suppliers=suppliers, negotiations=negotiations)
+
+
+def test_lookup_by_id_and_name():
+    """Test that history resolves the same supplier by ID, numeric string or name."""
+    store = make_store()
+    assert store.history_for(1) == store.history_for("Acme") == store.history_for("1")
+    assert len(store.negotiations_for("Acme")) == 1
+    assert store.supplier("Unknown") is None
+
+
+def test_summary_stats():
+    """Test the precomputed success rate, savings and last outcome date."""
+    stats = make_store().stats_for("Acme")
+    assert stats["negotiations"] == 2
+    assert stats["success_rate"] == 0.5
+    assert stats["mean_savings"] == 6.0
+    assert stats["median_savings"] == 6.0
+    assert stats["last_outcome_date"] == "2023-06-15"
+
+
+def test_added_negotiation_updates_stats_incrementally():
+    """Test that a completed negotiation is folded into history and stats."""
+    store = make_store()
+    store.add_negotiation({"supplierName": "Acme", "outcome": "Success", "actualSavings": 11.0,
+                           "lastActivity": "2024-01-05"})
+    stats = store.stats_for(1)
+    assert stats["negotiations"] == 3
+    assert stats["median_savings"] == 8.0
+    assert stats["last_outcome_date"] == "2024-01-05"
+    assert store.history_for(1)[0]["date"] == "2024-01-05"
+
+
+def test_negotiation_history_endpoint(client):
+    """Test reading and extending a supplier's negotiation history over the API."""
+    response = client.get('/api/negotiations/history?supplier=ElectroTech Industries')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["stats"]["negotiations"] == len(data["history"])
+
+    response = client.post('/api/negotiations/history', json={"supplierName": "New Supplier Co",
+                                                               "outcome": "Success", "actualSavings": 3.0,
+                                                               "lastActivity": "2024-02-01"})
+    assert response.status_code == 201
+    assert response.get_json()["stats"]["mean_savings"] == 3.0
+
+    response = client.get('/api/negotiations/history?supplier=Does Not Exist')
+    assert response.status_code == 404
+
+
+def test_negotiation_input_is_normalized_or_rejected(client):
+    """Test that ISO datetimes and percent strings are accepted, and bad input is a 400 that stores nothing."""
+    response = client.post('/api/negotiations/history', json={"supplierName": "Datetime Co", "outcome": "Success",
+                                                               "actualSavings": "3%",
+                                                               "lastActivity": "2024-02-01T10:00:00Z"})
+    assert response.status_code == 201
+    assert response.get_json()["stats"]["last_outcome_date"] == "2024-02-01"
+    assert response.get_json()["stats"]["mean_savings"] == 3.0
+
+    for body in [{"supplierName": "Bad Co", "outcome": "Success", "actualSavings": "a lot"},
+                 {"supplierName": "Bad Co", "outcome": "Success", "lastActivity": "last week"}]:
+        assert client.post('/api/negotiations/history', json=body).status_code == 400
+    assert client.get('/api/negotiations/history?supplier=Bad Co').status_code == 404
+    assert client.post('/api/negotiations/history', data="x", content_type="text/plain").status_code == 400
@@ -1,6 +1,16 @@
 import pytest
 import json
 
+from api.negotiations import dossier_precomputer
+
+
+@pytest.fixture
+def empty_dossier_store():
+    """Start from an empty precomputed dossier store."""
+    dossier_precomputer.entries.clear()
+    yield dossier_precomputer
+    dossier_precomputer.entries.clear()
+
 
 def test_generate_dossier(client, supplier_id):
     """Test generating a negotiation dossier."""
@@ -49,3 +59,151 @@ def test_draft_message_invalid_supplier(client):
     data = {"supplier_id": "non-existent-id", "type": "inquiry"}
     response = client.post('/api/negotiations/messages', json=data)
     assert response.status_code == 404
+
+
+def test_generate_dossiers_batch(client, monkeypatch, empty_dossier_store):
+    """Test streaming dossiers for several suppliers with a per-supplier failure."""
+    monkeypatch.setattr('api.negotiations.ai_call', lambda prompt: json.dumps({"supplier_name": "Mock"}))
+    data = {"supplier_ids": ["sup-001", "sup-002", "non-existent-id"]}
+    response = client.post('/api/negotiations/dossiers/batch', json=data)
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+
+    lines = [json.loads(line) for line in response.data.decode().splitlines()]
+    results = {line["supplier_id"]: line for line in lines if "supplier_id" in line}
+    assert results["sup-001"]["status"] == "ok"
+    assert results["sup-001"]["dossier"]["supplier_name"] == "Mock"
+    assert results["non-existent-id"]["status"] == "error"
+    assert lines[-1]["summary"] == {"total": 3, "succeeded": 2, "failed": 1}
+
+
+def test_generate_dossiers_batch_reports_fallbacks_as_failed(client, monkeypatch, empty_dossier_store):
+    """Test that suppliers served the basic dossier because the provider failed count as failed."""
+    def failing_ai_call(prompt):
+        raise ConnectionError("provider down")
+
+    monkeypatch.setattr('api.negotiations.ai_call', failing_ai_call)
+    monkeypatch.setattr(empty_dossier_store, "schedule", lambda supplier_id: None)
+    response = client.post('/api/negotiations/dossiers/batch', json={"supplier_ids": ["sup-001", "sup-002"]})
+    lines = [json.loads(line) for line in response.data.decode().splitlines()]
+    results = {line["supplier_id"]: line for line in lines if "supplier_id" in line}
+    assert results["sup-001"]["status"] == "fallback"
+    assert results["sup-001"]["error"] == "provider down"
+    assert "pricing_insights" in results["sup-001"]["dossier"]
+    assert lines[-1]["summary"] == {"total": 2, "succeeded": 0, "failed": 2}
+
+
+def test_generate_dossiers_batch_runs_concurrently(client, monkeypatch, empty_dossier_store):
+    """Test that batch wall-clock time follows the concurrency limit, not the supplier count."""
+    import time
+
+    def slow_ai_call(prompt):
+        time.sleep(0.2)
+        return json.dumps({"supplier_name": "Mock"})
+
+    monkeypatch.setattr('api.negotiations.ai_call', slow_ai_call)
+    data = {"supplier_ids": ["sup-001", "sup-002", "sup-003", "sup-004", "sup-005"], "concurrency": 5}
+    start = time.monotonic()
+    response = client.post('/api/negotiations/dossiers/batch', json=data)
+    response.get_data()
+    assert time.monotonic() - start < 0.8
+
+
+def test_generate_dossiers_batch_requires_ids(client):
+    """Test that an empty batch is rejected."""
+    response = client.post('/api/negotiations/dossiers/batch', json={"supplier_ids": []})
+    assert response.status_code == 400
+    response = client.post('/api/negotiations/dossiers/batch', json={"supplier_ids": [["sup-001"], {"id": 1}]})
+    assert response.status_code == 400
+    response = client.post('/api/negotiations/dossiers/batch', json={"supplier_ids": ["sup-001"], "concurrency": "x"})
+    assert response.status_code == 400
+
+
+def test_generate_dossier_served_from_store(client, monkeypatch, empty_dossier_store):
+    """Test that a stored dossier is served without another completion call."""
+    calls = []
+
+    def counting_ai_call(prompt):
+        calls.append(prompt)
+        return json.dumps({"supplier_name": "Mock"})
+
+    monkeypatch.setattr('api.negotiations.ai_call', counting_ai_call)
+    for _ in range(2):
+        response = client.post('/api/negotiations/generate-dossier', json={"supplier_id": "sup-001"})
+        assert response.status_code == 200
+        dossier = json.loads(response.data)
+        assert dossier["supplier_name"] == "Mock"
+        assert dossier["stale"] is False
+        assert "generated_at" in dossier
+    assert len(calls) == 1
+
+
+def test_fast_mode_strategies_refined_in_background(client):
+    """Test that fast mode returns the deterministic strategies now and the LLM result via the job."""
+    response = client.get('/api/negotiations/strategies?supplier=ElectroTech Industries&category=Electronics&mode=fast')
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data["refined"] is False
+    assert data["result"][0]["name"] == "Historical Discount Enhancement"
+
+    response = client.get(f'/api/negotiations/jobs/{data["job_id"]}?wait=5')
+    assert response.status_code == 200
+    job = json.loads(response.data)
+    assert job["status"] == "completed"
+    assert job["refined"] is True
+    assert isinstance(job["result"], list)
+    assert client.get(f'/api/negotiations/jobs/{data["job_id"]}?wait=abc').status_code == 400
+
+
+def test_refinement_jobs_are_shared_between_workers(client, monkeypatch):
+    """Test that a refinement runs at bulk priority and can be polled from another worker's job manager."""
+    from api import negotiations
+    from utils.jobs import JobManager
+    from utils.llm_scheduler import current_priority
+    priorities = []
+
+    def fake_complete_json(endpoint, messages):
+        priorities.append(current_priority.get())
+        return json.dumps({"subject": "Refined", "body": "Hello"})
+
+    monkeypatch.setattr(negotiations, "complete_json", fake_complete_json)
+    data = {"supplier": "TechComponents Inc.", "type": "negotiation", "mode": "fast"}
+    job_id = json.loads(client.post('/api/negotiations/messages', json=data).data)["job_id"]
+
+    other_worker = JobManager(store_dir=negotiations.REFINEMENT_JOB_DIR)
+    job = other_worker.get(job_id, wait=5)
+    assert job["status"] == "completed"
+    assert job["result"]["subject"] == "Refined"
+    assert priorities == ["bulk"]
+
+
+def test_fast_mode_message(client):
+    """Test that fast mode drafts from the template immediately."""
+    data = {"supplier": "TechComponents Inc.", "type": "negotiation", "mode": "fast"}
+    response = client.post('/api/negotiations/messages', json=data)
+    assert response.status_code == 200
+    message = json.loads(response.data)
+    assert message["result"]["body"].startswith("Dear TechComponents Inc.")
+    assert "job_id" in message
+
+
+def test_get_job_not_found(client):
+    """Test polling an unknown job."""
+    response = client.get('/api/negotiations/jobs/unknown')
+    assert response.status_code == 404
+
+
+def test_portfolio_plan(client):
+    """Test the ranked negotiation calendar for the supplier portfolio."""
+    response = client.get('/api/negotiations/portfolio-plan?as_of=2024-01-01&include_inactive=true')
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data["as_of"] == "2024-01-01"
+    assert [entry["rank"] for entry in data["calendar"]] == list(range(1, len(data["calendar"]) + 1))
+    scores = [entry["priority_score"] for entry in data["calendar"]]
+    assert scores == sorted(scores, reverse=True)
+
+    response = client.get('/api/negotiations/portfolio-plan?as_of=tomorrow')
+    assert response.status_code == 400
+    response = client.get('/api/negotiations/portfolio-plan?as_of=2024-01-01&limit=-3')
+    assert len(json.loads(response.data)["calendar"]) == 1
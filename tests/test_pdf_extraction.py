@@ -0,0 +1,47 @@
+import io
+import os
+
+import fitz
+
+from utils import pdf_extraction
+from utils.pdf_extraction import extract_text, page_ranges
+
+CONTRACT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "contract.pdf")
+
+
+def contract_bytes():
+    with open(CONTRACT_PATH, "rb") as f:
+        return f.read()
+
+
+def test_page_ranges_cover_every_page_once():
+    """Test that pages are split into contiguous, balanced ranges."""
+    assert page_ranges(10, 3) == [(0, 4), (4, 7), (7, 10)]
+    assert page_ranges(2, 4) == [(0, 1), (1, 2)]
+
+
+def test_extract_text_matches_page_order():
+    """Test that in-memory extraction returns each page's text in order."""
+    with fitz.open(CONTRACT_PATH) as doc:
+        expected = "".join(page.get_text("text") + "\n" for page in doc)
+    assert extract_text(contract_bytes(), workers=1) == expected
+
+
+def test_parallel_extraction_matches_serial(monkeypatch):
+    """Test that splitting pages across the process pool gives the same text."""
+    monkeypatch.setattr(pdf_extraction, "PARALLEL_PAGE_THRESHOLD", 2)
+    data = contract_bytes()
+    assert extract_text(data, workers=2) == extract_text(data, workers=1)
+
+
+def test_analyze_uploaded_pdf(client):
+    """Test analyzing an uploaded PDF without writing it to disk."""
+    with open(CONTRACT_PATH, "rb") as f:
+        response = client.post('/api/compliance/analyze-document',
+                               data={"file": (f, "contract.pdf")}, content_type="multipart/form-data")
+    assert response.status_code == 200
+    assert not os.path.exists("uploaded_document.pdf")
+
+    response = client.post('/api/compliance/analyze-document',
+                           data={"file": (io.BytesIO(b"not a pdf"), "broken.pdf")}, content_type="multipart/form-data")
+    assert response.status_code == 400
@@ -0,0 +1,37 @@
+from utils.portfolio_planner import plan_portfolio
+
+
+def make_supplier(supplier_id, expiry, discount=5.0, quality=90, reliability=90):
+    return {"id": supplier_id, "name": f"Supplier {supplier_id}", "contractExpiry": expiry,
+            "averageDiscount": discount, "qualityScore": quality, "reliabilityScore": reliability}
+
+
+def test_plan_portfolio_ranks_urgent_renewals_first():
+    """Test that, all else equal, the contract expiring soonest ranks first."""
+    suppliers = [make_supplier(1, "2024-12-01"), make_supplier(2, "2024-02-01"), make_supplier(3, None)]
+    calendar = plan_portfolio(suppliers, [[], [], []], "2024-01-01")
+    assert [entry["supplier_id"] for entry in calendar] == [2, 1, 3]
+    assert calendar[0]["urgency"] == 1.0
+    assert calendar[0]["recommended_start"] == "2024-01-01"
+    assert calendar[2]["days_to_expiry"] is None and calendar[2]["urgency"] == 0.0
+
+
+def test_plan_portfolio_uses_negotiation_history():
+    """Test that expected savings blend the fallback ask with past outcomes and success rate."""
+    suppliers = [make_supplier(1, None, discount=6.0), make_supplier(2, None, discount=6.0)]
+    histories = [[{"outcome": "Success", "savings": 4.0}, {"outcome": "Success", "savings": 6.0}],
+                 [{"outcome": "Failed", "savings": None}]]
+    calendar = {entry["supplier_id"]: entry for entry in plan_portfolio(suppliers, histories, "2024-01-01")}
+    assert calendar[1]["expected_savings"] == 6.5  # (6 + 2 + mean(4, 6)) / 2
+    assert calendar[2]["expected_savings"] == 4.0  # 8% ask halved by a 0% success rate
+    assert calendar[1]["rank"] == 1
+
+
+def test_plan_portfolio_flags_unparseable_expiry():
+    """Test that a non-ISO expiry date is treated as no expiry and flagged, not fatal to the whole plan."""
+    suppliers = [make_supplier(1, "31/12/2024"), make_supplier(2, "2024-02-01"), make_supplier(3, None)]
+    calendar = {entry["supplier_id"]: entry for entry in plan_portfolio(suppliers, [[], [], []], "2024-01-01")}
+    assert calendar[1]["invalid_expiry"] is True
+    assert calendar[1]["days_to_expiry"] is None
+    assert calendar[2]["invalid_expiry"] is False and calendar[2]["days_to_expiry"] == 31
+    assert calendar[3]["invalid_expiry"] is False
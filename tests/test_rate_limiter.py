@@ -0,0 +1,20 @@
+import time
+
+from utils.rate_limiter import RateLimiter
+
+
+def test_rate_limiter_allows_burst_then_throttles():
+    """Test that calls beyond the burst capacity wait for the bucket to refill."""
+    limiter = RateLimiter(rate_per_minute=600, burst=2)  # 10 calls per second
+    start = time.monotonic()
+    for _ in range(4):
+        assert limiter.acquire()
+    # Two calls fit in the burst, the other two need ~0.1s each
+    assert time.monotonic() - start >= 0.15
+
+
+def test_rate_limiter_timeout():
+    """Test that acquire gives up once the timeout passes."""
+    limiter = RateLimiter(rate_per_minute=6, burst=1)
+    assert limiter.acquire()
+    assert not limiter.acquire(timeout=0.05)
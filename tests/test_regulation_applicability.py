@@ -0,0 +1,123 @@
+import numpy as np
+
+from api import compliance
+from api.mock_data import compliance_data, load_mock_data
+from utils.regulation_applicability import ApplicabilityMatrix, applies, supplier_profile
+
+
+def make_matrix():
+    return ApplicabilityMatrix(compliance_data, load_mock_data()["suppliers"])
+
+
+def test_supplier_profile_from_either_supplier_shape():
+    assert supplier_profile({"category": "Chemicals", "location": "Frankfurt, Germany"}) == \
+        ({"chemicals", "manufacturing"}, {"EU"})
+    industries, regions = supplier_profile({"categories": ["electronics"], "locations": ["USA", "Taiwan"]})
+    assert {"electronics", "manufacturing"} <= industries
+    assert regions == {"USA"}
+
+
+def test_matrix_matches_pairwise_checks():
+    """Test every cell of the matrix against the per-pair rule."""
+    suppliers = load_mock_data()["suppliers"]
+    matrix = make_matrix()
+    for supplier in suppliers:
+        expected = [regulation["name"] for regulation in compliance_data
+                    if applies(regulation, supplier_profile(supplier))]
+        assert matrix.regulations_for(supplier["id"]) == expected
+
+
+def test_suppliers_for_regulation_combinations():
+    matrix = make_matrix()
+    reach = set(matrix.suppliers_for(["REACH"]))
+    rohs = set(matrix.suppliers_for(["RoHS"]))
+    assert set(matrix.suppliers_for(["REACH", "RoHS"])) == reach & rohs
+    assert set(matrix.suppliers_for(["REACH", "req-003"], match="any")) == reach | rohs
+    assert matrix.counts()["GDPR"] == len(load_mock_data()["suppliers"])
+
+
+def test_incremental_updates():
+    """Test that supplier and regulation changes only touch their row or column."""
+    matrix = make_matrix()
+    assert not matrix.upsert_supplier(load_mock_data()["suppliers"][0])  # unchanged
+    assert matrix.upsert_supplier({"id": 99, "category": "Electronics", "location": "Austin, USA"})
+    assert matrix.regulations_for(99) == ["GDPR", "REACH", "RoHS", "CCPA", "ISO 9001"]
+
+    matrix.upsert_regulation({"name": "WEEE", "industry": "electronics", "regions": ["EU"]})
+    assert matrix.suppliers_for(["WEEE"]) == []
+    matrix.upsert_supplier({"id": 99, "category": "Electronics", "location": "Lyon, France"})
+    assert matrix.suppliers_for(["WEEE"]) == [99]
+
+    assert matrix.remove_supplier(99)
+    assert matrix.regulations_for(99) is None
+    assert 99 not in matrix.suppliers_for(["GDPR"])
+    matrix.upsert_supplier({"id": 100, "category": "Packaging", "location": "Madrid, Spain"})
+    assert np.count_nonzero(matrix.active) == len(load_mock_data()["suppliers"]) + 1  # the free row was reused
+    assert matrix.sync(load_mock_data()["suppliers"]) == 1
+    assert matrix.regulations_for(100) is None
+
+
+def test_applicability_endpoints(client):
+    response = client.get('/api/compliance/applicability?regulations=REACH,RoHS')
+    assert response.status_code == 200
+    assert [supplier["id"] for supplier in response.json["suppliers"]] == make_matrix().suppliers_for(["REACH", "RoHS"])
+    assert "counts" in client.get('/api/compliance/applicability').json
+    assert client.get('/api/compliance/applicability?regulations=Unknown').status_code == 400
+
+    response = client.get('/api/compliance/applicability/1')
+    assert response.status_code == 200
+    assert "RoHS" in response.json["regulations"]
+    assert client.get('/api/compliance/applicability/unknown').status_code == 404
+
+
+def test_applicability_follows_supplier_data_changes(client, monkeypatch):
+    """Test that an edited supplier file is synced into the matrix before answering."""
+    suppliers = [dict(supplier) for supplier in load_mock_data()["suppliers"]]
+    monkeypatch.setattr(compliance, "applicability", make_matrix())
+    suppliers[0]["location"] = "Austin, USA"
+    suppliers.append({"id": 100, "name": "New GmbH", "location": "Berlin, Germany", "category": "Electronics"})
+
+    reads = []
+
+    def edited_mock_data():
+        reads.append(1)
+        return {"suppliers": suppliers}
+
+    monkeypatch.setattr(compliance, "read_mock_data", edited_mock_data)
+    new_mtime = compliance.applicability_mtime + 1
+    monkeypatch.setattr(compliance, "mock_data_mtime", lambda: new_mtime)
+    monkeypatch.setattr(compliance, "applicability_mtime", compliance.applicability_mtime)
+
+    response = client.get('/api/compliance/applicability/100')
+    assert response.status_code == 200
+    assert "RoHS" in response.json["regulations"]
+    assert compliance.refresh_applicability() == 0  # already in sync with this version of the file
+    assert len(reads) == 1
+    assert len(load_mock_data()["suppliers"]) == len(suppliers) - 1  # the shared cache is untouched
+
+
+def test_concurrent_refreshes_sync_once(monkeypatch):
+    """Test that requests noticing the same file change together read and sync it only once."""
+    import threading
+    import time
+    syncs = []
+    matrix = make_matrix()
+
+    def slow_sync(suppliers):
+        syncs.append(1)
+        time.sleep(0.05)
+        return 0
+
+    monkeypatch.setattr(matrix, "sync", slow_sync)
+    monkeypatch.setattr(compliance, "applicability", matrix)
+    monkeypatch.setattr(compliance, "read_mock_data", lambda: {"suppliers": []})
+    new_mtime = compliance.applicability_mtime + 1
+    monkeypatch.setattr(compliance, "mock_data_mtime", lambda: new_mtime)
+    monkeypatch.setattr(compliance, "applicability_mtime", compliance.applicability_mtime)
+
+    threads = [threading.Thread(target=compliance.refresh_applicability) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(syncs) == 1
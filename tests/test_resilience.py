@@ -0,0 +1,102 @@
+import time
+
+import pytest
+
+from utils.llm_scheduler import QueueTimeoutError
+from utils.resilience import CircuitBreaker, CircuitOpenError, DeadlineExceededError, call_with_resilience
+
+
+def failing_call():
+    raise ConnectionError("provider down")
+
+
+def test_call_retries_then_succeeds():
+    """Test that a transient failure is retried within the budget."""
+    breaker = CircuitBreaker("test")
+    attempts = []
+
+    def flaky_call():
+        attempts.append(1)
+        if len(attempts) < 2:
+            raise ConnectionError("transient")
+        return "ok"
+
+    assert call_with_resilience(breaker, flaky_call, budget=2, retries=2, base_delay=0.01) == "ok"
+    assert len(attempts) == 2
+
+
+def test_call_stops_at_deadline():
+    """Test that a slow call is abandoned once the latency budget is spent."""
+    breaker = CircuitBreaker("test")
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        call_with_resilience(breaker, lambda: time.sleep(1), budget=0.1)
+    assert time.monotonic() - start < 0.5
+
+
+def test_breaker_opens_on_errors_and_fails_fast():
+    """Test that the breaker trips on error rate and then rejects calls immediately."""
+    breaker = CircuitBreaker("test", min_calls=3, cooldown=60)
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            call_with_resilience(breaker, failing_call, budget=1, retries=0)
+    assert breaker.snapshot()["state"] == CircuitBreaker.OPEN
+
+    start = time.perf_counter()
+    with pytest.raises(CircuitOpenError):
+        call_with_resilience(breaker, failing_call, budget=1)
+    assert time.perf_counter() - start < 0.01
+
+
+def test_breaker_opens_on_slow_calls_and_recovers():
+    """Test that slow successes trip the breaker and a good probe closes it again."""
+    breaker = CircuitBreaker("test", min_calls=2, slow_call_seconds=0.5, cooldown=0)
+    breaker.record_success(1.0)
+    breaker.record_success(1.0)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.record_success(0.1)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_local_queueing_is_not_a_provider_failure():
+    """Test that a scheduler queue timeout neither counts against the breaker nor keeps a probe in flight."""
+    breaker = CircuitBreaker("test", min_calls=1, cooldown=0)
+
+    def queued_call():
+        raise QueueTimeoutError("not dispatched in time")
+
+    with pytest.raises(QueueTimeoutError):
+        call_with_resilience(breaker, queued_call, budget=1)
+    assert breaker.snapshot()["window_calls"] == 0
+
+    breaker.record_failure(1.0)
+    assert breaker.allow_request() and breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.record_skipped()
+    assert breaker.allow_request()  # the next call can probe again
+
+
+def test_provider_call_gets_remaining_budget(monkeypatch):
+    """Test that the completion request is given the remaining budget as its HTTP timeout."""
+    from unittest.mock import MagicMock
+    from utils import llm
+    fake_client = MagicMock()
+    fake_client.chat.complete.return_value.choices[0].message.content = '{"ok": true}'
+    monkeypatch.setattr(llm, "client", fake_client)
+    monkeypatch.setenv("LLM_BUDGET_STRATEGIES", "5")
+    assert llm.complete_json("strategies", [{"role": "user", "content": "hi"}]) == '{"ok": true}'
+    assert 0 < fake_client.chat.complete.call_args.kwargs["timeout_ms"] <= 5000
+
+
+def test_open_circuit_serves_fallback(client, monkeypatch):
+    """Test that strategies fall back to deterministic output while the circuit is open."""
+    from utils import llm
+    monkeypatch.setattr(llm.breakers["strategies"], "allow_request", lambda: False)
+    response = client.get('/api/negotiations/strategies?supplier=Unknown&category=electronics')
+    assert response.status_code == 200
+    assert response.get_json()[0]["name"] == "Volume Discount"
+
+    response = client.get('/api/monitoring/llm')
+    assert {breaker["name"] for breaker in response.get_json()["breakers"]} >= {"strategies", "dossier"}
@@ -0,0 +1,46 @@
+import json
+
+from api.mock_data import load_mock_data
+from utils.savings_model import SavingsModel, load_model, main, train
+
+
+def mock_suppliers():
+    data = load_mock_data()
+    return data["suppliers"] + data["possible_suppliers_data"]
+
+
+def test_model_beats_baselines():
+    """Test that the leave-one-out error is below the naive baselines."""
+    report = train(mock_suppliers())["report"]
+    assert report["samples"] > 0
+    for baseline in report["baselines"].values():
+        assert report["leave_one_out"]["mae"] < baseline["mae"]
+
+
+def test_prediction_weights_outcomes_by_success_rate():
+    """Test that a higher success rate never lowers the expected savings."""
+    model = SavingsModel(train(mock_suppliers()))
+    supplier = mock_suppliers()[0]
+    certain, unlikely = model.predict(supplier, 1.0), model.predict(supplier, 0.0)
+    assert certain["expected"] >= unlikely["expected"]
+    assert certain["low"] <= certain["expected"] <= certain["high"]
+
+
+def test_train_command_writes_loadable_artifact(tmp_path):
+    """Test that the retrain command persists an artifact the app can load."""
+    path = str(tmp_path / "savings_model.json")
+    main(["train", "--output", path])
+    with open(path) as f:
+        artifact = json.load(f)
+    assert artifact["report"]["leave_one_out"]["rmse"] > 0
+    assert load_model(path).predict(mock_suppliers()[0])["expected"] > 0
+
+
+def test_fallback_strategies_use_model(client):
+    """Test that fallback strategies quote the model's savings estimate."""
+    from api.negotiations import generate_fallback_strategies
+    supplier = load_mock_data()["suppliers"][0]
+    estimate = load_model().predict(supplier, 2 / 3)
+    strategies = generate_fallback_strategies(supplier, "Electronics", {"success_rate": 2 / 3, "negotiations": 3})
+    assert strategies[0]["expected_savings"] == f"{estimate['expected']}%"
+    assert strategies[1]["expected_savings"] == f"{estimate['low']}-{estimate['high']}%"
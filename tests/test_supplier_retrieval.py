@@ -0,0 +1,42 @@
+from api import compliance
+from api.mock_data import suppliers_data
+from utils.supplier_retrieval import SupplierIndex, compact, parse_constraints
+
+
+def test_search_ranks_by_text_and_attributes():
+    """Test that category and location mentions rank the right supplier first."""
+    results = SupplierIndex(suppliers_data).search("Sustainable packaging made in Germany")
+    assert results[0]["supplier"]["id"] == "sup-005"
+    assert results[0]["reasons"] == ["Offers packaging", "Offers sustainable", "Operates in Germany"]
+    assert [r["score"] for r in results] == sorted((r["score"] for r in results), reverse=True)
+
+
+def test_numeric_constraints_filter_candidates():
+    """Test that rating and price limits in the text are applied as filters."""
+    assert parse_constraints("rating above 4.5 and price under $40") == [("rating", "above", 4.5),
+                                                                         ("avg_price", "under", 40.0)]
+    results = SupplierIndex(suppliers_data).search("raw materials with price under 30")
+    assert [r["supplier"]["id"] for r in results] == ["sup-002", "sup-003"]
+
+
+def test_unrelated_requirements_return_nothing():
+    assert SupplierIndex(suppliers_data).search("quantum widgets") == []
+
+
+def test_prompt_size_is_independent_of_catalog_size(client, monkeypatch):
+    """Test that only the compacted top-k candidates are sent to the model."""
+    catalog = [dict(s, id=f"{s['id']}-{n}") for n in range(200) for s in suppliers_data]
+    monkeypatch.setattr(compliance, "supplier_index", SupplierIndex(catalog))
+    prompts = []
+
+    def fake_complete_json(endpoint, messages):
+        prompts.append(messages[0]["content"])
+        return '{"suppliers": []}'
+
+    monkeypatch.setattr(compliance, "complete_json", fake_complete_json)
+    response = client.post('/api/compliance/requirements', json={"user_text": "electronics from Taiwan"})
+    assert response.status_code == 200
+    assert len(prompts) == 1
+    assert prompts[0].count('"id":') == compliance.SUPPLIER_MATCH_TOP_K
+    assert "john@techcomp.com" not in prompts[0]
+    assert compact(suppliers_data[0])["name"] in prompts[0]
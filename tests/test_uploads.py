@@ -0,0 +1,98 @@
+import hashlib
+import io
+import os
+
+import pytest
+from flask import request
+
+from api import compliance
+from utils import uploads
+from utils.document_cache import DocumentCache
+from utils.pdf_extraction import extract_pages
+from utils.uploads import hash_stream, is_pdf, parse_page_range
+
+CONTRACT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "contract.pdf")
+
+
+def upload(client, stream, filename="contract.pdf", query=""):
+    return client.post(f'/api/compliance/analyze-document{query}',
+                       data={"file": (stream, filename)}, content_type="multipart/form-data")
+
+
+def test_parse_page_range():
+    assert parse_page_range("1-50") == (0, 50)
+    assert parse_page_range("3") == (2, 3)
+    assert parse_page_range("10-") == (9, None)
+    for text in ("0-5", "5-2", "a-b", ""):
+        with pytest.raises(ValueError):
+            parse_page_range(text)
+
+
+def test_pdf_magic_and_hash_rewind_the_stream():
+    stream = io.BytesIO(b"%PDF-1.7\n" + b"x" * 200000)
+    assert is_pdf(stream)
+    assert not is_pdf(io.BytesIO(b"<html></html>"))
+    assert len(hash_stream(stream)) == 64
+    assert stream.read(5) == b"%PDF-"
+
+
+def test_page_range_extraction_from_path():
+    """Test that a page range of a file on disk matches the same pages of a full extraction."""
+    with open(CONTRACT_PATH, "rb") as f:
+        every_page = extract_pages(f.read(), workers=1)
+    assert extract_pages(CONTRACT_PATH, workers=1, pages=(1, 3)) == every_page[1:3]
+    assert extract_pages(CONTRACT_PATH, workers=1, pages=(2, None)) == every_page[2:]
+    with pytest.raises(ValueError):
+        extract_pages(CONTRACT_PATH, workers=1, pages=(len(every_page), None))
+
+
+def test_large_upload_is_spooled_to_a_named_file(app, monkeypatch):
+    monkeypatch.setattr(uploads, "UPLOAD_SPOOL_BYTES", 1024)
+    with open(CONTRACT_PATH, "rb") as f:
+        data = f.read()
+    with app.test_request_context('/', method='POST', data={"file": (io.BytesIO(data), "contract.pdf")},
+                                  content_type="multipart/form-data"):
+        stream = request.files["file"].stream
+        source = uploads.upload_source(stream)
+        assert isinstance(source, str) and os.path.getsize(source) == len(data)
+        assert uploads.upload_hash(stream) == hashlib.sha256(data).hexdigest()  # hashed while spooling
+
+
+def test_upload_is_checked_by_content_not_name(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(compliance, "document_cache", DocumentCache(str(tmp_path)))
+    monkeypatch.setattr(uploads, "hash_stream", lambda stream: 1 / 0)  # uploads are not read a second time
+    assert upload(client, io.BytesIO(b"name says pdf, content does not")).status_code == 400
+    with open(CONTRACT_PATH, "rb") as f:
+        assert upload(client, f, filename="scan.bin").status_code == 200
+
+
+def test_upload_page_range(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(compliance, "document_cache", DocumentCache(str(tmp_path)))
+    with open(CONTRACT_PATH, "rb") as f:
+        assert upload(client, f, query="?pages=1-2").status_code == 200
+    with open(CONTRACT_PATH, "rb") as f:
+        assert upload(client, f, query="?pages=90-").status_code == 400
+    with open(CONTRACT_PATH, "rb") as f:
+        assert upload(client, f, query="?pages=two").status_code == 400
+
+
+def test_oversized_upload_is_refused(app, client, monkeypatch):
+    monkeypatch.setitem(app.config, "MAX_CONTENT_LENGTH", 1024)
+    response = upload(client, io.BytesIO(b"%PDF-1.7\n" + b"x" * 4096))
+    assert response.status_code == 413
+
+
+def test_spool_stream_moves_large_streams_to_disk(monkeypatch):
+    """Test that a stream past the spool threshold is copied to a named file with its hash computed on the way."""
+    monkeypatch.setattr(uploads, "UPLOAD_SPOOL_BYTES", 1024)
+    data = os.urandom(200 * 1024)
+    spool, digest = uploads.spool_stream(io.BytesIO(data), block_size=4096)
+    with spool:
+        assert os.path.isfile(uploads.upload_source(spool))
+        assert spool.read() == data
+    assert digest == hashlib.sha256(data).hexdigest()
+
+    small, _ = uploads.spool_stream(io.BytesIO(b"%PDF-1.7"))
+    assert isinstance(small, io.BytesIO)
+    with pytest.raises(ValueError):
+        uploads.spool_stream(io.BytesIO(data), max_bytes=1000)
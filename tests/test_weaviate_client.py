@@ -0,0 +1,57 @@
+import threading
+from unittest.mock import MagicMock
+
+import requests
+
+from utils import weaviate_client
+from utils.weaviate_client import SupplierKnowledgeGraph, get_knowledge_graph
+
+EMPTY_RESULT = {"data": {"Get": {"Supplier": []}}}
+
+
+def make_graph(monkeypatch, clients):
+    """Graph whose connections hand out the given mock clients in turn"""
+    connections = iter(clients)
+    monkeypatch.setattr(SupplierKnowledgeGraph, "_connect", lambda self: next(connections))
+    return SupplierKnowledgeGraph()
+
+
+def mock_client():
+    client = MagicMock()
+    client.query.raw.return_value = EMPTY_RESULT
+    return client
+
+
+def test_graph_connects_lazily_and_checks_schema_once(monkeypatch):
+    """Test that repeated searches reuse one client and only the first checks the schema."""
+    client = mock_client()
+    graph = make_graph(monkeypatch, [client])
+    assert graph._client is None
+
+    for _ in range(3):
+        graph.search_suppliers("packaging")
+    assert client.schema.exists.call_count == 1
+    assert client.query.raw.call_count == 3
+
+
+def test_shared_graph_is_created_once(monkeypatch):
+    monkeypatch.setattr(weaviate_client, "_knowledge_graph", None)
+    graphs = []
+    threads = [threading.Thread(target=lambda: graphs.append(get_knowledge_graph())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(graph) for graph in graphs}) == 1
+
+
+def test_reconnects_when_health_check_fails(monkeypatch):
+    """Test that a dropped connection to an unready server is replaced and the query retried."""
+    broken, fresh = mock_client(), mock_client()
+    broken.query.raw.side_effect = requests.exceptions.ConnectionError("connection reset")
+    broken.is_ready.return_value = False
+    graph = make_graph(monkeypatch, [broken, fresh])
+
+    assert graph.search_suppliers("metals") == []
+    assert fresh.query.raw.call_count == 1
+    assert fresh.schema.exists.call_count == 1  # the schema is checked again after reconnecting
@@ -0,0 +1,110 @@
+import time
+from unittest.mock import MagicMock
+
+from weaviate.exceptions import ObjectAlreadyExistsException
+
+from utils.weaviate_client import SupplierKnowledgeGraph, supplier_uuid
+from utils.weaviate_sync import SupplierSync, SyncState
+
+
+class FakeBatch:
+    """Weaviate batch that accepts every object except the rejected UUIDs"""
+
+    def __init__(self, rejected=()):
+        self.rejected = set(rejected)
+        self.objects = []
+        self.deleted = []
+        self.callback = None
+
+    def configure(self, callback=None, **kwargs):
+        self.callback = callback
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.callback([{"id": uuid, "result": {"errors": {"error": [{"message": "rejected"}]}}
+                        if uuid in self.rejected else {}} for uuid, _ in self.objects])
+
+    def add_data_object(self, data_object, class_name, uuid=None):
+        self.objects.append((uuid, data_object))
+
+    def delete_objects(self, class_name, where, output="minimal"):
+        self.deleted.extend(where["valueTextArray"])
+        return {"results": {"objects": [{"id": uuid, "status": "SUCCESS"} for uuid in where["valueTextArray"]]}}
+
+
+def make_sync(tmp_path, batch):
+    client = MagicMock()
+    client.batch = batch
+    graph = SupplierKnowledgeGraph()
+    graph.client = client
+    graph.schema_ready = True
+    return SupplierSync(graph, SyncState(str(tmp_path / "sync.json")))
+
+
+def suppliers(count):
+    return [{"id": i, "name": f"Supplier {i}", "categories": ["Metals"], "rating": 4.0} for i in range(count)]
+
+
+def test_sync_sends_only_changes_and_deletes_removed(tmp_path):
+    """Test that a second sync upserts the changed supplier and deletes the removed one, nothing else."""
+    catalog = suppliers(5)
+    assert make_sync(tmp_path, FakeBatch()).run(catalog)["upserted"] == 5
+
+    catalog[1] = {**catalog[1], "rating": 4.8}
+    del catalog[4]
+    batch = FakeBatch()
+    stats = make_sync(tmp_path, batch).run(catalog)
+    assert [uuid for uuid, _ in batch.objects] == [supplier_uuid(1)]
+    assert batch.deleted == [supplier_uuid(4)]
+    assert (stats["upserted"], stats["deleted"], stats["unchanged"]) == (1, 1, 3)
+
+
+def test_rejected_objects_are_retried_next_run(tmp_path):
+    make_sync(tmp_path, FakeBatch(rejected=[supplier_uuid(2)])).run(suppliers(3))
+    batch = FakeBatch()
+    make_sync(tmp_path, batch).run(suppliers(3))
+    assert [uuid for uuid, _ in batch.objects] == [supplier_uuid(2)]
+
+
+def test_unchanged_catalog_sends_nothing(tmp_path):
+    """Test that re-syncing an unchanged 100k catalog never contacts Weaviate and finishes in seconds."""
+    catalog = suppliers(100000)
+    make_sync(tmp_path, FakeBatch()).run(catalog)
+
+    sync = SupplierSync(MagicMock(), SyncState(str(tmp_path / "sync.json")))
+    started = time.perf_counter()
+    stats = sync.run(catalog)
+    assert time.perf_counter() - started < 10
+    assert stats["unchanged"] == 100000
+    assert not sync.graph.mock_calls
+
+
+def test_add_supplier_replaces_existing_object_and_records_hash(tmp_path):
+    """Test that adding a known supplier replaces its object and the next sync leaves it alone."""
+    client = MagicMock()
+    client.data_object.create.side_effect = ObjectAlreadyExistsException("exists")
+    graph = SupplierKnowledgeGraph()
+    graph.client = client
+    graph.schema_ready = True
+    state = SyncState(str(tmp_path / "sync.json"))
+
+    assert graph.add_supplier(suppliers(1)[0], sync_state=state) == supplier_uuid(0)
+    client.data_object.replace.assert_called_once()
+    assert client.data_object.replace.call_args.kwargs["uuid"] == supplier_uuid(0)
+
+    batch = FakeBatch()
+    assert make_sync(tmp_path, batch).run(suppliers(1))["unchanged"] == 1
+    assert not batch.objects
+
+
+def test_add_supplier_leaves_sync_state_alone_by_default(monkeypatch):
+    client = MagicMock()
+    graph = SupplierKnowledgeGraph()
+    graph.client = client
+    graph.schema_ready = True
+    monkeypatch.setattr(SyncState, "save", lambda self: 1 / 0)
+    graph.add_supplier(suppliers(1)[0])
+    client.data_object.create.assert_called_once()
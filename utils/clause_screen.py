@@ -0,0 +1,154 @@
+import json
+import os
+import re
+
+# Clauses to look for besides the regulation requirements, as clause name -> phrases.
+# Phrases in all capitals (acronyms such as "DPA") are matched case-sensitively.
+# Extend or override with a JSON file of the same shape at CLAUSE_DICTIONARY_PATH.
+CLAUSE_DICTIONARY = {
+    "Data processing agreement": ["data processing agreement", "data processing addendum", "DPA"],
+    "Data breach notification": ["breach notification", "notify of any data breach", "security incident notification"],
+    "Confidentiality": ["confidential", "non-disclosure", "NDA"],
+    "Termination": ["termination", "terminate"],
+    "Governing law": ["governing law", "governed by the laws"],
+    "Limitation of liability": ["limitation of liability", "liability shall not exceed"],
+    "Indemnification": ["indemnify", "indemnification", "hold harmless"],
+    "Force majeure": ["force majeure"],
+    "Audit rights": ["right to audit", "quality audits", "audit rights"],
+    "Quality management": ["ISO 9001", "quality management system"],
+    "Environmental management": ["ISO 14001", "environmental management system"],
+    "Hazardous substances": ["RoHS", "hazardous substances"],
+    "Chemical registration": ["REACH", "chemical registration"],
+    "Safety data sheets": ["safety data sheet", "SDS"],
+    "Declaration of conformity": ["declaration of conformity", "RoHS declaration"],
+    "Anti-bribery": ["anti-bribery", "anti-corruption", "FCPA"]
+}
+
+# Wording that needs a closer legal read even when every expected clause is present
+RISK_TERMS = [
+    "unlimited liability", "sole discretion", "automatically renew", "without notice", "liquidated damages",
+    "penalty", "penalties", "exclusive", "waive", "waiver", "non-compete"
+]
+
+STOPWORDS = {"a", "an", "and", "of", "the", "to", "for", "use", "in", "on", "with"}
+
+
+WORD = re.compile(r"[A-Za-z0-9]+")
+
+
+def _phrase_pattern(phrase):
+    """Regex and first word of a phrase, tolerating case, hyphens and line breaks, except for acronyms"""
+    words = WORD.findall(phrase)
+    pattern = r"[\s\-]+".join(re.escape(word) for word in words) + r"\b"
+    if phrase.isupper():
+        return re.compile(pattern), ("word", words[0])
+    return re.compile(pattern, re.I), ("word", words[0].lower())
+
+
+def _requirement_pattern(requirement):
+    """Loose regex and first stem for a requirement name: its key words in order, stemmed, a few words apart
+
+    "Data breach notification procedures" also matches "data breach notification procedure"
+    but not "notification of data breaches", so hints stay specific.
+    """
+    words = [word for word in WORD.findall(requirement.lower()) if word not in STOPWORDS]
+    stems = [word[:max(4, len(word) - 3)] for word in words]
+    pattern = r"\W+(?:\w+\W+){0,3}?".join(re.escape(stem) + r"\w*" for stem in stems)
+    return re.compile(pattern, re.I), ("prefix", stems[0])
+
+
+def load_clause_dictionary(path=None):
+    clauses = dict(CLAUSE_DICTIONARY)
+    path = path or os.getenv("CLAUSE_DICTIONARY_PATH")
+    if path:
+        with open(path) as f:
+            clauses.update(json.load(f))
+    return clauses
+
+
+class ClauseScreen:
+    """Finds expected clauses and risky wording in a document in one pass over its words
+
+    Like an Aho-Corasick automaton over words: every pattern is indexed by its
+    first word (or stem), so each word of the text is looked up once and only
+    the patterns anchored there are tried. Scan time grows with the text, not
+    with the number of configured clauses.
+    """
+
+    def __init__(self, regulations, clause_dictionary=None):
+        self.targets = []  # (kind, name, compiled pattern)
+        self.by_word = {}  # exact first word -> target indexes
+        self.by_prefix = {}  # lowercase first stem -> target indexes
+
+        def add(kind, name, compiled):
+            pattern, (anchor_type, anchor) = compiled
+            index = self.by_word if anchor_type == "word" else self.by_prefix
+            index.setdefault(anchor, []).append(len(self.targets))
+            self.targets.append((kind, name, pattern))
+
+        self.required = []  # (regulation name, requirement hint name)
+        self.regulation_names = {}  # lowercase name -> regulation name
+        for regulation in regulations:
+            self.regulation_names[regulation["name"].lower()] = regulation["name"]
+            for requirement in regulation.get("requirements", []):
+                name = f"{regulation['name']}: {requirement}"
+                self.required.append((regulation["name"], name))
+                add("requirement", name, _requirement_pattern(requirement))
+        for name, phrases in (clause_dictionary or load_clause_dictionary()).items():
+            for phrase in phrases:
+                add("clause", name, _phrase_pattern(phrase))
+        for term in RISK_TERMS:
+            add("risk", term, _phrase_pattern(term))
+        self.prefix_lengths = sorted({len(prefix) for prefix in self.by_prefix})
+
+    def resolve_regulations(self, names):
+        """Regulation names as configured, matched case-insensitively, ValueError naming the unknown ones"""
+        unknown = [name for name in names if name.strip().lower() not in self.regulation_names]
+        if unknown:
+            raise ValueError(f"Unknown regulations: {', '.join(unknown)}")
+        return sorted({self.regulation_names[name.strip().lower()] for name in names})
+
+    def _candidates(self, word):
+        lowered = word.lower()
+        candidates = self.by_word.get(word, [])
+        if lowered != word:
+            candidates = candidates + self.by_word.get(lowered, [])
+        for length in self.prefix_lengths:
+            if length > len(lowered):
+                break
+            candidates = candidates + self.by_prefix.get(lowered[:length], [])
+        return candidates
+
+    def scan(self, text):
+        """Yield matches in the text as (kind, name, start) tuples"""
+        for word in WORD.finditer(text):
+            for index in self._candidates(word.group()):
+                kind, name, pattern = self.targets[index]
+                if pattern.match(text, word.start()):
+                    yield kind, name, word.start()
+
+    def is_flagged(self, text):
+        """Whether a section mentions any expected clause or risky wording"""
+        return next(self.scan(text), None) is not None
+
+    def screen(self, text, regulations=None):
+        """Found and missing clause hints for a document, checking the requirements of `regulations` (all by default)
+
+        The screen is conclusive when there were required clauses, every one of
+        them was found and no risky wording was seen, so there is nothing left
+        for the model to judge.
+        """
+        found = {"requirement": {}, "clause": {}, "risk": {}}
+        for kind, name, start in self.scan(text):
+            found[kind].setdefault(name, start)
+
+        selected = None if regulations is None else set(self.resolve_regulations(regulations))
+        required = [name for regulation, name in self.required if selected is None or regulation in selected]
+        missing = [name for name in required if name not in found["requirement"]]
+        return {
+            "found_requirements": [name for name in required if name in found["requirement"]],
+            "missing_requirements": missing,
+            "found_clauses": list(found["clause"]),
+            "risk_terms": list(found["risk"]),
+            "conclusive": bool(required) and not missing and not found["risk"]
+        }
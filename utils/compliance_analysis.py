@@ -0,0 +1,131 @@
+import contextvars
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.json_provider import dumps_bytes
+from utils.llm import estimate_text_tokens
+
+# Upper bound on document tokens sent in one analysis prompt
+COMPLIANCE_CHUNK_TOKENS = int(os.getenv("COMPLIANCE_CHUNK_TOKENS", 3000))
+# Chunks of one document analyzed at the same time, the LLM scheduler still bounds the total
+COMPLIANCE_CHUNK_CONCURRENCY = int(os.getenv("COMPLIANCE_CHUNK_CONCURRENCY", 8))
+
+# Lines that open a new clause: "4. COMPLIANCE", "12.3 Liability", "Article 7", "Section 2", "§ 5"
+CLAUSE_HEADING = re.compile(r"^[ \t]*(?:\d+\.(?:\d+\.?)*[ \t]+[A-Z]|(?:ARTICLE|Article|SECTION|Section|CLAUSE|Clause)"
+                            r"[ \t]+[\dIVXLC]+|§[ \t]*\d)", re.M)
+PARAGRAPH_END = re.compile(r"\n[ \t]*\n\s*")
+LINE_END = re.compile(r"\n")
+SENTENCE_END = re.compile(r"[.;:!?]\s+")
+
+
+def split_clauses(text):
+    """Split a document at clause headings, text before the first heading is its own clause"""
+    starts = [match.start() for match in CLAUSE_HEADING.finditer(text)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    clauses = [text[start:stop] for start, stop in zip(starts, starts[1:] + [len(text)])]
+    return [clause for clause in clauses if clause.strip()]
+
+
+def _split_after(text, separator):
+    """Split after every match of `separator`, keeping the text intact"""
+    cuts = [match.end() for match in separator.finditer(text) if 0 < match.end() < len(text)]
+    return [text[start:stop] for start, stop in zip([0] + cuts, cuts + [len(text)])]
+
+
+def _split_oversized(clause, max_tokens):
+    """Break a clause over the budget at paragraph, line, then sentence ends, cutting mid-text only as a last resort"""
+    for separator in (PARAGRAPH_END, LINE_END, SENTENCE_END):
+        parts = _split_after(clause, separator)
+        if len(parts) > 1:
+            pieces = []
+            for part in parts:
+                if estimate_text_tokens(part) > max_tokens:
+                    pieces.extend(_split_oversized(part, max_tokens))
+                else:
+                    pieces.append(part)
+            return pieces
+    width = max_tokens * 4
+    return [clause[start:start + width] for start in range(0, len(clause), width)]
+
+
+def chunk_document(text, max_tokens=COMPLIANCE_CHUNK_TOKENS):
+    """Pack whole clauses into chunks of at most `max_tokens`, splitting only clauses that alone exceed it"""
+    chunks, current = [], ""
+    for clause in split_clauses(text):
+        pieces = [clause] if estimate_text_tokens(clause) <= max_tokens else _split_oversized(clause, max_tokens)
+        for piece in pieces:
+            if current and estimate_text_tokens(current + piece) > max_tokens:
+                chunks.append(current)
+                current = ""
+            current += piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def map_chunks(chunks, analyze_fn, concurrency=COMPLIANCE_CHUNK_CONCURRENCY):
+    """Run analyze_fn(index, chunk) for every chunk concurrently, failed chunks give None"""
+
+    def run(index):
+        try:
+            return analyze_fn(index, chunks[index])
+        except Exception as e:
+            print(f"Error analyzing document chunk {index + 1}/{len(chunks)}: {e}")
+            return None
+
+    if len(chunks) <= 1:
+        return [run(index) for index in range(len(chunks))]
+    # Each chunk runs in a copy of the caller's context, so its LLM priority class applies
+    contexts = [contextvars.copy_context() for _ in chunks]
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(chunks))) as executor:
+        return list(executor.map(lambda index: contexts[index].run(run, index), range(len(chunks))))
+
+
+def _field(analysis, name):
+    """Look up a key regardless of spaces, dashes, underscores or case ("identified clauses")"""
+    for key, value in analysis.items():
+        if re.sub(r"[\s_-]+", "_", key.strip().lower()) == name:
+            return value
+    return None
+
+
+def _score(value):
+    """Numeric 0-100 score from 75, "75", "75%" or "75/100" """
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = re.search(r"\d+(?:\.\d+)?", str(value or ""))
+    return float(match.group()) if match else None
+
+
+def _as_list(value):
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def merge_analyses(analyses, chunks):
+    """Combine per-chunk analyses into one report, the score is weighted by chunk length"""
+    merged = {"identified_clauses": [], "compliance_concerns": [], "suggested_actions": []}
+    seen = {key: set() for key in merged}
+    weighted_score, score_weight = 0.0, 0
+    for analysis, chunk in zip(analyses, chunks):
+        if not isinstance(analysis, dict):
+            continue
+        for key in merged:
+            for item in _as_list(_field(analysis, key)):
+                identity = item.strip().lower() if isinstance(item, str) else dumps_bytes(item)
+                if identity not in seen[key]:
+                    seen[key].add(identity)
+                    merged[key].append(item)
+        score = _score(_field(analysis, "compliance_score"))
+        if score is not None:
+            weight = max(1, estimate_text_tokens(chunk))
+            weighted_score += score * weight
+            score_weight += weight
+
+    merged["compliance_score"] = round(weighted_score / score_weight) if score_weight else None
+    merged["chunks"] = len(chunks)
+    merged["failed_chunks"] = sum(not isinstance(analysis, dict) for analysis in analyses)
+    return merged
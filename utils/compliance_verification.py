@@ -0,0 +1,184 @@
+import bisect
+import itertools
+import threading
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+
+RISK_LEVELS = {"low": 0.0, "medium": 0.5, "high": 1.0}
+NON_COMPLIANT_STATUSES = {"non-compliant", "non_compliant", "expired", "invalid"}
+
+# Share of the risk score from compliance records, the rest comes from the supplier's risk factors
+RECORD_RISK_WEIGHT = 0.7
+
+
+def _supplier_key(supplier_id):
+    """Index key for a supplier ID given as int or string ("3" and 3 are the same supplier)"""
+    if isinstance(supplier_id, str) and supplier_id.isdigit():
+        return int(supplier_id)
+    return supplier_id
+
+
+class ComplianceIndex:
+    """Compliance records and certifications indexed by supplier and by expiry date
+
+    The expiry index is a sorted list of (expiry date, sequence, record), so
+    "expired" and "expiring within N days" are two bisections plus the k
+    matching records.
+    """
+
+    def __init__(self, suppliers=(), records=()):
+        self.records = defaultdict(list)  # supplier ID -> records
+        self.risk_factors = {}  # supplier ID -> risk factor levels
+        self.expiry_index = []
+        self.sequence = itertools.count()
+        self.listeners = []  # called with every record that has an expiry date
+        self.lock = threading.Lock()
+
+        for supplier in suppliers:
+            self.add_supplier(supplier)
+        for record in records:
+            self.add_record(record)
+
+    def _add(self, record):
+        self.records[record["supplier_id"]].append(record)
+        if record["expiry_date"]:
+            bisect.insort(self.expiry_index, (record["expiry_date"], next(self.sequence), record))
+            for listener in self.listeners:
+                listener(record)
+
+    def subscribe(self, listener):
+        """Call listener(record) for every record with an expiry date, the ones indexed so far and new ones"""
+        with self.lock:
+            self.listeners.append(listener)
+            for _, _, record in self.expiry_index:
+                listener(record)
+
+    def add_record(self, record):
+        """Index a compliance document record from mock_data.json's `compliance` list"""
+        with self.lock:
+            self._add({
+                "supplier_id": _supplier_key(record["supplierId"]),
+                "supplier_name": record.get("supplierName"),
+                "type": "document",
+                "id": record.get("id"),
+                "name": record.get("documentType"),
+                "category": record.get("category") or record.get("documentType"),
+                "status": record.get("status", "compliant"),
+                "expiry_date": record.get("expiryDate"),
+                "last_checked": record.get("lastChecked"),
+                "notes": record.get("notes")
+            })
+
+    def add_supplier(self, supplier):
+        """Index a supplier's certifications and risk factors"""
+        supplier_id = _supplier_key(supplier["id"])
+        with self.lock:
+            self.risk_factors[supplier_id] = [RISK_LEVELS.get(factor.get("level"), 0.0)
+                                              for factor in supplier.get("riskFactors", [])]
+            for certification in supplier.get("certifications", []):
+                self._add({
+                    "supplier_id": supplier_id,
+                    "supplier_name": supplier.get("name"),
+                    "type": "certification",
+                    "id": None,
+                    "name": certification["name"],
+                    "category": certification["name"],
+                    "status": "compliant" if certification.get("valid", True) else "invalid",
+                    "expiry_date": certification.get("expirationDate"),
+                    "last_checked": None,
+                    "notes": None
+                })
+
+    def supplier_ids(self):
+        return list(dict.fromkeys(list(self.risk_factors) + list(self.records)))
+
+    def expiring(self, as_of, within_days=0, include_expired=True):
+        """Records expiring before `as_of` + `within_days`, optionally leaving out the ones already expired"""
+        as_of = _iso(as_of)
+        end = (date.fromisoformat(as_of) + timedelta(days=within_days)).isoformat()
+        with self.lock:
+            start = 0 if include_expired else bisect.bisect_left(self.expiry_index, (as_of,))
+            # Sequence numbers are finite, so records expiring on the end day are included
+            stop = bisect.bisect_right(self.expiry_index, (end, float("inf")))
+            return [record for _, _, record in self.expiry_index[start:stop]]
+
+    def classify(self, record, as_of, window_end):
+        if record["status"] in NON_COMPLIANT_STATUSES or (record["expiry_date"] and record["expiry_date"] < as_of):
+            return "non_compliant"
+        if record["status"] == "review" or (record["expiry_date"] and record["expiry_date"] <= window_end):
+            return "at_risk"
+        return "compliant"
+
+    def verify(self, supplier_id, as_of=None, window_days=60, document_id=None):
+        """Compliance status, areas, risk score and actions for one supplier"""
+        as_of = _iso(as_of)
+        window_end = (date.fromisoformat(as_of) + timedelta(days=window_days)).isoformat()
+        key = _supplier_key(supplier_id)
+        records = self.records.get(key, [])
+        if document_id is not None:
+            records = [record for record in records if str(record["id"]) == str(document_id)]
+
+        if not records:
+            return {
+                "supplier_id": supplier_id,
+                "status": "unverified",
+                "compliant_areas": [],
+                "non_compliant_areas": [],
+                "expiring": [],
+                "risk_score": 100,
+                "recommended_actions": ["Request compliance documentation and certificates from the supplier"],
+                "as_of": as_of
+            }
+
+        compliant, non_compliant, expiring, actions = [], [], [], []
+        risk = 0.0
+        for record in records:
+            outcome = self.classify(record, as_of, window_end)
+            if outcome == "non_compliant":
+                non_compliant.append(record["category"])
+                risk += 1.0
+                if record["expiry_date"] and record["expiry_date"] < as_of:
+                    actions.append(f"Request a renewed {record['name']} (expired {record['expiry_date']})")
+                else:
+                    actions.append(f"Resolve the non-compliant {record['name']}")
+            else:
+                compliant.append(record["category"])
+                if outcome == "at_risk":
+                    risk += 0.5
+                    expiring.append({"name": record["name"], "expiry_date": record["expiry_date"]})
+                    if record["status"] == "review":
+                        actions.append(f"Complete the review of {record['name']}")
+                    else:
+                        actions.append(f"Renew {record['name']} before {record['expiry_date']}")
+
+        factors = self.risk_factors.get(key, [])
+        factor_risk = sum(factors) / len(factors) if factors else 0.5
+        risk_score = round(100 * (RECORD_RISK_WEIGHT * risk / len(records) + (1 - RECORD_RISK_WEIGHT) * factor_risk))
+
+        if not non_compliant:
+            status = "compliant" if not expiring else "at_risk"
+        else:
+            status = "partially_compliant" if compliant else "non_compliant"
+        return {
+            "supplier_id": supplier_id,
+            "status": status,
+            "compliant_areas": list(dict.fromkeys(compliant)),
+            "non_compliant_areas": list(dict.fromkeys(non_compliant)),
+            "expiring": expiring,
+            "risk_score": risk_score,
+            "recommended_actions": actions,
+            "as_of": as_of
+        }
+
+    def verify_many(self, supplier_ids=None, as_of=None, window_days=60):
+        """Verify many suppliers at once, all indexed suppliers by default"""
+        supplier_ids = self.supplier_ids() if supplier_ids is None else supplier_ids
+        results = [self.verify(supplier_id, as_of, window_days) for supplier_id in supplier_ids]
+        return {
+            "results": results,
+            "summary": dict(Counter(result["status"] for result in results), total=len(results))
+        }
+
+
+def _iso(value):
+    return value or date.today().isoformat()
@@ -0,0 +1,88 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+
+from utils.json_provider import dumps_bytes, loads
+
+
+def version_tag(*parts):
+    """Short stable tag for everything besides the document that determines a cached result"""
+    return hashlib.sha256("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()[:12]
+
+
+class DocumentCache:
+    """On-disk JSON cache of per-document results, evicting least recently used entries past `max_bytes`"""
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.index = None  # file name -> (last used, size), loaded on first use
+
+    def _load_index(self):
+        if self.index is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self.index = {}
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json") and entry.is_file():
+                stat = entry.stat()
+                self.index[entry.name] = (stat.st_mtime, stat.st_size)
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def get(self, kind, key):
+        """Return the cached value, or None on a miss"""
+        name = f"{kind}-{key}.json"
+        with self.lock:
+            self._load_index()
+            if name not in self.index:
+                return None
+        try:
+            with open(self._path(name), "rb") as f:
+                value = loads(f.read())
+            os.utime(self._path(name))  # Recency survives restarts through the file times
+        except (OSError, ValueError):
+            with self.lock:
+                self.index.pop(name, None)
+            return None
+        with self.lock:
+            if name in self.index:
+                self.index[name] = (time.time(), self.index[name][1])
+        return value
+
+    def put(self, kind, key, value):
+        name = f"{kind}-{key}.json"
+        data = dumps_bytes(value)
+        if len(data) > self.max_bytes:
+            return
+        with self.lock:
+            self._load_index()
+            # Write to a temporary file first so readers never see a partial entry
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, self._path(name))
+            self.index[name] = (time.time(), len(data))
+            self._evict()
+
+    def _evict(self):
+        total = sum(size for _, size in self.index.values())
+        for name, (_, size) in sorted(self.index.items(), key=lambda item: item[1][0]):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self._path(name))
+            except OSError:
+                pass
+            del self.index[name]
+            total -= size
+
+    def size(self):
+        with self.lock:
+            self._load_index()
+            return sum(size for _, size in self.index.values())
+
@@ -0,0 +1,120 @@
+import hashlib
+import json
+import queue
+import threading
+from datetime import datetime, timezone
+
+
+def supplier_hash(supplier):
+    """Hash the canonical JSON form of a supplier record"""
+    canonical = json.dumps(supplier, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class DossierPrecomputer:
+    """Keeps generated dossiers in sync with supplier records off the request path"""
+
+    def __init__(self, generate_fn, suppliers_fn, interval=60, warm=False):
+        self.generate_fn = generate_fn  # supplier record -> dossier dict
+        self.suppliers_fn = suppliers_fn  # () -> current list of supplier records
+        self.interval = interval
+        self.warm = warm  # also precompute suppliers that were never requested
+
+        self.entries = {}  # supplier_id -> {"hash", "dossier", "generated_at"}
+        self.pending = set()
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.threads = []
+
+    def start(self):
+        """Start the scanner and refresh worker threads (idempotent)"""
+        with self.lock:
+            if self.threads:
+                return
+            self.threads = [
+                threading.Thread(target=self._scan_loop, name="dossier-scanner", daemon=True),
+                threading.Thread(target=self._refresh_loop, name="dossier-refresher", daemon=True)
+            ]
+        for thread in self.threads:
+            thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.queue.put(None)
+
+    def get(self, supplier):
+        """Return the stored dossier entry for a supplier, or None if none was generated yet
+
+        A stored dossier whose supplier record has since changed is still returned,
+        marked as stale, and a refresh is scheduled in the background.
+        """
+        current_hash = supplier_hash(supplier)
+        with self.lock:
+            entry = self.entries.get(supplier["id"])
+            if entry is None:
+                return None
+            stale = entry["hash"] != current_hash
+        if stale:
+            self.schedule(supplier["id"])
+        return {"dossier": entry["dossier"], "generated_at": entry["generated_at"], "stale": stale}
+
+    def store(self, supplier, dossier):
+        """Store a freshly generated dossier for the given supplier record"""
+        entry = {
+            "hash": supplier_hash(supplier),
+            "dossier": dossier,
+            "generated_at": datetime.now(timezone.utc).isoformat()
+        }
+        with self.lock:
+            self.entries[supplier["id"]] = entry
+        return {"dossier": dossier, "generated_at": entry["generated_at"], "stale": False}
+
+    def schedule(self, supplier_id):
+        """Queue a background refresh unless one is already pending"""
+        with self.lock:
+            if supplier_id in self.pending:
+                return
+            self.pending.add(supplier_id)
+        self.queue.put(supplier_id)
+
+    def scan(self):
+        """Schedule a refresh for every supplier whose record hash changed, returns their IDs"""
+        changed = []
+        for supplier in self.suppliers_fn():
+            with self.lock:
+                entry = self.entries.get(supplier["id"])
+            if entry is None and not self.warm:
+                continue
+            if entry is None or entry["hash"] != supplier_hash(supplier):
+                changed.append(supplier["id"])
+                self.schedule(supplier["id"])
+        return changed
+
+    def refresh(self, supplier_id):
+        """Regenerate and store the dossier for one supplier from its latest record"""
+        try:
+            supplier = next((s for s in self.suppliers_fn() if s["id"] == supplier_id), None)
+            if supplier is None:
+                with self.lock:
+                    self.entries.pop(supplier_id, None)
+                return None
+            return self.store(supplier, self.generate_fn(supplier))
+        except Exception as e:
+            print(f"Error precomputing dossier for {supplier_id}: {e}")
+            return None
+        finally:
+            with self.lock:
+                self.pending.discard(supplier_id)
+
+    def _scan_loop(self):
+        while not self.stop_event.is_set():
+            self.scan()
+            self.stop_event.wait(self.interval)
+
+    def _refresh_loop(self):
+        while not self.stop_event.is_set():
+            supplier_id = self.queue.get()
+            if supplier_id is None:
+                break
+            self.refresh(supplier_id)
@@ -0,0 +1,122 @@
+import heapq
+import itertools
+import threading
+from datetime import date, datetime, time, timedelta, timezone
+
+# Alerts are raised this many days before expiry, 0 is the day a record lapses
+ALERT_LEAD_DAYS = (60, 30, 0)
+
+# The longest a scheduler sleeps before rechecking, in case the clock jumps
+MAX_SLEEP = 3600
+
+
+class ExpiryScheduler:
+    """Raises alerts as certifications and compliance documents approach expiry
+
+    Upcoming alert events sit in a min-heap ordered by due date. The worker
+    thread sleeps until the earliest one is due, so the work done is
+    proportional to the alerts fired rather than to the number of records.
+    Fired alerts are appended to a feed read incrementally with a cursor.
+    """
+
+    def __init__(self, now_fn=None, lead_days=ALERT_LEAD_DAYS, max_alerts=10000):
+        self.now_fn = now_fn or (lambda: datetime.now(timezone.utc))
+        self.lead_days = sorted(lead_days, reverse=True)
+        self.max_alerts = max_alerts
+
+        self.heap = []  # (due date, sequence, event)
+        self.sequence = itertools.count()
+        self.alerts = []  # feed, alerts[i] has ID first_alert_id + i
+        self.first_alert_id = 1
+        self.condition = threading.Condition()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        """Start the worker thread (idempotent)"""
+        with self.condition:
+            if self.thread:
+                return
+            self.thread = threading.Thread(target=self._run, name="expiry-scheduler", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the worker thread"""
+        self.stop_event.set()
+        with self.condition:
+            self.condition.notify_all()
+
+    def today(self):
+        return self.now_fn().date()
+
+    def add_record(self, record):
+        """Schedule the alerts for a record with `expiry_date`, as indexed by ComplianceIndex"""
+        if not record.get("expiry_date"):
+            return
+        expiry = date.fromisoformat(record["expiry_date"])
+        today = self.today()
+        events = [(expiry - timedelta(days=lead), lead) for lead in self.lead_days]
+        # Of the stages already due, only the latest is still worth an alert
+        past = [event for event in events if event[0] <= today]
+        events = past[-1:] + [event for event in events if event[0] > today]
+
+        with self.condition:
+            for due, lead in events:
+                heapq.heappush(self.heap, (due, next(self.sequence), {"record": record, "days_before": lead}))
+            # The new events may be due before the one the worker is sleeping for
+            self.condition.notify_all()
+
+    def _fire(self, due, event):
+        record = event["record"]
+        self.alerts.append({
+            "id": self.first_alert_id + len(self.alerts),
+            "kind": "expired" if event["days_before"] == 0 else "expiring",
+            "days_before": event["days_before"],
+            "due_date": due.isoformat(),
+            "supplier_id": record.get("supplier_id"),
+            "supplier_name": record.get("supplier_name"),
+            "type": record.get("type"),
+            "name": record.get("name"),
+            "expiry_date": record["expiry_date"],
+            "fired_at": self.now_fn().isoformat()
+        })
+        if len(self.alerts) > self.max_alerts:
+            dropped = len(self.alerts) - self.max_alerts
+            del self.alerts[:dropped]
+            self.first_alert_id += dropped
+
+    def fire_due(self):
+        """Move every event due by today to the feed, returns how many fired"""
+        today = self.today()
+        fired = 0
+        with self.condition:
+            while self.heap and self.heap[0][0] <= today:
+                due, _, event = heapq.heappop(self.heap)
+                self._fire(due, event)
+                fired += 1
+        return fired
+
+    def seconds_until_next(self):
+        """Seconds until the earliest pending event is due, None when nothing is scheduled"""
+        with self.condition:
+            if not self.heap:
+                return None
+            due_at = datetime.combine(self.heap[0][0], time.min, tzinfo=timezone.utc)
+        return max(0.0, (due_at - self.now_fn()).total_seconds())
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            self.fire_due()
+            with self.condition:
+                # Checked under the lock, so a record added meanwhile still wakes the wait
+                wait = self.seconds_until_next()
+                if not self.stop_event.is_set() and (wait is None or wait > 0):
+                    self.condition.wait(MAX_SLEEP if wait is None else min(wait, MAX_SLEEP))
+
+    def alerts_since(self, cursor=0, limit=100):
+        """Alerts with an ID above `cursor`, oldest first, and the cursor to pass next time"""
+        with self.condition:
+            start = max(0, cursor + 1 - self.first_alert_id)
+            alerts = self.alerts[start:start + limit]
+            next_cursor = alerts[-1]["id"] if alerts else max(cursor, self.first_alert_id + len(self.alerts) - 1)
+            return {"alerts": alerts, "next_cursor": next_cursor, "pending_events": len(self.heap)}
@@ -0,0 +1,187 @@
+import json
+import math
+import re
+from functools import lru_cache
+
+OPERATORS = {
+    "And", "Or", "Equal", "NotEqual", "GreaterThan", "GreaterThanEqual", "LessThan", "LessThanEqual", "Like",
+    "ContainsAny", "ContainsAll", "IsNull"
+}
+NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+class _Param:
+    """Position of an escaped value in a query template"""
+
+
+PARAM = _Param()
+
+
+def condition(path, operator, value):
+    """Leaf of a filter tree, the value type (valueString, valueNumber, ...) follows the Python value"""
+    return {"path": [path] if isinstance(path, str) else list(path), "operator": operator, "value": value}
+
+
+def all_of(*conditions):
+    """And of the given conditions, None entries are skipped and nested Ands flattened"""
+    operands = []
+    for item in conditions:
+        if item is None:
+            continue
+        operands.extend(item["operands"] if item.get("operator") == "And" else [item])
+    if not operands:
+        return None
+    return operands[0] if len(operands) == 1 else {"operator": "And", "operands": operands}
+
+
+def any_of(*conditions):
+    operands = [item for item in conditions if item is not None]
+    if not operands:
+        return None
+    return operands[0] if len(operands) == 1 else {"operator": "Or", "operands": operands}
+
+
+def _value_key(value):
+    sample = value[0] if isinstance(value, (list, tuple)) and value else value
+    if isinstance(sample, bool):
+        return "valueBoolean"
+    if isinstance(sample, (int, float)):
+        return "valueNumber"
+    return "valueString"
+
+
+def _name(name):
+    if not NAME.match(name):
+        raise ValueError(f"Invalid GraphQL name: {name!r}")
+    return name
+
+
+def _operator(operator):
+    if operator not in OPERATORS:
+        raise ValueError(f"Unknown filter operator: {operator!r}")
+    return operator
+
+
+def _shape(tree, params):
+    """Hashable structure of a filter tree without its values, which are appended to `params`"""
+    operator = _operator(tree["operator"])
+    if operator in ("And", "Or"):
+        return (operator, tuple(_shape(operand, params) for operand in tree["operands"]))
+    value = tree["value"]
+    if isinstance(value, (list, tuple)):
+        params.extend(value)
+        return (operator, tuple(tree["path"]), _value_key(value), len(value))
+    params.append(value)
+    return (operator, tuple(tree["path"]), _value_key(value), None)
+
+
+def _render_filter(shape, out):
+    operator = shape[0]
+    if operator in ("And", "Or"):
+        out.append(f"{{operator: {operator}, operands: [")
+        for index, operand in enumerate(shape[1]):
+            if index:
+                out.append(", ")
+            _render_filter(operand, out)
+        out.append("]}")
+        return
+    _, path, value_key, length = shape
+    out.append(f"{{operator: {operator}, path: {json.dumps([_name(part) for part in path])}, {value_key}: ")
+    if length is None:
+        out.append(PARAM)
+    else:
+        out.append("[")
+        for index in range(length):
+            if index:
+                out.append(", ")
+            out.append(PARAM)
+        out.append("]")
+    out.append("}")
+
+
+@lru_cache(maxsize=256)
+def _template(class_name, fields, additional, where_shape, concept_count, sort, bm25_properties=None):
+    """Literal segments of a Get query, to be interleaved with escaped values
+
+    The values are, in order: limit, concepts, the BM25 query and filter values.
+    """
+    out = [f"{{Get {{{_name(class_name)}(limit: ", PARAM]
+    if concept_count is not None:
+        out.append(" nearText: {concepts: [")
+        for index in range(concept_count):
+            if index:
+                out.append(", ")
+            out.append(PARAM)
+        out.append("]}")
+    if bm25_properties is not None:
+        out.append(" bm25: {query: ")
+        out.append(PARAM)
+        if bm25_properties:
+            out.append(f", properties: {json.dumps([_name(prop) for prop in bm25_properties])}")
+        out.append("}")
+    if where_shape is not None:
+        out.append(" where: ")
+        _render_filter(where_shape, out)
+    if sort:
+        if any(order not in ("asc", "desc") for _, order in sort):
+            raise ValueError("Sort order must be asc or desc")
+        out.append(" sort: [" + ", ".join(f"{{path: [{json.dumps(_name(path))}], order: {order}}}"
+                                          for path, order in sort) + "]")
+    out.append(") {" + " ".join(_name(field) for field in fields))
+    if additional:
+        out.append(" _additional {" + " ".join(_name(field) for field in additional) + "}")
+    out.append("}}}")
+
+    segments, current = [], []
+    for piece in out:
+        if piece is PARAM:
+            segments.append("".join(current))
+            current = []
+        else:
+            current.append(piece)
+    segments.append("".join(current))
+    return tuple(segments)
+
+
+def escape(value):
+    """GraphQL literal for a filter value or concept"""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            raise ValueError(f"Filter values must be finite, got {value}")
+        return repr(value)
+    # JSON string escaping is valid GraphQL string escaping
+    return json.dumps(str(value))
+
+
+def get_query(class_name, fields, where=None, concepts=None, limit=10, sort=(), additional=(), bm25=None,
+              bm25_properties=()):
+    """GraphQL Get query projecting `fields`, with the filter tree pushed down as one `where` argument
+
+    `concepts` makes it a nearText (vector) search, `bm25` a keyword search
+    over `bm25_properties` (all text properties when empty). The query text
+    is compiled once per filter shape (operators, paths and value types) and
+    cached; values are escaped and spliced in per call.
+    """
+    params = [int(limit)]
+    if concepts is not None:
+        concepts = list(concepts)
+        params.extend(concepts)
+    if bm25 is not None:
+        params.append(bm25)
+    where_shape = _shape(where, params) if where else None
+    segments = _template(class_name, tuple(fields), tuple(additional), where_shape,
+                         None if concepts is None else len(concepts), tuple(tuple(item) for item in sort),
+                         None if bm25 is None else tuple(bm25_properties))
+    pieces = [segments[0]]
+    for value, segment in zip(params, segments[1:]):
+        pieces.append(escape(value))
+        pieces.append(segment)
+    return "".join(pieces)
+
+
+def template_cache_info():
+    return _template.cache_info()
@@ -0,0 +1,90 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+# Rank offset of reciprocal rank fusion, larger values flatten the difference between top and lower ranks
+RRF_K = 60
+
+# Candidates fetched from each of the BM25 and vector searches before fusing
+HYBRID_CANDIDATES = int(os.getenv("HYBRID_CANDIDATES", 50))
+
+# Weight of each signal in the reranking score, relevance is the fused rank score scaled to 0-1
+RERANK_WEIGHTS = {"relevance": 1.0, "rating": 0.3, "sustainability": 0.2, "price_fit": 0.3}
+
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", 512))
+SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL", 300))
+
+
+def reciprocal_rank_fusion(ranked_lists, k=RRF_K):
+    """IDs from several ranked lists ordered by the sum of 1 / (k + rank), and their fused scores"""
+    scores = {}
+    for ranked in ranked_lists:
+        for rank, item_id in enumerate(ranked, start=1):
+            scores[item_id] = scores.get(item_id, 0.0) + 1.0 / (k + rank)
+    # Sorting is stable, so ties keep the order the IDs were first seen in
+    order = sorted(scores, key=scores.get, reverse=True)
+    return order, np.array([scores[item_id] for item_id in order])
+
+
+def _column(candidates, prop):
+    return np.array([candidate.get(prop) if candidate.get(prop) is not None else np.nan
+                     for candidate in candidates], dtype=float)
+
+
+def price_fit(prices, target):
+    """1 at the target price, falling off with the relative distance from it, 0 for missing prices"""
+    with np.errstate(invalid="ignore"):
+        fit = 1.0 / (1.0 + np.abs(prices - target) / max(float(target), 1e-9))
+    return np.nan_to_num(fit)
+
+
+def rerank_scores(candidates, relevance, price_target=None, weights=RERANK_WEIGHTS):
+    """Reranking score of every candidate (Weaviate objects) from its fused relevance and numeric properties"""
+    relevance = np.asarray(relevance, dtype=float)
+    scores = weights["relevance"] * relevance / (relevance.max() if len(relevance) and relevance.max() > 0 else 1)
+    scores += weights["rating"] * np.nan_to_num(_column(candidates, "rating") / 5)
+    scores += weights["sustainability"] * np.nan_to_num(_column(candidates, "sustainabilityScore") / 100)
+    if price_target is not None:
+        scores += weights["price_fit"] * price_fit(_column(candidates, "avgPrice"), price_target)
+    return scores
+
+
+def rerank(candidates, relevance, price_target=None, weights=RERANK_WEIGHTS):
+    """Candidates ordered by reranking score, the fused order breaking ties"""
+    scores = rerank_scores(candidates, relevance, price_target, weights)
+    return [candidates[index] for index in np.argsort(-scores, kind="stable")]
+
+
+class SearchCache:
+    """Least recently used search results, each kept for at most `ttl` seconds"""
+
+    def __init__(self, max_entries=SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()  # key -> (expires at, results)
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, results):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, results)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
@@ -0,0 +1,233 @@
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from utils.json_provider import dumps_bytes, loads
+
+try:
+    import fcntl
+except ImportError:  # No advisory locks (Windows), only safe with a single process per store
+    fcntl = None
+
+JOB_ID = re.compile(r"^[0-9a-f]{32}$")
+
+# Seconds between re-reads of a stored job while long-polling, other processes may be running it
+POLL_INTERVAL = 0.2
+
+
+class JobQueueFull(Exception):
+    """Raised when a manager already has `max_queued` unfinished jobs"""
+
+
+class JobManager:
+    """Runs background jobs on a bounded thread pool and keeps their state for polling
+
+    With a `store_dir`, jobs queued through `enqueue` are written to disk as
+    they change, so `resume` can serve their results and re-queue the ones
+    that had not finished after a restart. Several processes (WSGI workers)
+    can share a store: any of them answers `get` from the stored state, and
+    a job is claimed with a lock on its file before it runs, so each one runs
+    once even when several processes have queued it.
+    """
+
+    FINISHED = ("completed", "failed")
+
+    def __init__(self, max_workers=4, ttl=3600, name="jobs", store_dir=None, max_queued=None):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self.ttl = ttl  # seconds finished jobs are kept for polling
+        self.store_dir = store_dir
+        self.max_queued = max_queued
+        self.jobs = {}
+        self.specs = {}  # job ID -> (task, payload) for jobs that can be resumed
+        self.tasks = {}  # task name -> function called with the payload
+        self.condition = threading.Condition()
+        if store_dir:
+            os.makedirs(store_dir, exist_ok=True)
+
+    def register(self, task, fn):
+        """Make `fn(payload)` runnable by name through `enqueue` and `resume`"""
+        self.tasks[task] = fn
+
+    def submit(self, fn, initial_result=None):
+        """Queue fn() and return the job ID, `initial_result` is served until it finishes"""
+        return self._submit(fn, initial_result)
+
+    def enqueue(self, task, payload, initial_result=None):
+        """Queue a registered task with a JSON-serializable payload, persisted when the manager has a store"""
+        return self._submit(lambda: self.tasks[task](payload), initial_result, spec=(task, payload))
+
+    def _submit(self, fn, initial_result, spec=None, job=None):
+        self._expire()
+        now = datetime.now(timezone.utc).isoformat()
+        with self.condition:
+            if self.max_queued is not None and job is None and self.unfinished() >= self.max_queued:
+                raise JobQueueFull(f"{self.max_queued} jobs are already queued")
+            job = job or {
+                "id": uuid.uuid4().hex,
+                "status": "pending",
+                "result": initial_result,
+                "error": None,
+                "created_at": now,
+                "updated_at": now,
+                "finished_at": None
+            }
+            self.jobs[job["id"]] = job
+            if spec:
+                self.specs[job["id"]] = spec
+                self._save(job["id"])
+        self.executor.submit(self._run, job["id"], fn)
+        return job["id"]
+
+    def unfinished(self):
+        with self.condition:
+            return sum(job["status"] not in self.FINISHED for job in self.jobs.values())
+
+    def _path(self, job_id):
+        return os.path.join(self.store_dir, f"{job_id}.json")
+
+    def _save(self, job_id):
+        """Write a persisted job's state, replacing the previous file atomically (caller holds the lock)"""
+        if not self.store_dir or job_id not in self.specs:
+            return
+        task, payload = self.specs[job_id]
+        job = {key: value for key, value in self.jobs[job_id].items() if key != "finished_at"}
+        fd, temp_path = tempfile.mkstemp(dir=self.store_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(dumps_bytes({**job, "task": task, "payload": payload}))
+        os.replace(temp_path, self._path(job_id))
+
+    def _load(self, job_id):
+        """Stored state of a job, as last written by whichever process runs it"""
+        if not self.store_dir or not JOB_ID.match(job_id):
+            return None
+        try:
+            with open(self._path(job_id), "rb") as f:
+                stored = loads(f.read())
+        except (OSError, ValueError):
+            return None
+        stored.pop("task", None)
+        stored.pop("payload", None)
+        return {**stored, "finished_at": None}
+
+    def _claim(self, job_id):
+        """Lock a persisted job for this process, None when it must not run here
+
+        The lock is released by the OS if the process dies, so `resume`
+        elsewhere can take the job over. Returns the open lock file, or False
+        for jobs that need no claim.
+        """
+        if not self.store_dir or job_id not in self.specs or fcntl is None:
+            return False
+        lock = open(os.path.join(self.store_dir, f"{job_id}.lock"), "a")
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock.close()
+            return None
+        stored = self._load(job_id)
+        if stored is not None and stored["status"] in self.FINISHED:
+            lock.close()
+            return None
+        return lock
+
+    def resume(self):
+        """Load the persisted jobs, re-queueing those that had not finished, returns how many were re-queued"""
+        if not self.store_dir:
+            return 0
+        requeued = 0
+        for entry in os.scandir(self.store_dir):
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                with open(entry.path, "rb") as f:
+                    stored = loads(f.read())
+            except (OSError, ValueError) as e:
+                print(f"Skipping unreadable job file {entry.name}: {e}")
+                continue
+            task, payload = stored.pop("task"), stored.pop("payload")
+            if stored["id"] in self.jobs:
+                continue
+            if stored["status"] in self.FINISHED:
+                with self.condition:
+                    self.jobs[stored["id"]] = {**stored, "finished_at": time.monotonic()}
+                    self.specs[stored["id"]] = (task, payload)
+            elif task in self.tasks:
+                job = {**stored, "status": "pending", "finished_at": None}
+                self._submit(lambda task=task, payload=payload: self.tasks[task](payload), None,
+                             spec=(task, payload), job=job)
+                requeued += 1
+        return requeued
+
+    def _update(self, job_id, **fields):
+        with self.condition:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return
+            job.update(fields, updated_at=datetime.now(timezone.utc).isoformat())
+            if job["status"] in self.FINISHED:
+                job["finished_at"] = time.monotonic()
+            self._save(job_id)
+            self.condition.notify_all()
+
+    def _run(self, job_id, fn):
+        claim = self._claim(job_id)
+        if claim is None:
+            # Another process runs or ran it, its stored state is what `get` serves
+            with self.condition:
+                self.jobs.pop(job_id, None)
+                self.specs.pop(job_id, None)
+            return
+        try:
+            self._update(job_id, status="running")
+            try:
+                result = fn()
+            except Exception as e:
+                print(f"Background job {job_id} failed: {e}")
+                self._update(job_id, status="failed", error=str(e))
+            else:
+                self._update(job_id, status="completed", result=result)
+        finally:
+            if claim:
+                claim.close()
+
+    def _current(self, job_id):
+        """The job's state, for persisted jobs the stored one, which another process may be updating"""
+        job = self.jobs.get(job_id)
+        if self.store_dir and (job is None or job_id in self.specs):
+            stored = self._load(job_id)
+            if stored is not None:
+                return stored
+        return job
+
+    def get(self, job_id, wait=0):
+        """Return a copy of the job, waiting up to `wait` seconds for it to finish"""
+        deadline = time.monotonic() + wait
+        with self.condition:
+            while True:
+                job = self._current(job_id)
+                if job is None:
+                    return None
+                remaining = deadline - time.monotonic()
+                if job["status"] in self.FINISHED or remaining <= 0:
+                    return {key: value for key, value in job.items() if key != "finished_at"}
+                # Local updates notify, updates by other processes are picked up by re-reading the store
+                self.condition.wait(min(remaining, POLL_INTERVAL) if self.store_dir else remaining)
+
+    def _expire(self):
+        cutoff = time.monotonic() - self.ttl
+        with self.condition:
+            expired = [job_id for job_id, job in self.jobs.items()
+                       if job["finished_at"] is not None and job["finished_at"] < cutoff]
+            for job_id in expired:
+                del self.jobs[job_id]
+                if self.specs.pop(job_id, None) and self.store_dir:
+                    for path in (self._path(job_id), os.path.join(self.store_dir, f"{job_id}.lock")):
+                        try:
+                            os.remove(path)
+                        except OSError:
+                            pass
@@ -0,0 +1,62 @@
+import json
+from flask import current_app
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library encoder
+    orjson = None
+
+if orjson:
+    # Keep Flask's own handling of dates and dataclasses, everything else is native
+    ORJSON_OPTIONS = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+                      | orjson.OPT_PASSTHROUGH_DATACLASS)
+
+
+def dumps_bytes(obj, default=DefaultJSONProvider.default, indent=False):
+    """Serialize to compact UTF-8 JSON bytes"""
+    if orjson:
+        options = ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, default=default, option=options)
+    separators = None if indent else (",", ":")
+    return json.dumps(obj, default=default, sort_keys=True, indent=2 if indent else None,
+                      separators=separators).encode("utf-8")
+
+
+def loads(data):
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def is_valid_json(data):
+    """Whether the text or bytes parse as JSON"""
+    try:
+        loads(data)
+    except ValueError:  # orjson.JSONDecodeError and json.JSONDecodeError both subclass it
+        return False
+    return True
+
+
+def raw_json_response(content, status=200):
+    """Send JSON text that was already validated as-is, without re-serializing it"""
+    body = content.encode("utf-8") if isinstance(content, str) else content
+    return current_app.response_class(body, status=status, mimetype="application/json")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, writing response bodies straight to bytes"""
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(dumps_bytes(obj, default=self.default, indent=indent) + b"\n",
+                                        mimetype=self.mimetype)
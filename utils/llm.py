@@ -0,0 +1,109 @@
+import os
+import time
+from dotenv import load_dotenv
+from mistralai import Mistral
+from utils.json_provider import loads
+from utils.llm_scheduler import LLMScheduler, current_priority
+from utils.resilience import CircuitBreaker, call_with_resilience
+
+load_dotenv()  # Load environment variables from .env file
+api_key = os.getenv("MISTRAL_API_KEY")
+model = "mistral-large-latest"
+# Set to e.g. http://127.0.0.1:8765 to use the local stand-in from utils.mock_mistral_server
+server_url = os.getenv("MISTRAL_SERVER_URL") or None
+
+client = Mistral(api_key=api_key, server_url=server_url)
+
+# Seconds each endpoint may spend on its completion, retries included.
+# Override per endpoint with e.g. LLM_BUDGET_STRATEGIES=5
+LATENCY_BUDGETS = {
+    "dossier": 30.0,
+    "strategies": 10.0,
+    "messages": 8.0,
+    "analyze_document": 60.0,
+    "requirements": 20.0
+}
+DEFAULT_BUDGET = 30.0
+
+# Priority class of each endpoint's completions in the shared scheduler
+ENDPOINT_PRIORITIES = {
+    "messages": "interactive",
+    "strategies": "interactive",
+    "dossier": "standard",
+    "requirements": "standard",
+    "analyze_document": "bulk"
+}
+# Completion tokens reserved per call on top of the prompt estimate
+EXPECTED_OUTPUT_TOKENS = 600
+LLM_RETRIES = int(os.getenv("LLM_RETRIES", 2))
+BREAKER_COOLDOWN = float(os.getenv("LLM_BREAKER_COOLDOWN", 30))
+
+breakers = {}
+
+# Every completion from this process is admitted through this scheduler
+scheduler = LLMScheduler(requests_per_minute=float(os.getenv("MISTRAL_REQUESTS_PER_MINUTE", 120)),
+                         tokens_per_minute=float(os.getenv("MISTRAL_TOKENS_PER_MINUTE", 500000)),
+                         max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", 16)))
+
+
+def get_budget(endpoint):
+    return float(os.getenv(f"LLM_BUDGET_{endpoint.upper()}", LATENCY_BUDGETS.get(endpoint, DEFAULT_BUDGET)))
+
+
+def get_breaker(endpoint):
+    """Return the circuit breaker guarding completions for an endpoint"""
+    if endpoint not in breakers:
+        # Calls that use most of the budget count as slow
+        breakers.setdefault(endpoint, CircuitBreaker(endpoint,
+                                                     slow_call_seconds=get_budget(endpoint) * 0.8,
+                                                     cooldown=BREAKER_COOLDOWN))
+    return breakers[endpoint]
+
+
+for _endpoint in LATENCY_BUDGETS:
+    get_breaker(_endpoint)
+
+
+def estimate_text_tokens(text):
+    """Rough token count of a text, about four characters per token"""
+    return len(text) // 4
+
+
+def estimate_tokens(messages):
+    """Rough token estimate for a request, prompt plus the reserved completion"""
+    return sum(estimate_text_tokens(str(message.get("content", ""))) for message in messages) + EXPECTED_OUTPUT_TOKENS
+
+
+def chat_complete(messages, timeout_ms=None):
+    """Send one JSON-mode chat completion to Mistral AI and return the message content"""
+    chat_response = client.chat.complete(model=model, messages=messages, response_format={
+        "type": "json_object",
+    }, timeout_ms=timeout_ms)
+    return chat_response.choices[0].message.content
+
+
+def complete_json(endpoint, messages):
+    """Run a completion for an endpoint under its latency budget, retries and circuit breaker
+
+    Returns the JSON text from the model. Raises as soon as the breaker is open or
+    the budget is spent, so callers can serve their fallback straight away.
+    """
+    budget = get_budget(endpoint)
+    deadline = time.monotonic() + budget
+    priority = current_priority.get() or ENDPOINT_PRIORITIES.get(endpoint, "standard")
+    tokens = estimate_tokens(messages)
+
+    def attempt():
+        # Wait for a dispatch slot, but give up once the budget is spent
+        with scheduler.slot(priority, tokens, timeout=deadline - time.monotonic()):
+            # The HTTP request ends with the budget, freeing its thread and slot when the provider is slow
+            content = chat_complete(messages, timeout_ms=max(1, int((deadline - time.monotonic()) * 1000)))
+        loads(content)  # Malformed JSON counts as a failed call
+        return content
+
+    return call_with_resilience(get_breaker(endpoint), attempt, budget=budget, retries=LLM_RETRIES)
+
+
+def breaker_states():
+    """Snapshot of every circuit breaker for monitoring"""
+    return [breaker.snapshot() for breaker in breakers.values()]
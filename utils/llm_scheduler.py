@@ -0,0 +1,152 @@
+import contextvars
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from utils.rate_limiter import RateLimiter
+
+# Relative share of provider capacity each priority class gets when all are busy
+PRIORITY_WEIGHTS = {"interactive": 8, "standard": 3, "bulk": 1}
+
+# Priority class overriding the endpoint default for calls made in this context
+current_priority = contextvars.ContextVar("llm_priority", default=None)
+
+
+class QueueTimeoutError(TimeoutError):
+    """Raised when a request is not dispatched before its deadline"""
+
+
+@contextmanager
+def llm_priority(priority):
+    """Run the enclosed completions in the given priority class"""
+    token = current_priority.set(priority)
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
+
+
+class Ticket:
+
+    def __init__(self, priority, tokens, finish_tag):
+        self.priority = priority
+        self.tokens = tokens
+        self.finish_tag = finish_tag
+        self.enqueued_at = time.monotonic()
+        self.dispatched = False
+
+
+class LLMScheduler:
+    """Central admission control for outbound completions
+
+    Every completion waits here for a dispatch slot. Slots are granted in
+    weighted-fair order across priority classes, and only while both the
+    requests-per-minute and tokens-per-minute buckets have capacity and fewer
+    than `max_concurrency` calls are in flight.
+    """
+
+    def __init__(self, requests_per_minute, tokens_per_minute, max_concurrency=16, weights=None):
+        self.weights = dict(weights or PRIORITY_WEIGHTS)
+        self.request_bucket = RateLimiter(requests_per_minute)
+        # Allow a few seconds worth of tokens in one burst so large prompts can start
+        self.token_bucket = RateLimiter(tokens_per_minute, burst=max(1.0, tokens_per_minute / 60.0 * 5))
+        self.max_concurrency = max_concurrency
+
+        self.queues = {priority: deque() for priority in self.weights}
+        self.last_finish = {priority: 0.0 for priority in self.weights}
+        self.virtual_time = 0.0
+        self.in_flight = 0
+        self.condition = threading.Condition()
+
+        self.dispatched = {priority: 0 for priority in self.weights}
+        self.total_wait = {priority: 0.0 for priority in self.weights}
+        self.timeouts = {priority: 0 for priority in self.weights}
+
+    def _enqueue(self, priority, tokens):
+        # Weighted fair queueing: cost is the token estimate scaled down by the class weight
+        start = max(self.virtual_time, self.last_finish[priority])
+        finish_tag = start + tokens / self.weights[priority]
+        self.last_finish[priority] = finish_tag
+        ticket = Ticket(priority, tokens, finish_tag)
+        self.queues[priority].append(ticket)
+        return ticket
+
+    def _next_ticket(self):
+        heads = [queue[0] for queue in self.queues.values() if queue]
+        return min(heads, key=lambda ticket: ticket.finish_tag) if heads else None
+
+    def _dispatch_ready(self):
+        """Grant slots to queued tickets while capacity allows, returns seconds until the next try"""
+        while self.in_flight < self.max_concurrency:
+            ticket = self._next_ticket()
+            if ticket is None:
+                return None
+            wait = max(self.request_bucket.time_until(1), self.token_bucket.time_until(ticket.tokens))
+            if wait > 0:
+                return wait
+            self.request_bucket.try_acquire(1)
+            self.token_bucket.try_acquire(ticket.tokens)
+            self.queues[ticket.priority].popleft()
+            self.virtual_time = ticket.finish_tag
+            self.in_flight += 1
+            ticket.dispatched = True
+            self.dispatched[ticket.priority] += 1
+            self.total_wait[ticket.priority] += time.monotonic() - ticket.enqueued_at
+            self.condition.notify_all()
+        return None
+
+    def acquire(self, priority="standard", tokens=1, timeout=None):
+        """Block until a call of `tokens` estimated tokens may be sent"""
+        if priority not in self.queues:
+            priority = "standard"
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self.condition:
+            ticket = self._enqueue(priority, tokens)
+            while True:
+                retry_in = self._dispatch_ready()
+                if ticket.dispatched:
+                    return ticket
+
+                waits = [w for w in (retry_in, None if deadline is None else deadline - time.monotonic())
+                         if w is not None]
+                if deadline is not None and deadline - time.monotonic() <= 0:
+                    self.queues[priority].remove(ticket)
+                    self.timeouts[priority] += 1
+                    raise QueueTimeoutError(f"{priority} LLM request was not dispatched in time")
+                self.condition.wait(min(waits) if waits else None)
+
+    def release(self, ticket):
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    @contextmanager
+    def slot(self, priority="standard", tokens=1, timeout=None):
+        """Hold a dispatch slot for the duration of one provider call"""
+        ticket = self.acquire(priority, tokens, timeout)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    def metrics(self):
+        """Queue depths, throughput and bucket levels for monitoring"""
+        with self.condition:
+            return {
+                "in_flight": self.in_flight,
+                "max_concurrency": self.max_concurrency,
+                "request_tokens_available": round(self.request_bucket.available(), 2),
+                "llm_tokens_available": round(self.token_bucket.available()),
+                "classes": {
+                    priority: {
+                        "weight": self.weights[priority],
+                        "queue_depth": len(self.queues[priority]),
+                        "queued_tokens": sum(ticket.tokens for ticket in self.queues[priority]),
+                        "dispatched": self.dispatched[priority],
+                        "timeouts": self.timeouts[priority],
+                        "mean_queue_wait": self.total_wait[priority] / self.dispatched[priority]
+                                           if self.dispatched[priority] else 0.0
+                    } for priority in self.weights
+                }
+            }
@@ -10,7 +10,7 @@ class MistralAIClient:
 
     def __init__(self):
         self.api_key = os.getenv("MISTRAL_API_KEY")
-        self.api_url = "https://api.mistral.ai/v1"
+        self.api_url = f"{os.getenv('MISTRAL_SERVER_URL') or 'https://api.mistral.ai'}/v1"
 
         if not self.api_key:
             raise ValueError("MISTRAL_API_KEY not found in environment variables")
@@ -21,17 +21,17 @@ class MistralAIClient:
 
         data = {
             "model": "mistral-large-latest",  # or whatever model you're using
-            "prompt": prompt,
+            "messages": [{"role": "user", "content": prompt}],
             "max_tokens": max_tokens,
             "temperature": temperature
         }
 
-        response = requests.post(f"{self.api_url}/generate", headers=headers, json=data)
+        response = requests.post(f"{self.api_url}/chat/completions", headers=headers, json=data)
 
         if response.status_code != 200:
             raise Exception(f"Error from Mistral AI API: {response.text}")
 
-        return response.json()
+        return {"text": response.json()["choices"][0]["message"]["content"]}
 
     def analyze_supplier(self, supplier_data):
         """Analyze supplier information and provide insights"""
@@ -0,0 +1,255 @@
+"""Local stand-in for the Mistral chat-completions API
+
+Serves deterministic, prompt-templated completions with configurable latency,
+error rate and rate-limit responses, so the API can be tested and benchmarked
+offline. Point the app at it with MISTRAL_SERVER_URL=http://127.0.0.1:<port>.
+
+    python -m utils.mock_mistral_server --port 8765 --latency lognormal --median 1.5 --sigma 0.5
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MockConfig:
+    """Latency and fault-injection settings for the stand-in server"""
+
+    def __init__(self, latency="fixed", median=0.0, sigma=0.5, low=0.0, high=0.0, error_rate=0.0,
+                 rate_limit_rate=0.0, retry_after=1, stream_chunk_delay=0.0, seed=None):
+        self.latency = latency  # fixed, uniform or lognormal
+        self.median = median
+        self.sigma = sigma
+        self.low = low
+        self.high = high
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.stream_chunk_delay = stream_chunk_delay
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def sample_latency(self):
+        with self.lock:
+            if self.latency == "uniform":
+                return self.random.uniform(self.low, self.high)
+            if self.latency == "lognormal" and self.median > 0:
+                return self.random.lognormvariate(0, self.sigma) * self.median
+            return self.median
+
+    def sample_fault(self):
+        """Return 429, 500 or None for this request"""
+        with self.lock:
+            roll = self.random.random()
+        if roll < self.rate_limit_rate:
+            return 429
+        if roll < self.rate_limit_rate + self.error_rate:
+            return 500
+        return None
+
+
+def estimate_tokens(text):
+    return max(1, len(text) // 4)
+
+
+def prompt_seed(prompt):
+    return int(hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8], 16)
+
+
+def extract_supplier_name(prompt):
+    match = re.search(r"""['"]name['"]: ['"]([^'"]+)['"]""", prompt)
+    return match.group(1) if match else "the supplier"
+
+
+def template_response(prompt):
+    """Build a deterministic JSON payload matching the prompt's expected structure"""
+    lowered = prompt.lower()
+    rng = random.Random(prompt_seed(prompt))
+    supplier_name = extract_supplier_name(prompt)
+
+    if "dossier" in lowered:
+        return {
+            "supplier_name": supplier_name,
+            "key_contacts": [],
+            "previous_negotiations": [],
+            "suggested_strategies": ["Focus on volume discounts", "Negotiate payment terms extension"],
+            "pricing_insights": {
+                "current_pricing": 100.0,
+                "market_average": 95.0,
+                "suggested_target": 90.0
+            },
+            "swot_analysis": {
+                "strengths": ["Established relationship"],
+                "weaknesses": ["Limited price transparency"],
+                "opportunities": ["Volume consolidation"],
+                "threats": ["Market price volatility"]
+            },
+            "risk_assessment": "Low"
+        }
+    if "pricing strategist" in lowered:
+        return [{
+            "name": name,
+            "description": f"{name} with {supplier_name}",
+            "suggested_approach": f"Open with a {saving}% target and concede in small steps",
+            "expected_savings": f"{saving}%",
+            "confidence": "Medium"
+        } for name, saving in [("Volume Consolidation", rng.randint(3, 8)),
+                               ("Payment Terms Trade-off", rng.randint(2, 4)),
+                               ("Multi-year Commitment", rng.randint(5, 10))]]
+    if "email" in lowered:
+        return {
+            "subject": "Follow-up on our partnership",
+            "body": "Dear team,\n\nWe would like to discuss our upcoming requirements.\n\nBest regards,\nTacto Team",
+            "suggested_tone": "Professional and direct",
+            "key_points": ["Be specific about needs", "Include timeline expectations", "Reference past orders"]
+        }
+    if "compliance expert" in lowered:
+        return {
+            "identified_clauses": ["Confidentiality", "Termination"],
+            "compliance_concerns": ["No data breach notification procedure"],
+            "suggested_actions": ["Add a data processing agreement"],
+            "compliance_score": rng.randint(55, 90)
+        }
+    if "supplier selection" in lowered:
+        return {"suppliers": [{"name": supplier_name, "reasons": ["Matches the requested categories"]}]}
+    return {"response": "Mock response from the Mistral stand-in"}
+
+
+class MockMistralHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark and test output quiet
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/v1/chat/completions":
+            return self.send_json(404, {"message": f"Unknown endpoint {self.path}"})
+
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            return self.send_json(400, {"message": "Invalid JSON body"})
+
+        config = self.server.config
+        time.sleep(config.sample_latency())
+
+        fault = config.sample_fault()
+        if fault == 429:
+            return self.send_json(429, {"message": "Requests rate limit exceeded"},
+                                  headers={"Retry-After": str(config.retry_after)})
+        if fault == 500:
+            return self.send_json(500, {"message": "Internal server error"})
+
+        messages = request.get("messages", [])
+        prompt = "\n".join(str(m.get("content", "")) for m in messages)
+        payload = template_response(prompt)
+        json_mode = (request.get("response_format") or {}).get("type") == "json_object"
+        content = json.dumps(payload) if json_mode else json.dumps(payload, indent=2)
+
+        completion_id = uuid.uuid4().hex
+        model = request.get("model", "mistral-large-latest")
+        usage = {
+            "prompt_tokens": estimate_tokens(prompt),
+            "completion_tokens": estimate_tokens(content),
+            "total_tokens": estimate_tokens(prompt) + estimate_tokens(content)
+        }
+
+        if request.get("stream"):
+            return self.stream_completion(completion_id, model, content, usage)
+
+        self.send_json(200, {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content, "tool_calls": None},
+                "finish_reason": "stop"
+            }],
+            "usage": usage
+        })
+
+    def stream_completion(self, completion_id, model, content, usage):
+        """Send the completion as server-sent events, a few characters per chunk"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        pieces = [content[i:i + 16] for i in range(0, len(content), 16)]
+        for index, piece in enumerate(pieces):
+            last = index == len(pieces) - 1
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "delta": {"role": "assistant", "content": piece} if index == 0 else {"content": piece},
+                    "finish_reason": "stop" if last else None
+                }]
+            }
+            if last:
+                chunk["usage"] = usage
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            time.sleep(self.server.config.stream_chunk_delay)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+def start_mock_server(host="127.0.0.1", port=0, config=None):
+    """Start the stand-in in a background thread, returns (server, base_url)"""
+    server = ThreadingHTTPServer((host, port), MockMistralHandler)
+    server.daemon_threads = True
+    server.config = config or MockConfig()
+    threading.Thread(target=server.serve_forever, name="mock-mistral", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local Mistral chat-completions stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", choices=["fixed", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument("--median", type=float, default=1.5, help="Fixed or median latency in seconds")
+    parser.add_argument("--sigma", type=float, default=0.5, help="Spread of the lognormal latency")
+    parser.add_argument("--low", type=float, default=0.5, help="Lower bound of the uniform latency")
+    parser.add_argument("--high", type=float, default=3.0, help="Upper bound of the uniform latency")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--stream-chunk-delay", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    config = MockConfig(latency=args.latency, median=args.median, sigma=args.sigma, low=args.low, high=args.high,
+                        error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate,
+                        retry_after=args.retry_after, stream_chunk_delay=args.stream_chunk_delay, seed=args.seed)
+    server = ThreadingHTTPServer((args.host, args.port), MockMistralHandler)
+    server.config = config
+    print(f"Mock Mistral API listening on http://{args.host}:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+import bisect
+import math
+import threading
+from collections import defaultdict
+from datetime import date
+
+
+class SupplierNegotiationStats:
+    """Running summary of negotiation outcomes for one supplier"""
+
+    def __init__(self):
+        self.outcomes = 0
+        self.successes = 0
+        self.total_savings = 0.0
+        self.sorted_savings = []
+        self.last_outcome_date = None
+
+    def add(self, outcome):
+        self.outcomes += 1
+        if outcome.get("outcome") == "Success":
+            self.successes += 1
+        savings = outcome.get("savings")
+        if savings is not None:
+            self.total_savings += savings
+            bisect.insort(self.sorted_savings, savings)
+        outcome_date = outcome.get("date")
+        if outcome_date and (self.last_outcome_date is None or outcome_date > self.last_outcome_date):
+            self.last_outcome_date = outcome_date
+
+    def median_savings(self):
+        values = self.sorted_savings
+        if not values:
+            return None
+        middle = len(values) // 2
+        return values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2
+
+    def to_dict(self):
+        return {
+            "negotiations": self.outcomes,
+            "success_rate": self.successes / self.outcomes if self.outcomes else None,
+            "mean_savings": self.total_savings / len(self.sorted_savings) if self.sorted_savings else None,
+            "median_savings": self.median_savings(),
+            "last_outcome_date": self.last_outcome_date
+        }
+
+
+class NegotiationStore:
+    """In-memory negotiation history indexed by supplier ID and name
+
+    Outcomes come from each supplier's `negotiationHistory` and from completed
+    negotiation records. Summary stats are updated as records are added, so
+    every lookup is a dictionary access.
+    """
+
+    def __init__(self, suppliers=(), negotiations=()):
+        self.suppliers_by_id = {}
+        self.ids_by_name = {}
+        self.negotiations = defaultdict(list)  # supplier ID -> negotiation records
+        self.history = defaultdict(list)  # supplier ID -> outcomes, newest first
+        self.stats = defaultdict(SupplierNegotiationStats)
+        self.lock = threading.Lock()
+
+        for supplier in suppliers:
+            self.add_supplier(supplier)
+        for negotiation in negotiations:
+            self.add_negotiation(negotiation)
+
+    def _add_outcome(self, supplier_id, outcome):
+        """Insert an outcome already checked by normalize_outcome (caller holds the lock)"""
+        history = self.history[supplier_id]
+        # Keep history newest first, as in the supplier records
+        dates = [-_date_key(entry.get("date")) for entry in history]
+        history.insert(bisect.bisect_right(dates, -_date_key(outcome.get("date"))), outcome)
+        self.stats[supplier_id].add(outcome)
+
+    def add_supplier(self, supplier):
+        outcomes = [normalize_outcome(outcome) for outcome in supplier.get("negotiationHistory", [])]
+        with self.lock:
+            self.suppliers_by_id[supplier["id"]] = supplier
+            self.ids_by_name[supplier["name"]] = supplier["id"]
+            for outcome in outcomes:
+                self._add_outcome(supplier["id"], outcome)
+
+    def add_negotiation(self, negotiation):
+        """Index a negotiation record, counting its outcome once it has one
+
+        Raises ValueError for an unparseable date or savings figure, before
+        anything is stored.
+        """
+        outcome = None
+        if negotiation.get("outcome"):
+            outcome = normalize_outcome({
+                "date": negotiation.get("lastActivity") or negotiation.get("startDate"),
+                "outcome": negotiation["outcome"],
+                "savings": negotiation.get("actualSavings")
+            })
+        with self.lock:
+            supplier_id = negotiation.get("supplierId")
+            if supplier_id is None:
+                supplier_id = self.ids_by_name.get(negotiation.get("supplierName"))
+            if supplier_id is None:
+                supplier_id = negotiation.get("supplierName")
+            if negotiation.get("supplierName"):
+                self.ids_by_name.setdefault(negotiation["supplierName"], supplier_id)
+
+            self.negotiations[supplier_id].append(negotiation)
+            if outcome:
+                self._add_outcome(supplier_id, outcome)
+        return supplier_id
+
+    def resolve(self, supplier):
+        """Map a supplier ID or name to the ID used as index key"""
+        if supplier in self.suppliers_by_id or supplier in self.negotiations:
+            return supplier
+        if isinstance(supplier, str) and supplier.isdigit() and int(supplier) in self.suppliers_by_id:
+            return int(supplier)
+        return self.ids_by_name.get(supplier)
+
+    def supplier(self, supplier):
+        return self.suppliers_by_id.get(self.resolve(supplier))
+
+    def negotiations_for(self, supplier):
+        return list(self.negotiations.get(self.resolve(supplier), []))
+
+    def history_for(self, supplier):
+        return list(self.history.get(self.resolve(supplier), []))
+
+    def stats_for(self, supplier):
+        supplier_id = self.resolve(supplier)
+        if supplier_id not in self.stats:
+            return SupplierNegotiationStats().to_dict()
+        return self.stats[supplier_id].to_dict()
+
+
+def normalize_outcome(outcome):
+    """Copy of an outcome with its date as YYYY-MM-DD and its savings as a float, ValueError if either is invalid"""
+    outcome_date = outcome.get("date")
+    if outcome_date:
+        try:
+            # "2024-02-01T10:00:00Z" is the outcome of 2024-02-01
+            outcome_date = date.fromisoformat(str(outcome_date)[:10]).isoformat()
+        except ValueError:
+            raise ValueError(f"Invalid date: {outcome_date!r}")
+    savings = outcome.get("savings")
+    if savings is not None:
+        try:
+            if isinstance(savings, bool):
+                raise ValueError
+            # "3%" and 3 are the same savings
+            savings = float(savings.strip().rstrip("%") if isinstance(savings, str) else savings)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid savings: {savings!r}")
+        if not math.isfinite(savings):
+            raise ValueError(f"Invalid savings: {savings!r}")
+    return {**outcome, "date": outcome_date or None, "savings": savings}
+
+
+def _date_key(value):
+    """Sortable integer for a YYYY-MM-DD date, undated entries sort last"""
+    return int(value.replace("-", "")) if value else 0
@@ -0,0 +1,106 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import fitz
+
+# Documents with at least this many pages are split across the process pool
+PARALLEL_PAGE_THRESHOLD = int(os.getenv("PDF_PARALLEL_PAGE_THRESHOLD", 32))
+PDF_EXTRACTION_WORKERS = int(os.getenv("PDF_EXTRACTION_WORKERS", os.cpu_count() or 1))
+
+# MuPDF keeps decoded objects (images of scanned pages in particular) in a global store,
+# emptied every this many pages so memory stays flat on long documents
+PDF_STORE_FLUSH_PAGES = int(os.getenv("PDF_STORE_FLUSH_PAGES", 16))
+
+# Part of the document cache key, so upgrading PyMuPDF re-extracts cached documents
+EXTRACTOR_VERSION = f"pymupdf-{fitz.VersionBind}"
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Process pool shared by all requests, started on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Spawn rather than fork, the web server process has threads running
+            _pool = ProcessPoolExecutor(max_workers=PDF_EXTRACTION_WORKERS,
+                                        mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def open_document(source):
+    """Open a PDF from a file path, or from bytes held in memory"""
+    if isinstance(source, str):
+        return fitz.open(source, filetype="pdf")
+    return fitz.open(stream=source, filetype="pdf")
+
+
+def iter_pages(doc, start, stop):
+    """Yield the text of pages [start, stop) one at a time, so only one parsed page is held at once"""
+    for number in range(start, stop):
+        page = doc.load_page(number)
+        text = page.get_text("text")
+        del page
+        if (number - start + 1) % PDF_STORE_FLUSH_PAGES == 0:
+            fitz.TOOLS.store_shrink(100)
+        yield text
+
+
+def extract_page_range(source, start, stop):
+    """Text of pages [start, stop) of the PDF at a path or in bytes"""
+    with open_document(source) as doc:
+        return list(iter_pages(doc, start, stop))
+
+
+def page_window(page_count, pages=None):
+    """Clamp a zero-based (start, stop) page range to the document, stop None meaning the last page"""
+    start, stop = pages or (0, None)
+    stop = page_count if stop is None else min(stop, page_count)
+    if start >= page_count:
+        raise ValueError(f"The document only has {page_count} pages")
+    return start, stop
+
+
+def page_ranges(page_count, parts):
+    """Split pages into `parts` contiguous ranges of near equal size"""
+    size, extra = divmod(page_count, parts)
+    ranges, start = [], 0
+    for part in range(parts):
+        stop = start + size + (part < extra)
+        if stop > start:
+            ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def extract_pages(source, workers=None, pages=None):
+    """Text of the pages of a PDF (all, or the zero-based `pages` range), in page order
+
+    `source` is a file path or the document's bytes. Workers open a path
+    themselves, so large spooled uploads are never copied between processes.
+    """
+    workers = PDF_EXTRACTION_WORKERS if workers is None else workers
+    with open_document(source) as doc:
+        start, stop = page_window(doc.page_count, pages)
+        if workers <= 1 or stop - start < PARALLEL_PAGE_THRESHOLD:
+            return list(iter_pages(doc, start, stop))
+
+    ranges = page_ranges(stop - start, workers)
+    pool = get_pool()
+    futures = [pool.submit(extract_page_range, source, start + first, start + last) for first, last in ranges]
+    return [text for future in futures for text in future.result()]
+
+
+def extract_text(source, workers=None, pages=None):
+    """Extract the text of a PDF at a path or in bytes, one newline-terminated block per page"""
+    return "".join(f"{text}\n" for text in extract_pages(source, workers, pages))
+
+
+def extract_text_in_worker(source, pages=None):
+    """Extract a whole document in one pool process, for callers running many documents side by side"""
+    if PDF_EXTRACTION_WORKERS <= 1:
+        return extract_text(source, workers=1, pages=pages)
+    return get_pool().submit(extract_text, source, 1, pages).result()
@@ -0,0 +1,101 @@
+from datetime import date
+
+import numpy as np
+
+# Percentage points asked for on top of a supplier's historical discount, as in the fallback strategies
+DISCOUNT_UPLIFT = 2.0
+DEFAULT_DISCOUNT = 5.0
+DEFAULT_SCORE = 85.0
+
+# Days before contract expiry a renewal negotiation should open
+NEGOTIATION_LEAD_DAYS = 60
+
+# Urgency falls to zero this many days beyond the negotiation lead time
+URGENCY_HORIZON_DAYS = 180
+
+# Weights of the priority score components, summing to 1
+PRIORITY_WEIGHTS = {"savings": 0.5, "urgency": 0.35, "performance_gap": 0.15}
+
+
+def _column(suppliers, key, default):
+    return np.array([s.get(key) if s.get(key) is not None else default for s in suppliers], dtype=float)
+
+
+def _expiry(value):
+    """Contract expiry as a day, NaT when it is missing or not an ISO date"""
+    try:
+        return np.datetime64(date.fromisoformat(str(value)[:10]), "D")
+    except ValueError:
+        return np.datetime64("NaT", "D")
+
+
+def _savings_matrix(histories):
+    """Pad per-supplier savings lists into one (suppliers x outcomes) array with NaN gaps"""
+    width = max((len(history) for history in histories), default=0)
+    matrix = np.full((len(histories), max(width, 1)), np.nan)
+    for row, history in enumerate(histories):
+        matrix[row, :len(history)] = history
+    return matrix
+
+
+def _normalize(values):
+    spread = values.max() - values.min() if values.size else 0
+    return (values - values.min()) / spread if spread else np.zeros_like(values)
+
+
+def plan_portfolio(suppliers, histories, as_of, lead_days=NEGOTIATION_LEAD_DAYS, horizon_days=URGENCY_HORIZON_DAYS):
+    """Score every supplier in one vectorized pass and return the ranked negotiation calendar
+
+    `histories` holds, for each supplier, its list of past outcomes as
+    {"outcome", "savings"} dicts. `as_of` is the planning date as an ISO string.
+    """
+    if not suppliers:
+        return []
+
+    discount = _column(suppliers, "averageDiscount", DEFAULT_DISCOUNT)
+    quality = _column(suppliers, "qualityScore", DEFAULT_SCORE)
+    reliability = _column(suppliers, "reliabilityScore", DEFAULT_SCORE)
+
+    savings = _savings_matrix([[o["savings"] for o in h if o.get("savings") is not None] for h in histories])
+    has_history = ~np.isnan(savings).all(axis=1)
+    historical_savings = np.nanmean(np.where(has_history[:, None], savings, 0.0), axis=1)
+    outcomes = np.array([len(h) for h in histories], dtype=float)
+    successes = np.array([sum(o.get("outcome") == "Success" for o in h) for h in histories], dtype=float)
+    success_rate = np.divide(successes, outcomes, out=np.ones_like(outcomes), where=outcomes > 0)
+
+    # Blend the fallback ask with what negotiations actually achieved, discounted by how often they succeed
+    target = discount + DISCOUNT_UPLIFT
+    expected_savings = np.where(has_history, (target + historical_savings) / 2, target) * (0.5 + 0.5 * success_rate)
+
+    # Renewal urgency rises linearly as expiry approaches, lapsed contracts are most urgent.
+    # An unparseable expiry counts as none and is flagged in the entry
+    expiry = np.array([_expiry(s.get("contractExpiry")) for s in suppliers], dtype="datetime64[D]")
+    invalid_expiry = np.isnat(expiry) & np.array([bool(s.get("contractExpiry")) for s in suppliers])
+    days_to_expiry = (expiry - np.datetime64(as_of, "D")).astype(float)
+    days_to_expiry[np.isnat(expiry)] = np.nan
+    urgency = np.nan_to_num(np.clip(1 - (days_to_expiry - lead_days) / horizon_days, 0, 1), nan=0.0)
+
+    # Weaker quality and reliability give more room to negotiate
+    performance_gap = (100 - (quality + reliability) / 2) / 100
+
+    priority = (PRIORITY_WEIGHTS["savings"] * _normalize(expected_savings)
+                + PRIORITY_WEIGHTS["urgency"] * urgency
+                + PRIORITY_WEIGHTS["performance_gap"] * _normalize(performance_gap))
+
+    start = np.where(np.isnat(expiry), np.datetime64(as_of, "D"),
+                     np.maximum(expiry - np.timedelta64(lead_days, "D"), np.datetime64(as_of, "D")))
+
+    order = np.lexsort((np.nan_to_num(days_to_expiry, nan=np.inf), -priority))
+    return [{
+        "rank": rank,
+        "supplier_id": suppliers[i]["id"],
+        "supplier_name": suppliers[i]["name"],
+        "category": suppliers[i].get("category"),
+        "contract_expiry": suppliers[i].get("contractExpiry"),
+        "days_to_expiry": None if np.isnan(days_to_expiry[i]) else int(days_to_expiry[i]),
+        "invalid_expiry": bool(invalid_expiry[i]),
+        "recommended_start": str(start[i]),
+        "expected_savings": round(float(expected_savings[i]), 2),
+        "urgency": round(float(urgency[i]), 3),
+        "priority_score": round(float(priority[i]), 3)
+    } for rank, i in enumerate(order, start=1)]
@@ -0,0 +1,58 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """Thread-safe token bucket limiting how much can be consumed per minute"""
+
+    def __init__(self, rate_per_minute, burst=None):
+        self.rate = rate_per_minute / 60.0
+        # By default allow up to one second worth of tokens to be used at once
+        self.capacity = float(burst) if burst else max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def time_until(self, tokens=1):
+        """Seconds until `tokens` could be consumed, without consuming them"""
+        tokens = min(tokens, self.capacity)
+        with self.lock:
+            self._refill()
+            return max(0.0, (tokens - self.tokens) / self.rate)
+
+    def try_acquire(self, tokens=1):
+        """Consume `tokens` if available now, otherwise return the seconds to wait"""
+        # Requests larger than the bucket would never fit, charge a full bucket instead
+        tokens = min(tokens, self.capacity)
+        with self.lock:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0.0
+            return (tokens - self.tokens) / self.rate
+
+    def acquire(self, tokens=1, timeout=None):
+        """Block until `tokens` are available, returns False if `timeout` seconds pass first"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0:
+                return True
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    def available(self):
+        with self.lock:
+            self._refill()
+            return self.tokens
@@ -0,0 +1,176 @@
+import threading
+
+import numpy as np
+
+# Supplier categories that put a supplier in a regulation's industry, besides the industry name itself
+INDUSTRY_CATEGORIES = {
+    "manufacturing": {
+        "manufacturing", "raw materials", "chemicals", "industrial chemicals", "metals", "specialty metals",
+        "industrial polymers", "electronics", "electronic components", "hardware", "semiconductors"
+    },
+    "electronics": {"electronics", "electronic components", "semiconductors", "hardware"}
+}
+
+# Regulation regions, by the countries they cover
+REGION_COUNTRIES = {
+    "EU": {
+        "austria", "belgium", "bulgaria", "croatia", "cyprus", "czech republic", "czechia", "denmark", "estonia",
+        "finland", "france", "germany", "greece", "hungary", "ireland", "italy", "latvia", "lithuania", "luxembourg",
+        "malta", "netherlands", "poland", "portugal", "romania", "slovakia", "slovenia", "spain", "sweden"
+    },
+    "USA": {"usa", "united states", "us"}
+}
+
+# Regulations with this region apply wherever a supplier operates
+GLOBAL_REGION = "global"
+
+
+def supplier_profile(supplier):
+    """Industries and regulation regions of a supplier, from `categories`/`category` and `locations`/`location`"""
+    categories = {category.lower() for category in supplier.get("categories") or []}
+    for key in ("category", "subcategory"):
+        if supplier.get(key):
+            categories.add(supplier[key].lower())
+    industries = categories | {industry for industry, members in INDUSTRY_CATEGORIES.items() if categories & members}
+
+    # "Berlin, Germany" is in Germany
+    places = {location.split(",")[-1].strip().lower() for location in supplier.get("locations") or []}
+    if supplier.get("location"):
+        places.add(supplier["location"].split(",")[-1].strip().lower())
+    regions = {region for region, countries in REGION_COUNTRIES.items() if places & countries}
+    return industries, regions
+
+
+def applies(regulation, profile):
+    industries, regions = profile
+    industry = regulation.get("industry", "all").lower()
+    regulation_regions = set(regulation.get("regions", [GLOBAL_REGION]))
+    return ((industry == "all" or industry in industries) and
+            (GLOBAL_REGION in regulation_regions or bool(regulation_regions & regions)))
+
+
+class ApplicabilityMatrix:
+    """Which regulations apply to which suppliers, as a boolean matrix of suppliers x regulations
+
+    Each regulation is a boolean column over the suppliers, so "the suppliers
+    needing REACH and RoHS evidence" is an AND across two columns and "every
+    regulation for a supplier" is one row. Adding or changing a supplier
+    recomputes only its row, adding a regulation only its column.
+    """
+
+    def __init__(self, regulations=(), suppliers=()):
+        self.regulations = []
+        self.columns = {}  # regulation name or ID -> column
+        self.supplier_ids = []  # row -> supplier ID, None for a free row
+        self.rows = {}  # supplier ID -> row
+        self.profiles = []  # row -> supplier profile
+        self.fingerprints = {}  # supplier ID -> profile the row was computed from
+        self.free_rows = []  # rows of removed suppliers, reused first
+        self.matrix = np.zeros((0, 0), dtype=bool)
+        self.active = np.zeros(0, dtype=bool)
+        self.lock = threading.Lock()
+
+        for regulation in regulations:
+            self.upsert_regulation(regulation)
+        for supplier in suppliers:
+            self.upsert_supplier(supplier)
+
+    def _grow(self, rows, columns):
+        """Make room for at least `rows` x `columns`, doubling so repeated additions are amortized O(1)"""
+        capacity_rows, capacity_columns = self.matrix.shape
+        if rows <= capacity_rows and columns <= capacity_columns:
+            return
+        grown = np.zeros((max(rows, 2 * capacity_rows), max(columns, 2 * capacity_columns)), dtype=bool)
+        grown[:capacity_rows, :capacity_columns] = self.matrix
+        self.matrix = grown
+        active = np.zeros(grown.shape[0], dtype=bool)
+        active[:len(self.active)] = self.active
+        self.active = active
+
+    def upsert_regulation(self, regulation):
+        """Add a regulation or replace the one with the same name, recomputing its column"""
+        with self.lock:
+            column = self.columns.get(regulation["name"])
+            if column is None:
+                column = len(self.regulations)
+                self.regulations.append(regulation)
+                self._grow(len(self.supplier_ids), column + 1)
+            else:
+                self.regulations[column] = regulation
+            self.columns[regulation["name"]] = column
+            if regulation.get("id"):
+                self.columns[regulation["id"]] = column
+            self.matrix[:len(self.profiles), column] = [profile is not None and applies(regulation, profile)
+                                                        for profile in self.profiles]
+
+    def upsert_supplier(self, supplier):
+        """Add or update a supplier, recomputing its row only when its categories or locations changed"""
+        profile = supplier_profile(supplier)
+        with self.lock:
+            row = self.rows.get(supplier["id"])
+            if row is not None and self.fingerprints[supplier["id"]] == profile:
+                return False
+            if row is None:
+                if self.free_rows:
+                    row = self.free_rows.pop()
+                else:
+                    row = len(self.supplier_ids)
+                    self.supplier_ids.append(None)
+                    self.profiles.append(None)
+                    self._grow(row + 1, len(self.regulations))
+            self.supplier_ids[row] = supplier["id"]
+            self.profiles[row] = profile
+            self.rows[supplier["id"]] = row
+            self.fingerprints[supplier["id"]] = profile
+            self.matrix[row, :len(self.regulations)] = [applies(regulation, profile) for regulation in self.regulations]
+            self.active[row] = True
+            return True
+
+    def remove_supplier(self, supplier_id):
+        with self.lock:
+            row = self.rows.pop(supplier_id, None)
+            if row is None:
+                return False
+            del self.fingerprints[supplier_id]
+            self.supplier_ids[row] = None
+            self.profiles[row] = None
+            self.matrix[row] = False
+            self.active[row] = False
+            self.free_rows.append(row)
+            return True
+
+    def sync(self, suppliers):
+        """Bring the matrix in line with the current supplier list, returns how many rows changed"""
+        suppliers = list(suppliers)
+        changed = sum(self.upsert_supplier(supplier) for supplier in suppliers)
+        current = {supplier["id"] for supplier in suppliers}
+        return changed + sum(self.remove_supplier(supplier_id) for supplier_id in list(self.rows)
+                             if supplier_id not in current)
+
+    def _column_indexes(self, regulations):
+        unknown = [name for name in regulations if name not in self.columns]
+        if unknown:
+            raise KeyError(f"Unknown regulations: {', '.join(map(str, unknown))}")
+        return [self.columns[name] for name in regulations]
+
+    def suppliers_for(self, regulations, match="all"):
+        """IDs of the suppliers that all (or with match="any", at least one) of `regulations` apply to"""
+        with self.lock:
+            columns = self.matrix[:, self._column_indexes(regulations)]
+            hits = columns.all(axis=1) if match == "all" else columns.any(axis=1)
+            return [self.supplier_ids[row] for row in np.flatnonzero(hits & self.active)]
+
+    def regulations_for(self, supplier_id):
+        """Names of the regulations that apply to a supplier, None for an unknown supplier"""
+        with self.lock:
+            row = self.rows.get(supplier_id)
+            if row is None:
+                return None
+            return [self.regulations[column]["name"]
+                    for column in np.flatnonzero(self.matrix[row, :len(self.regulations)])]
+
+    def counts(self):
+        """Number of suppliers each regulation applies to"""
+        with self.lock:
+            totals = self.matrix[self.active, :len(self.regulations)].sum(axis=0)
+            return {regulation["name"]: int(total) for regulation, total in zip(self.regulations, totals)}
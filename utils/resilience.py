@@ -0,0 +1,165 @@
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from utils.llm_scheduler import QueueTimeoutError
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the provider while a circuit breaker is open"""
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when a call does not finish within its latency budget"""
+
+
+class CircuitBreaker:
+    """Rolling-window circuit breaker that trips on error rate or slow-call rate"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name, window=20, min_calls=5, error_rate_threshold=0.5, slow_call_seconds=10.0,
+                 slow_rate_threshold=0.5, cooldown=30.0):
+        self.name = name
+        self.min_calls = min_calls
+        self.error_rate_threshold = error_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_rate_threshold = slow_rate_threshold
+        self.cooldown = cooldown
+
+        self.calls = deque(maxlen=window)  # (succeeded, latency) of the most recent calls
+        self.state = self.CLOSED
+        self.opened_at = None
+        self.probe_in_flight = False
+        self.times_opened = 0
+        self.lock = threading.Lock()
+
+    def allow_request(self):
+        """Whether a call may go to the provider right now"""
+        with self.lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.cooldown:
+                    return False
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN:
+                # Let a single probe through to test whether the provider recovered
+                if self.probe_in_flight:
+                    return False
+                self.probe_in_flight = True
+            return True
+
+    def record_success(self, latency):
+        with self.lock:
+            if self.state == self.HALF_OPEN:
+                self.probe_in_flight = False
+                if latency >= self.slow_call_seconds:
+                    self._open()
+                else:
+                    self.state = self.CLOSED
+                    self.calls.clear()
+                return
+            self.calls.append((True, latency))
+            self._check_thresholds()
+
+    def record_failure(self, latency):
+        with self.lock:
+            if self.state == self.HALF_OPEN:
+                self.probe_in_flight = False
+                self._open()
+                return
+            self.calls.append((False, latency))
+            self._check_thresholds()
+
+    def record_skipped(self):
+        """A call that never reached the provider, it counts neither as a success nor as a failure"""
+        with self.lock:
+            if self.state == self.HALF_OPEN:
+                self.probe_in_flight = False
+
+    def _check_thresholds(self):
+        if self.state != self.CLOSED or len(self.calls) < self.min_calls:
+            return
+        error_rate = sum(1 for succeeded, _ in self.calls if not succeeded) / len(self.calls)
+        slow_rate = sum(1 for _, latency in self.calls if latency >= self.slow_call_seconds) / len(self.calls)
+        if error_rate >= self.error_rate_threshold or slow_rate >= self.slow_rate_threshold:
+            self._open()
+
+    def _open(self):
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+
+    def snapshot(self):
+        """Current breaker state for monitoring"""
+        with self.lock:
+            total = len(self.calls)
+            failures = sum(1 for succeeded, _ in self.calls if not succeeded)
+            slow = sum(1 for _, latency in self.calls if latency >= self.slow_call_seconds)
+            latencies = sorted(latency for _, latency in self.calls)
+            return {
+                "name": self.name,
+                "state": self.state,
+                "window_calls": total,
+                "error_rate": failures / total if total else 0.0,
+                "slow_rate": slow / total if total else 0.0,
+                "median_latency": latencies[total // 2] if total else None,
+                "times_opened": self.times_opened,
+                "retry_in": max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+                            if self.state == self.OPEN else 0.0
+            }
+
+
+# Calls run on this pool so callers can stop waiting once their budget is spent
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="llm-call")
+
+
+def call_with_resilience(breaker, fn, budget, retries=2, base_delay=0.25):
+    """Call fn() within `budget` seconds, retrying with jittered backoff behind a circuit breaker
+
+    Raises CircuitOpenError straight away while the breaker is open, and
+    DeadlineExceededError or the last error once the budget or retries run out.
+    The deadline only stops the wait here, so fn should bound its own provider
+    call by the remaining budget. Time spent queueing, in this pool or as a
+    QueueTimeoutError from the LLM scheduler, is not held against the provider.
+    """
+    deadline = time.monotonic() + budget
+    last_error = None
+
+    for attempt in range(retries + 1):
+        if not breaker.allow_request():
+            raise CircuitOpenError(f"Circuit '{breaker.name}' is open")
+
+        remaining = deadline - time.monotonic()
+        started = time.monotonic()
+        future = _executor.submit(fn)
+        try:
+            result = future.result(timeout=max(remaining, 0))
+        except QueueTimeoutError:
+            # Caught first, as it is a TimeoutError and so, from Python 3.11, a FutureTimeoutError too
+            breaker.record_skipped()
+            raise
+        except FutureTimeoutError:
+            # A call still queued in the pool never started, so it says nothing about the provider
+            if future.cancel():
+                breaker.record_skipped()
+            else:
+                breaker.record_failure(time.monotonic() - started)
+            raise DeadlineExceededError(f"'{breaker.name}' exceeded its {budget:.1f}s budget")
+        except Exception as e:
+            breaker.record_failure(time.monotonic() - started)
+            last_error = e
+        else:
+            breaker.record_success(time.monotonic() - started)
+            return result
+
+        # Full jitter backoff, but never sleep past the deadline
+        delay = random.uniform(0, base_delay * (2 ** attempt))
+        if attempt == retries or time.monotonic() + delay >= deadline:
+            break
+        time.sleep(delay)
+
+    raise last_error
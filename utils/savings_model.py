@@ -0,0 +1,189 @@
+"""Ridge regression predicting negotiated savings from supplier features
+
+Trained offline on the `negotiationHistory` outcomes in api/mock_data.json and
+persisted as a small JSON artifact. Scoring is a dot product, so the strategies
+endpoints can quote data-driven expected savings without an LLM call.
+
+    python -m utils.savings_model train [--alpha 1.0]
+    python -m utils.savings_model report
+"""
+import argparse
+import json
+import os
+from datetime import datetime, timezone
+from functools import lru_cache
+
+import numpy as np
+
+MODEL_VERSION = 1
+MODEL_PATH = os.getenv("SAVINGS_MODEL_PATH",
+                       os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models",
+                                    "savings_model.json"))
+DEFAULT_ALPHA = 1.0
+
+PRICING_TIERS = {"Economy": 0.0, "Standard": 1.0, "Premium": 2.0}
+RISK_LEVELS = {"low": 0.0, "medium": 1.0, "high": 2.0}
+
+FEATURES = ["averageDiscount", "qualityScore", "reliabilityScore", "deliveryScore", "rating", "profitMargin",
+            "pricingTier", "riskLevel", "success"]
+DEFAULTS = {"averageDiscount": 5.0, "qualityScore": 85.0, "reliabilityScore": 85.0, "deliveryScore": 85.0,
+            "rating": 4.5, "profitMargin": 20.0}
+
+
+def supplier_features(supplier, success=1.0):
+    """Feature vector for a supplier, `success` is 1 for a successful outcome and 0 for a partial one"""
+    values = [float(supplier.get(name) if supplier.get(name) is not None else DEFAULTS[name])
+              for name in FEATURES[:6]]
+    risks = [RISK_LEVELS.get(risk.get("level"), 0.0) for risk in supplier.get("riskFactors", [])]
+    values.append(PRICING_TIERS.get(supplier.get("currentPricing"), 1.0))
+    values.append(sum(risks) / len(risks) if risks else 0.0)
+    values.append(float(success))
+    return values
+
+
+def training_set(suppliers):
+    """One row per historical outcome with recorded savings"""
+    rows, targets = [], []
+    for supplier in suppliers:
+        for outcome in supplier.get("negotiationHistory", []):
+            if outcome.get("savings") is None:
+                continue
+            rows.append(supplier_features(supplier, outcome.get("outcome") == "Success"))
+            targets.append(outcome["savings"])
+    return np.array(rows, dtype=float), np.array(targets, dtype=float)
+
+
+def fit(X, y, alpha=DEFAULT_ALPHA):
+    """Closed-form ridge regression on standardized features, returns (mean, scale, coef, intercept)"""
+    mean = X.mean(axis=0)
+    scale = X.std(axis=0)
+    scale[scale == 0] = 1.0
+    Z = (X - mean) / scale
+    intercept = y.mean()
+    coef = np.linalg.solve(Z.T @ Z + alpha * np.eye(Z.shape[1]), Z.T @ (y - intercept))
+    return mean, scale, coef, intercept
+
+
+def leave_one_out(X, y, alpha=DEFAULT_ALPHA):
+    """Held-out prediction for every row"""
+    predictions = np.empty_like(y)
+    for i in range(len(y)):
+        keep = np.arange(len(y)) != i
+        mean, scale, coef, intercept = fit(X[keep], y[keep], alpha)
+        predictions[i] = intercept + ((X[i] - mean) / scale) @ coef
+    return predictions
+
+
+def _errors(actual, predicted):
+    residuals = actual - predicted
+    return {"mae": round(float(np.abs(residuals).mean()), 3),
+            "rmse": round(float(np.sqrt((residuals ** 2).mean())), 3)}
+
+
+def train(suppliers, alpha=DEFAULT_ALPHA):
+    """Fit the model on all outcomes and return the artifact with its leave-one-out report"""
+    X, y = training_set(suppliers)
+    mean, scale, coef, intercept = fit(X, y, alpha)
+    held_out = leave_one_out(X, y, alpha)
+    # Baselines: the overall mean, and the supplier's historical averageDiscount
+    baselines = {
+        "mean": _errors(y, np.array([np.delete(y, i).mean() for i in range(len(y))])),
+        "average_discount": _errors(y, X[:, FEATURES.index("averageDiscount")])
+    }
+    return {
+        "version": MODEL_VERSION,
+        "trained_at": datetime.now(timezone.utc).isoformat(),
+        "alpha": alpha,
+        "features": FEATURES,
+        "mean": mean.round(6).tolist(),
+        "scale": scale.round(6).tolist(),
+        "coef": coef.round(6).tolist(),
+        "intercept": round(float(intercept), 6),
+        "success_rate": round(float(X[:, FEATURES.index("success")].mean()), 4),
+        "report": {"samples": int(len(y)), "leave_one_out": _errors(y, held_out), "baselines": baselines}
+    }
+
+
+class SavingsModel:
+    """Scores a loaded artifact with plain Python arithmetic"""
+
+    def __init__(self, artifact):
+        if artifact.get("version") != MODEL_VERSION or artifact.get("features") != FEATURES:
+            raise ValueError("Savings model artifact does not match this code, retrain it")
+        self.artifact = artifact
+        # Fold standardization into the weights so scoring is a single dot product
+        self.weights = [c / s for c, s in zip(artifact["coef"], artifact["scale"])]
+        self.bias = artifact["intercept"] - sum(w * m for w, m in zip(self.weights, artifact["mean"]))
+        self.rmse = artifact["report"]["leave_one_out"]["rmse"]
+        self.success_rate = artifact["success_rate"]
+
+    def score(self, features):
+        return self.bias + sum(w * x for w, x in zip(self.weights, features))
+
+    def predict(self, supplier, success_rate=None):
+        """Expected savings in percent, weighting success and partial outcomes by `success_rate`"""
+        features = supplier_features(supplier, success=1.0)
+        on_success = self.score(features)
+        features[-1] = 0.0
+        on_partial = self.score(features)
+        rate = self.success_rate if success_rate is None else success_rate
+        expected = max(0.0, rate * on_success + (1 - rate) * on_partial)
+        return {
+            "expected": round(expected, 1),
+            "low": round(max(0.0, expected - self.rmse), 1),
+            "high": round(expected + self.rmse, 1),
+            "on_success": round(on_success, 1)
+        }
+
+
+def save(artifact, path=MODEL_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(artifact, f, separators=(",", ":"))
+
+
+@lru_cache(maxsize=1)
+def load_model(path=MODEL_PATH):
+    """Load the persisted model once, training in memory if the artifact is missing"""
+    try:
+        with open(path) as f:
+            return SavingsModel(json.load(f))
+    except (OSError, ValueError) as e:
+        print(f"Savings model unavailable ({e}), training from mock data")
+        return SavingsModel(train(_mock_suppliers()))
+
+
+def _mock_suppliers():
+    from api.mock_data import load_mock_data
+    data = load_mock_data()
+    return data.get("suppliers", []) + data.get("possible_suppliers_data", [])
+
+
+def print_report(artifact):
+    report = artifact["report"]
+    print(f"Samples: {report['samples']}  alpha: {artifact['alpha']}")
+    print(f"{'model':<28}{'MAE':>8}{'RMSE':>8}")
+    print(f"{'ridge (leave-one-out)':<28}{report['leave_one_out']['mae']:>8}{report['leave_one_out']['rmse']:>8}")
+    for name, errors in report["baselines"].items():
+        print(f"{'baseline: ' + name:<28}{errors['mae']:>8}{errors['rmse']:>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["train", "report"])
+    parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA, help="Ridge regularization strength")
+    parser.add_argument("--output", default=MODEL_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "train":
+        artifact = train(_mock_suppliers(), alpha=args.alpha)
+        save(artifact, args.output)
+        print(f"Saved savings model to {args.output}")
+    else:
+        with open(args.output) as f:
+            artifact = json.load(f)
+    print_report(artifact)
+
+
+if __name__ == '__main__':
+    main()
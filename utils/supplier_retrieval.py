@@ -0,0 +1,166 @@
+import math
+import re
+from collections import Counter
+
+import numpy as np
+
+TOKEN = re.compile(r"[a-z0-9]+")
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it", "of", "on", "or", "our", "that",
+    "the", "to", "we", "with", "need", "needs", "looking", "supplier", "suppliers", "who", "can", "should", "must"
+}
+
+# "rating above 4.5", "sustainability score of at least 90", "price under 30"
+NUMERIC_CONSTRAINT = re.compile(
+    r"\b(rating|sustainability(?:\s+score)?|price)\s+(?:of\s+|is\s+)?"
+    r"(above|over|more than|at least|min(?:imum)?|>=|>|below|under|less than|at most|max(?:imum)?|<=|<)\s*"
+    r"\$?(\d+(?:\.\d+)?)", re.I)
+CONSTRAINT_FIELDS = {"rating": "rating", "sustainability": "sustainability_score", "price": "avg_price"}
+LOWER_BOUNDS = {"above", "over", "more than", ">", "at least", "min", "minimum", ">="}
+STRICT = {"above", "over", "more than", ">", "below", "under", "less than", "<"}
+
+# Weight of exact category and location mentions on top of text similarity
+CATEGORY_BOOST = 0.5
+LOCATION_BOOST = 0.25
+
+# Fields carried to the LLM for each candidate, contacts and the like are dropped
+COMPACT_FIELDS = ["id", "name", "description", "categories", "locations", "rating", "avg_price", "sustainability_score"]
+
+
+def tokenize(text):
+    """Lowercase words without stopwords, with a plural "s" stripped"""
+    tokens = []
+    for token in TOKEN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        tokens.append(token[:-1] if len(token) > 3 and token.endswith("s") and not token.endswith("ss") else token)
+    return tokens
+
+
+def supplier_text(supplier):
+    parts = [supplier.get("name", ""), supplier.get("description", "")]
+    parts += supplier.get("categories", []) + supplier.get("locations", [])
+    return " ".join(parts)
+
+
+def parse_constraints(text):
+    """Numeric filters from the requirements as (field, operator, value) tuples"""
+    constraints = []
+    for match in NUMERIC_CONSTRAINT.finditer(text):
+        field = CONSTRAINT_FIELDS[match.group(1).split()[0].lower()]
+        operator = match.group(2).lower()
+        constraints.append((field, operator, float(match.group(3))))
+    return constraints
+
+
+def constraint_mask(values, operator, value):
+    """Boolean mask of the catalog rows meeting one numeric constraint, missing values never do"""
+    with np.errstate(invalid="ignore"):
+        if operator in LOWER_BOUNDS:
+            return values > value if operator in STRICT else values >= value
+        return values < value if operator in STRICT else values <= value
+
+
+def compact(supplier):
+    return {field: supplier[field] for field in COMPACT_FIELDS if field in supplier}
+
+
+class SupplierIndex:
+    """TF-IDF index over the supplier catalog for picking match candidates without an LLM call
+
+    Suppliers are stored as an inverted index: for every token, the rows of
+    the suppliers using it and their L2-normalized TF-IDF weights, laid out
+    CSR style in flat arrays. Scoring a query touches only the postings of its
+    own tokens, and memory grows with the text in the catalog rather than
+    with suppliers x vocabulary.
+    """
+
+    def __init__(self, suppliers):
+        self.suppliers = list(suppliers)
+        documents = [Counter(tokenize(supplier_text(supplier))) for supplier in self.suppliers]
+        vocabulary = sorted({token for document in documents for token in document})
+        self.vocabulary = {token: column for column, token in enumerate(vocabulary)}
+
+        document_frequency = Counter(token for document in documents for token in document)
+        self.idf = np.array([math.log((1 + len(documents)) / (1 + document_frequency[token])) + 1
+                             for token in vocabulary])
+
+        rows, columns, weights = [], [], []
+        for row, document in enumerate(documents):
+            document_columns = [self.vocabulary[token] for token in document]
+            document_weights = np.array(list(document.values()), dtype=float) * self.idf[document_columns]
+            norm = np.linalg.norm(document_weights)
+            rows.extend([row] * len(document_columns))
+            columns.extend(document_columns)
+            weights.extend(document_weights / (norm or 1))
+        order = np.argsort(np.array(columns, dtype=np.int64), kind="stable")
+        self.posting_rows = np.array(rows, dtype=np.int64)[order]
+        self.posting_weights = np.array(weights, dtype=float)[order]
+        # Postings of column c are posting_rows[posting_starts[c]:posting_starts[c + 1]]
+        self.posting_starts = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(np.array(columns, dtype=np.int64), minlength=len(vocabulary)),
+                  out=self.posting_starts[1:])
+
+        # Rows offering each category and operating in each location named in the catalog
+        self.categories = self._membership("categories")
+        self.locations = self._membership("locations")
+        self.numeric = {field: np.array([supplier.get(field) if supplier.get(field) is not None else np.nan
+                                         for supplier in self.suppliers], dtype=float)
+                        for field in CONSTRAINT_FIELDS.values()}
+
+    def _membership(self, key):
+        """(name, pattern, rows) for every value of `key` in the catalog"""
+        members = {}
+        for row, supplier in enumerate(self.suppliers):
+            for name in supplier.get(key, []):
+                members.setdefault(name, []).append(row)
+        return [(name, re.compile(rf"\b{re.escape(name.lower())}\b"), np.array(members[name], dtype=np.int64))
+                for name in sorted(members)]
+
+    def _text_scores(self, text):
+        """Cosine similarity of every supplier to the text, from the postings of the text's tokens"""
+        scores = np.zeros(len(self.suppliers))
+        query = {self.vocabulary[token]: count * self.idf[self.vocabulary[token]]
+                 for token, count in Counter(tokenize(text)).items() if token in self.vocabulary}
+        norm = math.sqrt(sum(weight * weight for weight in query.values()))
+        for column, weight in query.items():
+            start, stop = self.posting_starts[column], self.posting_starts[column + 1]
+            # A token has at most one posting per row, so the fancy-indexed add does not drop any
+            scores[self.posting_rows[start:stop]] += self.posting_weights[start:stop] * (weight / norm)
+        return scores
+
+    def _mentioned(self, memberships, lowered):
+        """Names mentioned in the text, and a boolean vector of the rows having any of them"""
+        hits = np.zeros(len(self.suppliers), dtype=bool)
+        mentioned = []
+        for name, pattern, rows in memberships:
+            if pattern.search(lowered):
+                mentioned.append((name, set(rows.tolist())))
+                hits[rows] = True
+        return mentioned, hits
+
+    def search(self, text, k=5):
+        """Top `k` suppliers for the requirements as dicts with the supplier, its score and why it matched"""
+        if not self.suppliers:
+            return []
+        lowered = text.lower()
+        mentioned_categories, category_hits = self._mentioned(self.categories, lowered)
+        mentioned_locations, location_hits = self._mentioned(self.locations, lowered)
+
+        scores = self._text_scores(text) + CATEGORY_BOOST * category_hits + LOCATION_BOOST * location_hits
+        constraints = parse_constraints(text)
+        eligible = np.ones(len(self.suppliers), dtype=bool)
+        for field, operator, value in constraints:
+            eligible &= constraint_mask(self.numeric[field], operator, value)
+        if not constraints:
+            eligible &= scores > 0  # Without filters, only return suppliers related to the text
+
+        candidates = np.flatnonzero(eligible)
+        top = candidates[np.argsort(-scores[candidates], kind="stable")[:k]]
+        return [{
+            "supplier": self.suppliers[row],
+            "score": round(float(scores[row]), 4),
+            "reasons": [f"Offers {name}" for name, rows in mentioned_categories if row in rows] +
+                       [f"Operates in {name}" for name, rows in mentioned_locations if row in rows] +
+                       [f"Meets {field} {operator} {value:g}" for field, operator, value in constraints]
+        } for row in top]
@@ -0,0 +1,128 @@
+import hashlib
+import io
+import os
+import re
+import tempfile
+
+from flask import Request
+
+# Uploads up to this size stay in memory, larger ones are spooled to a named temporary file
+UPLOAD_SPOOL_BYTES = int(os.getenv("UPLOAD_SPOOL_BYTES", 1024 * 1024))
+
+# Requests above this size are refused with 413 before their body is read. Large uploads are spooled
+# to disk and extracted page by page, so this bounds disk use rather than memory.
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", 512 * 1024 * 1024))
+
+# PDF readers accept the header anywhere in the first kilobyte
+PDF_MAGIC = b"%PDF-"
+PDF_HEADER_WINDOW = 1024
+
+READ_BLOCK_SIZE = 64 * 1024
+PAGE_RANGE = re.compile(r"^\s*(\d+)\s*(?:-\s*(\d*)\s*)?$")
+
+
+class SpoolingRequest(Request):
+    """Request whose file uploads are held in memory only while small
+
+    Larger (or unsized) uploads are written to a named temporary file, so
+    PyMuPDF and the extraction workers can open them by path instead of
+    receiving the whole document as bytes.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if total_content_length is not None and total_content_length <= UPLOAD_SPOOL_BYTES:
+            return HashingStream(io.BytesIO())
+        return HashingStream(_spool_file())
+
+
+class HashingStream:
+    """File object hashing what is written to it, so an upload is hashed in the same pass that spools it"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.digest = hashlib.sha256()
+
+    def write(self, data):
+        self.digest.update(data)
+        return self.stream.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def upload_hash(stream):
+    """SHA-256 hex digest of an upload, as computed while spooling it, or read from the stream otherwise"""
+    if isinstance(stream, HashingStream):
+        return stream.digest.hexdigest()
+    return hash_stream(stream)
+
+
+def _spool_file():
+    return tempfile.NamedTemporaryFile("wb+", prefix="upload-", suffix=".pdf")
+
+
+def is_pdf(stream):
+    """Whether the upload starts with the PDF header, the stream is rewound either way"""
+    head = stream.read(PDF_HEADER_WINDOW)
+    stream.seek(0)
+    return PDF_MAGIC in head
+
+
+def hash_stream(stream, block_size=READ_BLOCK_SIZE):
+    """SHA-256 hex digest of a seekable stream, read block by block and rewound"""
+    digest = hashlib.sha256()
+    for block in iter(lambda: stream.read(block_size), b""):
+        digest.update(block)
+    stream.seek(0)
+    return digest.hexdigest()
+
+
+def spool_stream(stream, max_bytes=MAX_UPLOAD_BYTES, block_size=READ_BLOCK_SIZE):
+    """Copy a stream the way uploads are held: in memory up to UPLOAD_SPOOL_BYTES, then in a named temporary file
+
+    Returns the rewound copy and its SHA-256 hex digest, computed along the
+    way. Raises ValueError once more than `max_bytes` have been read.
+    """
+    digest = hashlib.sha256()
+    spool = io.BytesIO()
+    size = 0
+    try:
+        for block in iter(lambda: stream.read(block_size), b""):
+            size += len(block)
+            if size > max_bytes:
+                raise ValueError(f"Larger than {max_bytes} bytes")
+            if isinstance(spool, io.BytesIO) and size > UPLOAD_SPOOL_BYTES:
+                spooled = _spool_file()
+                spooled.write(spool.getbuffer())
+                spool = spooled
+            digest.update(block)
+            spool.write(block)
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool, digest.hexdigest()
+
+
+def upload_source(stream):
+    """What to open the upload from: the spooled file's path, or its bytes for small in-memory uploads"""
+    path = getattr(stream, "name", None)
+    if isinstance(path, str) and os.path.isfile(path):
+        stream.flush()
+        return path
+    return stream.read()
+
+
+def parse_page_range(text):
+    """Zero-based (start, stop) pages for "5", "1-50" or "10-", stop is None for the end of the document"""
+    match = PAGE_RANGE.match(text or "")
+    if not match:
+        raise ValueError("pages must look like 1-50")
+    first = int(match.group(1))
+    if match.group(2) is None:
+        last = first
+    else:
+        last = int(match.group(2)) if match.group(2) else None
+    if first < 1 or (last is not None and last < first):
+        raise ValueError("pages must be a range of page numbers starting at 1")
+    return first - 1, last
@@ -1,29 +1,187 @@
+import threading
+import uuid
+
+import requests
 import weaviate
 import os
 from dotenv import load_dotenv
 
+from utils.graphql_query import all_of, condition, get_query
+from utils.hybrid_search import HYBRID_CANDIDATES, SearchCache, reciprocal_rank_fusion, rerank
+
 load_dotenv()  # Load environment variables from .env file
 
+# Size of the HTTP connection pool shared by all requests to Weaviate
+WEAVIATE_POOL_SIZE = int(os.getenv("WEAVIATE_POOL_SIZE", 20))
+
+# API field -> Weaviate property, or _additional field for names starting with "_"
+SUPPLIER_FIELDS = {
+    "id": "_id",
+    "name": "name",
+    "description": "description",
+    "categories": "categories",
+    "rating": "rating",
+    "avg_price": "avgPrice",
+    "sustainability_score": "sustainabilityScore",
+    "locations": "locations",
+    "match_certainty": "_certainty"
+}
+SEARCH_FIELDS = list(SUPPLIER_FIELDS)
+RECOMMENDATION_FIELDS = [field for field in SUPPLIER_FIELDS if field != "match_certainty"]
+
+# Properties searched by keyword, so exact names like "ISO 14001:2015" match even when the vectors do not
+BM25_PROPERTIES = ["name", "description", "categories", "locations", "certifications"]
+# Properties the hybrid search reranks on, fetched whatever fields were asked for
+RERANK_PROPERTIES = ["rating", "sustainabilityScore", "avgPrice"]
+SEARCH_MODES = ("vector", "keyword", "hybrid")
+
+# Properties of the Supplier class, added to an existing class when missing
+SUPPLIER_PROPERTIES = [
+    {"name": "name", "dataType": ["string"], "description": "The name of the supplier"},
+    {"name": "description", "dataType": ["text"], "description": "Description of the supplier"},
+    {"name": "categories", "dataType": ["string[]"], "description": "Product categories offered by the supplier"},
+    {"name": "rating", "dataType": ["number"], "description": "Rating of the supplier (0-5)"},
+    {"name": "avgPrice", "dataType": ["number"], "description": "Average price of products"},
+    {"name": "sustainabilityScore", "dataType": ["number"], "description": "Sustainability score (0-100)"},
+    {"name": "locations", "dataType": ["string[]"], "description": "Locations where the supplier operates"},
+    {"name": "certifications", "dataType": ["string[]"], "description": "Names of the supplier's certifications"}
+]
+
+# Namespace of the Weaviate object UUIDs derived from supplier IDs
+SUPPLIER_NAMESPACE = uuid.UUID("6f1c2a4e-9b7d-5e3f-8a21-4c0d9e7b1f52")
+
+
+def supplier_uuid(supplier_id):
+    """Weaviate object UUID of a supplier, the same for the same supplier ID on every run"""
+    return str(uuid.uuid5(SUPPLIER_NAMESPACE, str(supplier_id)))
+
+
+def to_weaviate(supplier):
+    """Convert from API format to Weaviate format"""
+    return {
+        "name": supplier.get("name"),
+        "description": supplier.get("description", ""),
+        "categories": supplier.get("categories", []),
+        "rating": supplier.get("rating", 0),
+        "avgPrice": supplier.get("avg_price", 0),
+        "sustainabilityScore": supplier.get("sustainability_score", 0),
+        "locations": supplier.get("locations", []),
+        "certifications": [certification["name"] for certification in supplier.get("certifications", [])]
+    }
+
+
+def supplier_properties(fields):
+    return [SUPPLIER_FIELDS[field] for field in fields if not SUPPLIER_FIELDS[field].startswith("_")]
+
+
+def supplier_additional(fields):
+    return [SUPPLIER_FIELDS[field][1:] for field in fields if SUPPLIER_FIELDS[field].startswith("_")]
+
+
+class WeaviateQueryError(Exception):
+    """Raised when Weaviate answers a GraphQL query with errors"""
+
+
+def get_results(result):
+    if result and result.get("errors"):
+        raise WeaviateQueryError("; ".join(str(error.get("message", error)) for error in result["errors"]))
+    if result and "data" in result and "Get" in result["data"] and "Supplier" in result["data"]["Get"]:
+        return result["data"]["Get"]["Supplier"] or []
+    return []
+
+
+def to_api_supplier(supplier, fields):
+    """Convert from Weaviate format to API format, keeping the requested fields"""
+    api_supplier = {}
+    for field in fields:
+        prop = SUPPLIER_FIELDS[field]
+        if prop.startswith("_"):
+            api_supplier[field] = (supplier.get("_additional") or {}).get(prop[1:])
+        else:
+            api_supplier[field] = supplier.get(prop)
+    return api_supplier
+
 
 class SupplierKnowledgeGraph:
-    """Client for interacting with Weaviate knowledge graph for suppliers"""
+    """Client for interacting with Weaviate knowledge graph for suppliers
+
+    The Weaviate client connects on first use and the schema is checked once,
+    so after that a search is a single round trip. Use get_knowledge_graph()
+    for the instance shared by the whole process.
+    """
 
     def __init__(self):
         self.weaviate_url = os.getenv("WEAVIATE_URL", "http://localhost:8080")
         self.weaviate_api_key = os.getenv("WEAVIATE_API_KEY")
-
-        # Initialize Weaviate client
+        self._client = None
+        self.schema_ready = False
+        self.lock = threading.Lock()
+        self.search_cache = SearchCache()
+
+    @property
+    def client(self):
+        """The Weaviate client, connected on first use"""
+        if self._client is None:
+            with self.lock:
+                if self._client is None:
+                    self._client = self._connect()
+        return self._client
+
+    @client.setter
+    def client(self, client):
+        with self.lock:
+            self._client = client
+            self.schema_ready = False
+
+    def _connect(self):
         auth_config = weaviate.auth.AuthApiKey(api_key=self.weaviate_api_key) if self.weaviate_api_key else None
-
-        self.client = weaviate.Client(url=self.weaviate_url, auth_client_secret=auth_config)
-
-        # Check if schema exists, create if not
-        self._ensure_schema()
-
-    def _ensure_schema(self):
-        """Ensure the necessary schema exists in Weaviate"""
+        pool = weaviate.ConnectionConfig(session_pool_connections=WEAVIATE_POOL_SIZE,
+                                         session_pool_maxsize=WEAVIATE_POOL_SIZE)
+        return weaviate.Client(url=self.weaviate_url, auth_client_secret=auth_config,
+                               additional_config=weaviate.Config(connection_config=pool))
+
+    def reconnect(self):
+        """Drop the current client, the next call connects again and re-checks the schema"""
+        with self.lock:
+            self._client = None
+            self.schema_ready = False
+
+    def _run(self, operation):
+        """Run operation(client) once the schema is known to exist
+
+        A connection error triggers a health check: when Weaviate does not
+        answer as ready the client (and its connection pool) is replaced and
+        the operation retried once.
+        """
+        try:
+            return operation(self._ready_client())
+        except requests.exceptions.ConnectionError as e:
+            if self._client is not None and self._is_healthy(self._client):
+                raise
+            print(f"Weaviate connection lost, reconnecting: {e}")
+            self.reconnect()
+            return operation(self._ready_client())
+
+    def _is_healthy(self, client):
+        try:
+            return client.is_ready()
+        except Exception:
+            return False
+
+    def _ready_client(self):
+        client = self.client
+        if not self.schema_ready:
+            with self.lock:
+                if not self.schema_ready:
+                    self._ensure_schema(client)
+                    self.schema_ready = True
+        return client
+
+    def _ensure_schema(self, client=None):
+        """Ensure the necessary schema exists in Weaviate, adding properties missing from an older Supplier class"""
+        client = client or self.client
         # Check if Supplier class exists
-        if not self.client.schema.exists("Supplier"):
+        if not client.schema.exists("Supplier"):
             # Create Supplier class
             supplier_class = {
                 "class":
@@ -32,318 +190,211 @@ class SupplierKnowledgeGraph:
                     "Information about a supplier",
                 "vectorizer":
                     "text2vec-transformers",  # Use appropriate vectorizer
-                "properties": [{
-                    "name": "name",
-                    "dataType": ["string"],
-                    "description": "The name of the supplier"
-                }, {
-                    "name": "description",
-                    "dataType": ["text"],
-                    "description": "Description of the supplier"
-                }, {
-                    "name": "categories",
-                    "dataType": ["string[]"],
-                    "description": "Product categories offered by the supplier"
-                }, {
-                    "name": "rating",
-                    "dataType": ["number"],
-                    "description": "Rating of the supplier (0-5)"
-                }, {
-                    "name": "avgPrice",
-                    "dataType": ["number"],
-                    "description": "Average price of products"
-                }, {
-                    "name": "sustainabilityScore",
-                    "dataType": ["number"],
-                    "description": "Sustainability score (0-100)"
-                }, {
-                    "name": "locations",
-                    "dataType": ["string[]"],
-                    "description": "Locations where the supplier operates"
-                }]
+                "properties": [dict(prop) for prop in SUPPLIER_PROPERTIES]
             }
 
-            self.client.schema.create_class(supplier_class)
+            client.schema.create_class(supplier_class)
+        else:
+            existing = {prop["name"] for prop in client.schema.get("Supplier").get("properties") or []}
+            for prop in SUPPLIER_PROPERTIES:
+                if prop["name"] not in existing:
+                    client.schema.property.create("Supplier", dict(prop))
 
         # Create other classes (Product, Compliance, Order) as needed
         # For brevity, just showing Supplier class here
 
-    def add_supplier(self, supplier_data):
-        """Add a supplier to the knowledge graph"""
-        # Convert from API format to Weaviate format
-        weaviate_data = {
-            "name": supplier_data.get("name"),
-            "description": supplier_data.get("description", ""),
-            "categories": supplier_data.get("categories", []),
-            "rating": supplier_data.get("rating", 0),
-            "avgPrice": supplier_data.get("avg_price", 0),
-            "sustainabilityScore": supplier_data.get("sustainability_score", 0),
-            "locations": supplier_data.get("locations", [])
-        }
+    def add_supplier(self, supplier_data, sync_state=None):
+        """Add a supplier to the knowledge graph, replacing the object when the supplier ID is already there
+
+        With a `sync_state` the object's content hash is recorded in it, so the
+        next utils.weaviate_sync run using that state does not send it again.
+        """
+        weaviate_data = to_weaviate(supplier_data)
+        object_id = supplier_uuid(supplier_data["id"]) if supplier_data.get("id") is not None else None
+
+        def upsert(client):
+            try:
+                return client.data_object.create(data_object=weaviate_data, class_name="Supplier", uuid=object_id)
+            except weaviate.exceptions.ObjectAlreadyExistsException:
+                client.data_object.replace(data_object=weaviate_data, class_name="Supplier", uuid=object_id)
+                return object_id
 
         # Add to Weaviate
         try:
-            result = self.client.data_object.create(data_object=weaviate_data, class_name="Supplier")
-            return result
+            result = self._run(upsert)
         except Exception as e:
             print(f"Error adding supplier to Weaviate: {e}")
             return None
+        self.search_cache.clear()
 
-    def search_suppliers(self, query, categories=None, min_rating=None, min_sustainability=None):
-        """Search for suppliers based on semantic query and filters"""
-        # Start building query
-        graphql_query = """
-        {
-            Get {
-                Supplier(
-                    limit: 10
-                    nearText: {
-                        concepts: ["%s"]
-                    }
-                    %s
-                ) {
-                    name
-                    description
-                    categories
-                    rating
-                    avgPrice
-                    sustainabilityScore
-                    locations
-                    _additional {
-                        id
-                        certainty
-                    }
-                }
-            }
-        }
-        """
-
-        # Build where filter
-        where_filters = []
-
-        if categories:
-            categories_filter = 'where: { operator: ContainsAny, path: ["categories"], valueString: ["%s"] }' % '", "'.join(
-                categories)
-            where_filters.append(categories_filter)
-
-        if min_rating:
-            rating_filter = 'where: { operator: GreaterThanEqual, path: ["rating"], valueNumber: %f }' % min_rating
-            where_filters.append(rating_filter)
+        if sync_state is not None and object_id is not None:
+            from utils.weaviate_sync import content_hash
+            sync_state.hashes[object_id] = content_hash(weaviate_data)
+            sync_state.save()
+        return result
 
-        if min_sustainability:
-            sustainability_filter = 'where: { operator: GreaterThanEqual, path: ["sustainabilityScore"], valueNumber: %f }' % min_sustainability
-            where_filters.append(sustainability_filter)
+    def search_suppliers(self, query, categories=None, min_rating=None, min_sustainability=None, fields=None,
+                         limit=10, mode="vector", price_target=None, rerank_results=True):
+        """Search for suppliers based on semantic query and filters, returning only `fields` (all by default)
 
-        # Combine where filters if any
-        where_clause = ""
-        if where_filters:
-            where_clause = ", ".join(where_filters)
+        `mode` is "vector" (nearText), "keyword" (BM25) or "hybrid", which
+        fuses both candidate lists and, unless `rerank_results` is false,
+        reranks them on rating, sustainability and closeness to `price_target`.
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode!r}")
+        # All filters go to Weaviate as one And, so they narrow the candidates server side
+        where = all_of(
+            condition("categories", "ContainsAny", list(categories)) if categories else None,
+            condition("rating", "GreaterThanEqual", float(min_rating)) if min_rating else None,
+            condition("sustainabilityScore", "GreaterThanEqual", float(min_sustainability))
+            if min_sustainability else None
+        )
+        fields = fields or SEARCH_FIELDS
+        if mode != "vector":
+            return self._ranked_search(query, where, fields, limit, mode, price_target, rerank_results)
+        graphql_query = get_query("Supplier", supplier_properties(fields), where=where, concepts=[query], limit=limit,
+                                  additional=supplier_additional(fields))
 
         # Execute query
-        result = self.client.query.raw(graphql_query % (query, where_clause))
-
-        # Convert from Weaviate format to API format
-        suppliers = []
-        if result and "data" in result and "Get" in result["data"] and "Supplier" in result["data"]["Get"]:
-            for supplier in result["data"]["Get"]["Supplier"]:
-                api_supplier = {
-                    "id": supplier["_additional"]["id"],
-                    "name": supplier["name"],
-                    "description": supplier["description"],
-                    "categories": supplier["categories"],
-                    "rating": supplier["rating"],
-                    "avg_price": supplier["avgPrice"],
-                    "sustainability_score": supplier["sustainabilityScore"],
-                    "locations": supplier["locations"],
-                    "match_certainty": supplier["_additional"]["certainty"]
-                }
-                suppliers.append(api_supplier)
-
-        return suppliers
-
-    def get_supplier_recommendations(self, category, location=None):
+        result = self._run(lambda client: client.query.raw(graphql_query))
+        return [to_api_supplier(supplier, fields) for supplier in get_results(result)]
+
+    def _ranked_search(self, query, where, fields, limit, mode, price_target, rerank_results):
+        """Keyword or hybrid search, with the results cached per query"""
+        properties = list(dict.fromkeys(supplier_properties(fields) + RERANK_PROPERTIES))
+        additional = list(dict.fromkeys(supplier_additional(fields) + ["id"]))
+        candidates = max(limit, HYBRID_CANDIDATES) if mode == "hybrid" else limit
+        # BM25 results have no certainty
+        queries = [get_query("Supplier", properties, where=where, bm25=query, bm25_properties=BM25_PROPERTIES,
+                             limit=candidates, additional=[name for name in additional if name != "certainty"])]
+        if mode == "hybrid":
+            queries.insert(0, get_query("Supplier", properties, where=where, concepts=[query], limit=candidates,
+                                        additional=additional))
+
+        key = (tuple(queries), tuple(fields), limit, price_target, rerank_results)
+        results = self.search_cache.get(key)
+        if results is None:
+            ranked_lists = [get_results(self._run(lambda client: client.query.raw(graphql_query)))
+                            for graphql_query in queries]
+            # The same supplier from either list, the vector one first as it carries the certainty
+            objects = {}
+            for ranked in ranked_lists:
+                for supplier in ranked:
+                    objects.setdefault(supplier["_additional"]["id"], supplier)
+            order, relevance = reciprocal_rank_fusion(
+                [[supplier["_additional"]["id"] for supplier in ranked] for ranked in ranked_lists])
+            ranked = [objects[object_id] for object_id in order]
+            if mode == "hybrid" and rerank_results:
+                ranked = rerank(ranked, relevance, price_target)
+            results = [to_api_supplier(supplier, fields) for supplier in ranked[:limit]]
+            self.search_cache.put(key, results)
+        return [dict(supplier) for supplier in results]
+
+    def get_supplier_recommendations(self, category, location=None, fields=None, limit=5):
         """Get recommended suppliers based on category and optional location"""
-        # Query to find suppliers in the category with high ratings
-        graphql_query = """
-        {
-            Get {
-                Supplier(
-                    limit: 5
-                    where: {
-                        operator: ContainsAny,
-                        path: ["categories"],
-                        valueString: ["%s"]
-                    }
-                    sort: [
-                        {
-                            path: ["rating"],
-                            order: desc
-                        }
-                    ]
-                ) {
-                    name
-                    description
-                    categories
-                    rating
-                    avgPrice
-                    sustainabilityScore
-                    locations
-                    _additional {
-                        id
-                    }
-                }
-            }
-        }
-        """ % category
-
-        # Add location filter if provided
-        if location:
-            graphql_query = """
-            {
-                Get {
-                    Supplier(
-                        limit: 5
-                        where: {
-                            operator: And,
-                            operands: [
-                                {
-                                    operator: ContainsAny,
-                                    path: ["categories"],
-                                    valueString: ["%s"]
-                                },
-                                {
-                                    operator: ContainsAny,
-                                    path: ["locations"],
-                                    valueString: ["%s"]
-                                }
-                            ]
-                        }
-                        sort: [
-                            {
-                                path: ["rating"],
-                                order: desc
-                            }
-                        ]
-                    ) {
-                        name
-                        description
-                        categories
-                        rating
-                        avgPrice
-                        sustainabilityScore
-                        locations
-                        _additional {
-                            id
-                        }
-                    }
-                }
-            }
-            """ % (category, location)
+        where = all_of(condition("categories", "ContainsAny", [category]),
+                       condition("locations", "ContainsAny", [location]) if location else None)
+        fields = fields or RECOMMENDATION_FIELDS
+        graphql_query = get_query("Supplier", supplier_properties(fields), where=where, limit=limit,
+                                  sort=[("rating", "desc")], additional=supplier_additional(fields))
 
         # Execute query
-        result = self.client.query.raw(graphql_query)
-
-        # Convert from Weaviate format to API format
-        suppliers = []
-        if result and "data" in result and "Get" in result["data"] and "Supplier" in result["data"]["Get"]:
-            for supplier in result["data"]["Get"]["Supplier"]:
-                api_supplier = {
-                    "id": supplier["_additional"]["id"],
-                    "name": supplier["name"],
-                    "description": supplier["description"],
-                    "categories": supplier["categories"],
-                    "rating": supplier["rating"],
-                    "avg_price": supplier["avgPrice"],
-                    "sustainability_score": supplier["sustainabilityScore"],
-                    "locations": supplier["locations"]
-                }
-                suppliers.append(api_supplier)
-
-        return suppliers
+        result = self._run(lambda client: client.query.raw(graphql_query))
+        return [to_api_supplier(supplier, fields) for supplier in get_results(result)]
 
     def import_suppliers(self, suppliers_list):
-        """Batch import suppliers into the knowledge graph"""
-        batch = self.client.batch.configure(batch_size=100)
+        """Batch import suppliers into the knowledge graph
+
+        Objects get the UUID of their supplier ID, so importing a supplier
+        again replaces it instead of adding a duplicate. utils.weaviate_sync
+        sends only what changed since the last sync.
+        """
+        client = self._ready_client()
+        batch = client.batch.configure(batch_size=100)
 
         with batch:
             for supplier in suppliers_list:
-                # Convert from API format to Weaviate format
-                weaviate_data = {
-                    "name": supplier.get("name"),
-                    "description": supplier.get("description", ""),
-                    "categories": supplier.get("categories", []),
-                    "rating": supplier.get("rating", 0),
-                    "avgPrice": supplier.get("avg_price", 0),
-                    "sustainabilityScore": supplier.get("sustainability_score", 0),
-                    "locations": supplier.get("locations", [])
-                }
-
-                # Add to batch
-                self.client.batch.add_data_object(data_object=weaviate_data, class_name="Supplier")
+                client.batch.add_data_object(data_object=to_weaviate(supplier), class_name="Supplier",
+                                             uuid=supplier_uuid(supplier["id"]))
+        self.search_cache.clear()
 
         return {"message": f"Imported {len(suppliers_list)} suppliers"}
 
 
-# Example Usage in API
-# ------------------
+_knowledge_graph = None
+_knowledge_graph_lock = threading.Lock()
 
 
-# Example for enhanced supplier search endpoint using Weaviate:
-@suppliers_bp.route('/search', methods=['POST'])
-def search_suppliers():
-    """Search suppliers based on specific criteria"""
-    criteria = request.json
+def get_knowledge_graph():
+    """Knowledge graph shared by all requests, created on first use"""
+    global _knowledge_graph
+    with _knowledge_graph_lock:
+        if _knowledge_graph is None:
+            _knowledge_graph = SupplierKnowledgeGraph()
+        return _knowledge_graph
 
-    # Initialize Weaviate client
-    kg = SupplierKnowledgeGraph()
 
-    # Extract search parameters
-    query = criteria.get('query', '')
-    categories = criteria.get('categories', [])
-    min_rating = criteria.get('min_rating')
-    min_sustainability = criteria.get('min_sustainability')
+# Example Usage in API
+# ------------------
 
-    # Search using knowledge graph
-    results = kg.search_suppliers(query=query,
-                                  categories=categories,
-                                  min_rating=min_rating,
-                                  min_sustainability=min_sustainability)
 
-    return jsonify(results)
+# Example for enhanced supplier search endpoint using Weaviate:
+# @suppliers_bp.route('/search', methods=['POST'])
+# def search_suppliers():
+#     """Search suppliers based on specific criteria"""
+#     criteria = request.json
+#
+#     # Shared knowledge graph, connected and schema-checked once per process
+#     kg = get_knowledge_graph()
+#
+#     # Extract search parameters
+#     query = criteria.get('query', '')
+#     categories = criteria.get('categories', [])
+#     min_rating = criteria.get('min_rating')
+#     min_sustainability = criteria.get('min_sustainability')
+#
+#     # Search using knowledge graph
+#     results = kg.search_suppliers(query=query,
+#                                   categories=categories,
+#                                   min_rating=min_rating,
+#                                   min_sustainability=min_sustainability)
+#
+#     return jsonify(results)
 
 
 # Example for generating negotiation strategy using Mistral AI:
-@negotiations_bp.route('/strategies', methods=['GET'])
-def get_strategies():
-    """Get pricing strategies based on supplier and product"""
-    supplier_id = request.args.get('supplier_id')
-    product_category = request.args.get('category')
-    negotiation_goal = request.args.get('goal', 'price reduction')
-
-    # Find supplier
-    supplier = next((s for s in suppliers_data if s['id'] == supplier_id), None)
-    if not supplier:
-        return jsonify({"error": "Supplier not found"}), 404
-
-    # Initialize Mistral AI client
-    mistral = MistralAIClient()
-
-    # Generate strategies
-    response = mistral.generate_negotiation_strategy(supplier_data=supplier,
-                                                     product_category=product_category,
-                                                     negotiation_goal=negotiation_goal)
-
-    # Parse and structure the response
-    # This would need to be adapted based on actual Mistral AI response format
-    strategies = [
-        {
-            "name": "Strategy 1",
-            "description": "Description of first strategy",
-            "talking_points": ["Point 1", "Point 2"],
-            "concessions": ["Concession 1"],
-            "target_discount": "5-10%"
-        },
-        # Add more strategies from parsed response
-    ]
-
-    return jsonify(strategies)
+# @negotiations_bp.route('/strategies', methods=['GET'])
+# def get_strategies():
+#     """Get pricing strategies based on supplier and product"""
+#     supplier_id = request.args.get('supplier_id')
+#     product_category = request.args.get('category')
+#     negotiation_goal = request.args.get('goal', 'price reduction')
+#
+#     # Find supplier
+#     supplier = next((s for s in suppliers_data if s['id'] == supplier_id), None)
+#     if not supplier:
+#         return jsonify({"error": "Supplier not found"}), 404
+#
+#     # Initialize Mistral AI client
+#     mistral = MistralAIClient()
+#
+#     # Generate strategies
+#     response = mistral.generate_negotiation_strategy(supplier_data=supplier,
+#                                                      product_category=product_category,
+#                                                      negotiation_goal=negotiation_goal)
+#
+#     # Parse and structure the response
+#     # This would need to be adapted based on actual Mistral AI response format
+#     strategies = [
+#         {
+#             "name": "Strategy 1",
+#             "description": "Description of first strategy",
+#             "talking_points": ["Point 1", "Point 2"],
+#             "concessions": ["Concession 1"],
+#             "target_discount": "5-10%"
+#         },
+#         # Add more strategies from parsed response
+#     ]
+#
+#     return jsonify(strategies)
@@ -0,0 +1,169 @@
+"""Incremental sync of the supplier catalog to the Weaviate knowledge graph
+
+Every supplier maps to the Weaviate object with the UUID of its supplier ID.
+The content hash of each object as last synced is kept in a state file, so
+a run sends only the suppliers that are new or changed and deletes the ones
+no longer in the catalog. An unchanged catalog sends nothing.
+
+    python -m utils.weaviate_sync [--full] [--state PATH]
+"""
+import argparse
+import hashlib
+import os
+import tempfile
+import threading
+import time
+
+from utils.json_provider import dumps_bytes, loads
+from utils.weaviate_client import get_knowledge_graph, supplier_uuid, to_weaviate
+
+SYNC_STATE_PATH = os.getenv("WEAVIATE_SYNC_STATE",
+                            os.path.join(tempfile.gettempdir(), "tacto-weaviate-sync.json"))
+
+# Starting batch size, Weaviate's dynamic batching adjusts it to how fast objects are created
+SYNC_BATCH_SIZE = int(os.getenv("WEAVIATE_SYNC_BATCH_SIZE", 100))
+SYNC_WORKERS = int(os.getenv("WEAVIATE_SYNC_WORKERS", 4))
+
+# UUIDs per batch delete request
+DELETE_CHUNK = 1000
+
+
+def content_hash(properties):
+    """Hash of an object's properties, independent of key order"""
+    return hashlib.blake2b(dumps_bytes(properties), digest_size=16).hexdigest()
+
+
+class SyncState:
+    """Content hash of every object as last synced, by object UUID, in a JSON file"""
+
+    def __init__(self, path=SYNC_STATE_PATH):
+        self.path = path
+        self.hashes = {}
+        try:
+            with open(path, "rb") as f:
+                self.hashes = loads(f.read())["hashes"]
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Ignoring unreadable sync state {path}, doing a full sync: {e}")
+
+    def save(self):
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        # Write to a temporary file first so a crash never leaves a partial state
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(dumps_bytes({"hashes": self.hashes}))
+        os.replace(temp_path, self.path)
+
+
+def plan(suppliers, hashes, full=False):
+    """Objects to upsert as (uuid, properties, hash), UUIDs to delete and the number unchanged
+
+    With `full` every supplier is upserted, whatever its recorded hash.
+    """
+    upserts, current, unchanged = [], set(), 0
+    for supplier in suppliers:
+        object_id = supplier_uuid(supplier["id"])
+        properties = to_weaviate(supplier)
+        digest = content_hash(properties)
+        current.add(object_id)
+        if not full and hashes.get(object_id) == digest:
+            unchanged += 1
+        else:
+            upserts.append((object_id, properties, digest))
+    deletes = [object_id for object_id in hashes if object_id not in current]
+    return upserts, deletes, unchanged
+
+
+class SupplierSync:
+    """Brings the Supplier class in Weaviate in line with a supplier list
+
+    Upserts go through Weaviate's dynamic batching on `workers` parallel
+    workers. A hash is recorded only once Weaviate has accepted the object,
+    so failed objects are sent again on the next run.
+    """
+
+    def __init__(self, graph=None, state=None, batch_size=SYNC_BATCH_SIZE, workers=SYNC_WORKERS):
+        self.graph = graph if graph is not None else get_knowledge_graph()
+        self.state = state if state is not None else SyncState()
+        self.batch_size = batch_size
+        self.workers = workers
+        self.lock = threading.Lock()
+
+    def run(self, suppliers, full=False):
+        """Sync `suppliers`, with `full` resending every one regardless of the recorded hashes"""
+        started = time.perf_counter()
+        upserts, deletes, unchanged = plan(suppliers, self.state.hashes, full)
+        failed = []
+        if upserts:
+            failed += self.graph._run(lambda client: self._upsert(client, upserts))
+        if deletes:
+            failed += self.graph._run(lambda client: self._delete(client, deletes))
+        if upserts or deletes:
+            self.state.save()
+            self.graph.search_cache.clear()
+        return {
+            "upserted": len(upserts) - sum(1 for kind, _ in failed if kind == "upsert"),
+            "deleted": len(deletes) - sum(1 for kind, _ in failed if kind == "delete"),
+            "unchanged": unchanged,
+            "failed": [object_id for _, object_id in failed],
+            "seconds": round(time.perf_counter() - started, 3)
+        }
+
+    def _upsert(self, client, upserts):
+        """Send the objects, re-running is safe because the UUIDs are deterministic"""
+        pending = {object_id: digest for object_id, _, digest in upserts}
+        failed = []
+
+        def record(results):
+            # Called once per batch request with Weaviate's result for every object in it
+            with self.lock:
+                for result in results or []:
+                    object_id = result.get("id")
+                    errors = (result.get("result") or {}).get("errors")
+                    if errors:
+                        print(f"Weaviate rejected supplier object {object_id}: {errors}")
+                        failed.append(("upsert", object_id))
+                    elif object_id in pending:
+                        self.state.hashes[object_id] = pending[object_id]
+
+        client.batch.configure(batch_size=self.batch_size, dynamic=True, num_workers=self.workers, callback=record)
+        with client.batch as batch:
+            for object_id, properties, _ in upserts:
+                batch.add_data_object(data_object=properties, class_name="Supplier", uuid=object_id)
+        return failed
+
+    def _delete(self, client, deletes):
+        failed = []
+        for start in range(0, len(deletes), DELETE_CHUNK):
+            chunk = deletes[start:start + DELETE_CHUNK]
+            result = client.batch.delete_objects(class_name="Supplier", output="verbose", where={
+                "path": ["id"], "operator": "ContainsAny", "valueTextArray": chunk
+            })
+            # Objects already gone are not reported, they count as deleted
+            rejected = {item["id"] for item in (result.get("results") or {}).get("objects") or []
+                        if item.get("status") == "FAILED"}
+            with self.lock:
+                for object_id in chunk:
+                    if object_id in rejected:
+                        failed.append(("delete", object_id))
+                    else:
+                        self.state.hashes.pop(object_id, None)
+        return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--full", action="store_true", help="Resend every supplier, ignoring the recorded hashes")
+    parser.add_argument("--state", default=SYNC_STATE_PATH)
+    args = parser.parse_args(argv)
+
+    from api.mock_data import suppliers_data
+    stats = SupplierSync(state=SyncState(args.state)).run(suppliers_data, full=args.full)
+    print(f"Upserted {stats['upserted']}, deleted {stats['deleted']}, unchanged {stats['unchanged']}, "
+          f"failed {len(stats['failed'])} in {stats['seconds']}s")
+
+
+if __name__ == '__main__':
+    main()